@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Compiles the Mysterious House text workbooks into the catalogs Texts loads
+
+The canonical texts are kept in EN/MysteriousHouseTexts.xlsx and
+DE/MysteriousHouseTexts.xlsx, on the Speech and Card Title sheets. This reads
+them with the standard library only and writes each language's catalog module
+(TextsEN.py, TextsDE.py) with its TEXTS dict and a version hash of the
+contents. The skill only ever imports the generated modules, so xlsx parsing
+stays out of the runtime. Edit the workbooks and rerun this rather than
+editing the modules.
+
+Before writing, the workbooks are checked for duplicate ids, ids missing from
+a locale and ids the skill looks up that no workbook has. Problems are
+reported and nothing is written unless --force is given, in which case the
+first of duplicated rows wins and missing texts are taken from the English
+workbook.
+
+    python BuildTexts.py
+    python BuildTexts.py --check
+    python BuildTexts.py --output-dir build --force
+"""
+
+from __future__ import print_function
+import argparse
+import collections
+import hashlib
+import json
+import os
+import re
+import sys
+import xml.etree.ElementTree as ElementTree
+import zipfile
+
+import Texts
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+# Language, locale, workbook and the column holding its texts, the first is the fallback for missing texts
+SOURCES = (
+    ('en', 'en-US', os.path.join('EN', 'MysteriousHouseTexts.xlsx'), 'English'),
+    ('de', 'de-DE', os.path.join('DE', 'MysteriousHouseTexts.xlsx'), 'German')
+)
+
+# Sheets holding runtime texts, the Utterances sheet belongs to the interaction model
+TEXT_SHEETS = ('Speech', 'Card Title')
+ID_COLUMN = 'ID'
+
+DEFAULT_OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# The skill looks texts up by literal ids, which are found in its source
+SKILL_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'MysteriousHouse.py')
+MESSAGE_ID_PATTERN = re.compile(r'"((?:Speech|Title|Summary)_\w+)"')
+
+# Longest line written to a catalog module, longer texts are split over several literals
+LINE_LENGTH = 120
+
+SPREADSHEET_NAMESPACE = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+RELATIONSHIP_NAMESPACE = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+
+
+# --------------- Workbook Reading
+
+def get_cell_text(element):
+    # Joins the runs of rich text
+    return ''.join(node.text or '' for node in element.iter(SPREADSHEET_NAMESPACE + 't'))
+
+
+def get_column(reference):
+    return re.match(r'[A-Z]+', reference).group(0)
+
+
+def read_sheets(path):
+    """ Returns {sheet name: [row, ...]} with each row a dict of column letter to cell text """
+    with zipfile.ZipFile(path) as workbook:
+        names = workbook.namelist()
+        shared_strings = []
+        if 'xl/sharedStrings.xml' in names:
+            root = ElementTree.fromstring(workbook.read('xl/sharedStrings.xml'))
+            shared_strings = [get_cell_text(item) for item in root.iter(SPREADSHEET_NAMESPACE + 'si')]
+        relationships = ElementTree.fromstring(workbook.read('xl/_rels/workbook.xml.rels'))
+        targets = dict((relationship.get('Id'), relationship.get('Target')) for relationship in relationships)
+
+        sheets = collections.OrderedDict()
+        for sheet in ElementTree.fromstring(workbook.read('xl/workbook.xml')).iter(SPREADSHEET_NAMESPACE + 'sheet'):
+            target = targets[sheet.get(RELATIONSHIP_NAMESPACE + 'id')].lstrip('/')
+            if not target.startswith('xl/'):
+                target = 'xl/' + target
+            rows = []
+            for row in ElementTree.fromstring(workbook.read(target)).iter(SPREADSHEET_NAMESPACE + 'row'):
+                cells = {}
+                for cell in row.iter(SPREADSHEET_NAMESPACE + 'c'):
+                    value = cell.find(SPREADSHEET_NAMESPACE + 'v')
+                    cell_type = cell.get('t')
+                    if cell_type == 'inlineStr':
+                        cells[get_column(cell.get('r'))] = get_cell_text(cell)
+                    elif value is not None and value.text is not None:
+                        cells[get_column(cell.get('r'))] = \
+                            shared_strings[int(value.text)] if cell_type == 's' else value.text
+                rows.append(cells)
+            sheets[sheet.get('name')] = rows
+        return sheets
+
+
+def read_texts(path, text_column):
+    """ Returns ([(message id, text), ...], problems) from the text sheets of one workbook """
+    texts = []
+    problems = []
+    sheets = read_sheets(path)
+    for sheet_name in TEXT_SHEETS:
+        rows = sheets.get(sheet_name)
+        if not rows:
+            problems.append(path + ": no " + sheet_name + " sheet")
+            continue
+        header = dict((value.strip(), column) for column, value in rows[0].items())
+        if ID_COLUMN not in header or text_column not in header:
+            problems.append(path + ": " + sheet_name + " sheet has no " + ID_COLUMN + " or " + text_column +
+                            " column")
+            continue
+        for row in rows[1:]:
+            message_id = row.get(header[ID_COLUMN], '').strip()
+            if message_id:
+                texts.append((message_id, row.get(header[text_column], '')))
+    return texts, problems
+
+
+# --------------- Validation
+
+def get_used_ids(path=SKILL_SOURCE):
+    with open(path, encoding='utf-8') as source:
+        return sorted(set(MESSAGE_ID_PATTERN.findall(source.read())))
+
+
+def validate(catalogs, required_ids):
+    """ Returns the problems found in {locale: [(message id, text), ...]} """
+    problems = []
+    all_ids = set()
+    for locale, texts in catalogs.items():
+        counts = collections.Counter(message_id for message_id, text in texts)
+        for message_id, count in sorted(counts.items()):
+            if count > 1:
+                problems.append(locale + ": duplicate id " + message_id + " (" + str(count) + " rows)")
+        for message_id, text in texts:
+            if not text:
+                problems.append(locale + ": empty text for " + message_id)
+        all_ids.update(counts)
+    for locale, texts in catalogs.items():
+        ids = set(message_id for message_id, text in texts)
+        for message_id in sorted(all_ids - ids):
+            problems.append(locale + ": missing id " + message_id)
+    for message_id in sorted(set(required_ids) - all_ids):
+        problems.append("id " + message_id + " is used by the skill but in no workbook")
+    return problems
+
+
+# --------------- Catalog Writing
+
+def get_ids(catalogs):
+    # Every id in the order of first appearance
+    ids = []
+    for texts in catalogs.values():
+        for message_id, text in texts:
+            if message_id not in ids:
+                ids.append(message_id)
+    return ids
+
+
+def build_catalog(texts, ids, fallback):
+    """ Returns an ordered {message id: text} of texts over ids, the first row wins where an id is duplicated """
+    by_id = {}
+    for message_id, text in texts:
+        by_id.setdefault(message_id, text)
+    return collections.OrderedDict((message_id, by_id.get(message_id, fallback.get(message_id)))
+                                   for message_id in ids)
+
+
+def get_version(catalog):
+    contents = json.dumps(list(catalog.items()), ensure_ascii=False)
+    return hashlib.sha1(contents.encode('utf-8')).hexdigest()[:12]
+
+
+def literal(value):
+    return json.dumps(value, ensure_ascii=False)
+
+
+def split_text(text, width):
+    # Splits text after spaces into pieces whose literals fit width
+    pieces = ['']
+    for word in re.findall(r'\S*\s*', text):
+        if pieces[-1] and len(literal(pieces[-1] + word)) > width:
+            pieces.append('')
+        pieces[-1] += word
+    return [piece for piece in pieces if piece] or ['']
+
+
+def format_entry(message_id, text):
+    line = '    ' + literal(message_id) + ': ' + literal(text) + ','
+    if len(line) <= LINE_LENGTH:
+        return [line]
+    lines = ['    ' + literal(message_id) + ': (']
+    lines.extend('        ' + literal(piece) for piece in split_text(text, LINE_LENGTH - 10))
+    lines.append('    ),')
+    return lines
+
+
+def format_catalog(catalog, language_name, source):
+    lines = [
+        '# -*- coding: utf-8 -*-',
+        '# Generated by BuildTexts.py from ' + source.replace(os.sep, '/') + ', do not edit',
+        '"""',
+        language_name + ' texts of Mysterious House, loaded by Texts on first use',
+        '"""',
+        '',
+        'VERSION = "' + get_version(catalog) + '"',
+        '',
+        'TEXTS = {',
+    ]
+    for message_id, text in catalog.items():
+        lines.extend(format_entry(message_id, text))
+    lines.append('}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile the text workbooks into the text catalog modules")
+    parser.add_argument('--root', default=ROOT, help="Repository root holding the EN and DE workbooks")
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--check', action='store_true', help="Only validate the workbooks")
+    parser.add_argument('--force', action='store_true', help="Write the catalogs even if validation fails")
+    args = parser.parse_args(argv)
+
+    catalogs = collections.OrderedDict()
+    problems = []
+    for language, locale, path, text_column in SOURCES:
+        texts, read_problems = read_texts(os.path.join(args.root, path), text_column)
+        catalogs[locale] = texts
+        problems.extend(read_problems)
+    problems.extend(validate(catalogs, get_used_ids()))
+
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if args.check or (problems and not args.force):
+        print(str(len(problems)) + " problems found", file=sys.stderr)
+        return 1 if problems else 0
+
+    ids = get_ids(catalogs)
+    fallback = build_catalog(catalogs[SOURCES[0][1]], ids, {})
+    for language, locale, path, text_column in SOURCES:
+        catalog = build_catalog(catalogs[locale], ids, fallback)
+        output_path = os.path.join(args.output_dir, Texts.LANGUAGES[language] + '.py')
+        with open(output_path, 'w', encoding='utf-8') as output:
+            output.write(format_catalog(catalog, text_column, path))
+        print("Wrote " + str(len(catalog)) + " " + locale + " texts to " + output_path, file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
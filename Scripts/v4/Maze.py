@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Maze floors of Mysterious House, loaded from JSON files
+
+A maze file lists its rows from north to south, '.' for an open cell and '#'
+for a wall, the start and end cells as [x, y] with y counted from the southern
+row, and the cells the haunted armour patrols in order. The patrol is a cycle,
+the armour steps from the last cell back to the first. The start cell must
+open to the north and east only, as the player starts facing north and is
+offered going forward or right.
+
+    {
+        "Rows": ["..#..", "....#", "....#", "..###"],
+        "Start": [0, 0],
+        "End": [4, 3],
+        "ArmourPath": [[1, 1], [0, 1], [0, 2], ...]
+    }
+
+A maze is validated and compiled once when it is loaded: every cell gets a
+mask of its open neighbours and every patrol cell its successor, so a move is
+a constant time lookup however large the grid. Run this module on maze files
+to validate them before shipping.
+
+    python Maze.py Floor2.json
+"""
+
+from __future__ import print_function
+import argparse
+import collections
+import json
+import sys
+
+OPEN_CELL = '.'
+WALL_CELL = '#'
+
+# Exits of a cell as a bit mask, clockwise from north
+NORTH = 1
+EAST = 2
+SOUTH = 4
+WEST = 8
+
+# Exits the start cell must have, the skill's opening texts offer going forward or right
+START_EXITS = NORTH | EAST
+
+# Offset of the neighbour behind each exit
+EXIT_STEPS = ((NORTH, 0, 1), (EAST, 1, 0), (SOUTH, 0, -1), (WEST, -1, 0))
+
+
+class MazeError(Exception):
+    """ Raised when a maze file is malformed or can't be played through """
+
+
+class Maze(object):
+    """ A validated maze with the exits of every cell and the armour's patrol precomputed """
+
+    def __init__(self, rows, start, end, armour_path):
+        # Rows are kept south first so they index by y
+        self.width = len(rows[0])
+        self.height = len(rows)
+        self.start = start
+        self.end = end
+        self.armour_start = armour_path[0]
+        self.exits = self.build_exits(rows)
+        self.armour_next = dict((armour_path[i - 1], armour_path[i]) for i in range(1, len(armour_path)))
+        self.armour_next[armour_path[-1]] = armour_path[0]
+
+    def build_exits(self, rows):
+        exits = []
+        for y in range(self.height):
+            for x in range(self.width):
+                mask = 0
+                for exit_bit, dx, dy in EXIT_STEPS:
+                    if self.contains(x + dx, y + dy) and rows[y + dy][x + dx] == OPEN_CELL:
+                        mask |= exit_bit
+                exits.append(mask)
+        return tuple(exits)
+
+    def contains(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get_exits(self, x, y):
+        # Cells off the grid have no exits
+        if not self.contains(x, y):
+            return 0
+        return self.exits[y * self.width + x]
+
+    def is_end(self, x, y):
+        return x == self.end[0] and y == self.end[1]
+
+    def get_armour_next(self, x, y):
+        # An armour off its patrol, only possible in an altered session, goes back to the start of it
+        return self.armour_next.get((x, y), self.armour_start)
+
+
+def get_cell(value, name):
+    if not isinstance(value, list) or len(value) != 2 or \
+            not all(isinstance(n, int) and not isinstance(n, bool) for n in value):
+        raise MazeError(name + " must be [x, y], got " + json.dumps(value))
+    return value[0], value[1]
+
+
+def get_reachable(rows, start):
+    # Open cells reachable from start, walking between open neighbours
+    reachable = set([start])
+    queue = collections.deque([start])
+    while queue:
+        x, y = queue.popleft()
+        for exit_bit, dx, dy in EXIT_STEPS:
+            cell = (x + dx, y + dy)
+            if cell not in reachable and 0 <= cell[1] < len(rows) and 0 <= cell[0] < len(rows[0]) and \
+                    rows[cell[1]][cell[0]] == OPEN_CELL:
+                reachable.add(cell)
+                queue.append(cell)
+    return reachable
+
+
+def parse_maze(definition):
+    """ Returns the Maze described by a decoded maze file, raises MazeError if it isn't playable """
+    if not isinstance(definition, dict):
+        raise MazeError("A maze must be a JSON object")
+    rows = definition.get('Rows')
+    if not isinstance(rows, list) or not rows or not all(isinstance(row, str) and row for row in rows):
+        raise MazeError("Rows must be a non-empty list of non-empty strings")
+    if any(len(row) != len(rows[0]) for row in rows):
+        raise MazeError("Rows must all be " + str(len(rows[0])) + " cells wide")
+    for row in rows:
+        for cell in row:
+            if cell not in (OPEN_CELL, WALL_CELL):
+                raise MazeError("Unknown cell " + repr(cell) + ", use '" + OPEN_CELL + "' or '" + WALL_CELL + "'")
+    rows = rows[::-1]
+
+    def check_cell(cell, name, must_be_open):
+        x, y = cell
+        if not (0 <= x < len(rows[0]) and 0 <= y < len(rows)):
+            raise MazeError(name + " " + json.dumps([x, y]) + " is outside the maze")
+        if must_be_open and rows[y][x] != OPEN_CELL:
+            raise MazeError(name + " " + json.dumps([x, y]) + " is a wall")
+
+    start = get_cell(definition.get('Start'), "Start")
+    end = get_cell(definition.get('End'), "End")
+    check_cell(start, "Start", True)
+    check_cell(end, "End", True)
+    start_exits = sum(exit_bit for exit_bit, dx, dy in EXIT_STEPS
+                      if 0 <= start[0] + dx < len(rows[0]) and 0 <= start[1] + dy < len(rows) and
+                      rows[start[1] + dy][start[0] + dx] == OPEN_CELL)
+    if start_exits != START_EXITS:
+        raise MazeError("Start " + json.dumps(list(start)) + " must open north and east only")
+    if end not in get_reachable(rows, start):
+        raise MazeError("End " + json.dumps(list(end)) + " can't be reached from the start")
+
+    armour_path = definition.get('ArmourPath')
+    if not isinstance(armour_path, list) or not armour_path:
+        raise MazeError("ArmourPath must be a non-empty list of cells")
+    armour_path = [get_cell(cell, "ArmourPath cell") for cell in armour_path]
+    for cell in armour_path:
+        # The armour walks through walls, so its cells only need to be on the grid
+        check_cell(cell, "ArmourPath cell", False)
+    if len(set(armour_path)) != len(armour_path):
+        raise MazeError("ArmourPath visits a cell twice")
+    for i, cell in enumerate(armour_path):
+        previous = armour_path[i - 1]
+        if len(armour_path) > 1 and abs(cell[0] - previous[0]) + abs(cell[1] - previous[1]) != 1:
+            raise MazeError("ArmourPath steps from " + json.dumps(list(previous)) + " to " +
+                            json.dumps(list(cell)) + ", which are not neighbours")
+
+    return Maze(rows, start, end, armour_path)
+
+
+def load_maze(path):
+    try:
+        with open(path, 'rb') as f:
+            definition = json.loads(f.read().decode('utf-8'))
+    except (IOError, ValueError) as e:
+        raise MazeError("Can't read maze " + path + ": " + str(e))
+    try:
+        return parse_maze(definition)
+    except MazeError as e:
+        raise MazeError(path + ": " + str(e))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate Mysterious House maze files")
+    parser.add_argument('paths', nargs='+', metavar='MAZE')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.paths:
+        try:
+            maze = load_maze(path)
+        except MazeError as e:
+            print(e, file=sys.stderr)
+            failures += 1
+        else:
+            print(path + ": " + str(maze.width) + "x" + str(maze.height) + ", armour patrols " +
+                  str(len(maze.armour_next)) + " cells", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,44 +4,41 @@ Mysterious House Game for Amazon Alexa by Benjamin Dring
 """
 
 from __future__ import print_function
-import time
-import boto3
-from boto3.dynamodb.conditions import Key, Attr
-from botocore.exceptions import ClientError
+import collections
+import contextvars
+import functools
+import json
+import os
+import threading
+import Maze
+import Storage
+import Texts
 
 # --------------- Helpers that build all of the responses ----------------------
 
-def build_speechlet_response(title, output, reprompt_text, should_end_session = False):
-    return {
-        'outputSpeech': {
-            'type': 'SSML',
-            'ssml': '<speak>' + output + '</speak>'
-        },
-        'card': {
-            'type': 'Simple',
-            'title': title,
-            'content': output
-        },
-        'reprompt': {
-            'outputSpeech': {
-                'type': 'PlainText',
-                'text': reprompt_text
-            }
-        },
-        'shouldEndSession': should_end_session
-    }
+def build_sequence_response(title, segments, reprompt_text, should_end_session = False):
+    """ Builds a response from speech and audio segments in order
 
-
-def build_audio_response(title, begin_output, audio_url, end_output, reprompt_text, should_end_session = False):
+    segments alternates speech and audio file urls, starting and ending with
+    speech, e.g. (speech, audio_url, speech, audio_url, speech). The card shows
+    the speech alone.
+    """
+    ssml = ['<speak>']
+    for index, segment in enumerate(segments):
+        if index % 2 == 0:
+            ssml.append(segment)
+        else:
+            ssml.extend(('<audio src="', segment, '"/>'))
+    ssml.append('</speak>')
     return {
         'outputSpeech': {
             'type': 'SSML',
-            'ssml': '<speak>' + begin_output + '<audio src="' + audio_url + '"/>' + end_output + '</speak>'
+            'ssml': ''.join(ssml)
         },
         'card': {
             'type': 'Simple',
             'title': title,
-            'content': begin_output + end_output
+            'content': ''.join(segments[::2])
         },
         'reprompt': {
             'outputSpeech': {
@@ -53,27 +50,8 @@ def build_audio_response(title, begin_output, audio_url, end_output, reprompt_te
     }
 
 
-def build_doubleaudio_response(title, begin_output, audio_url, mid_output, audio2_url, end_output,
-                               reprompt_text, should_end_session = False):
-    return {
-        'outputSpeech': {
-            'type': 'SSML',
-            'ssml': '<speak>' + begin_output + '<audio src="' + audio_url + '"/>' + mid_output +
-                    '<audio src="' + audio2_url + '"/>' + end_output + '</speak>'
-        },
-        'card': {
-            'type': 'Simple',
-            'title': title,
-            'content': begin_output + mid_output + end_output
-        },
-        'reprompt': {
-            'outputSpeech': {
-                'type': 'PlainText',
-                'text': reprompt_text
-            }
-        },
-        'shouldEndSession': should_end_session
-    }
+def build_speechlet_response(title, output, reprompt_text, should_end_session = False):
+    return build_sequence_response(title, (output,), reprompt_text, should_end_session)
 
 
 def build_response(session_attributes, speechlet_response):
@@ -89,139 +67,60 @@ def get_response(session_attributes, title, output, reprompt_text = None, should
         title, output, reprompt_text, should_end_session))
 
 
+def get_sequence_response(session_attributes, title, segments, reprompt_text = None, should_end_session = False):
+    return build_response(session_attributes, build_sequence_response(
+        title, segments, reprompt_text, should_end_session))
+
+
 def get_audio_response(session_attributes, title, begin_output, audio_url, end_output,
                        reprompt_text = None, should_end_session = False):
-    return build_response(session_attributes, build_audio_response(
-        title,  begin_output, audio_url, end_output, reprompt_text, should_end_session))
+    return get_sequence_response(session_attributes, title, (begin_output, audio_url, end_output),
+                                 reprompt_text, should_end_session)
 
 
 def get_doubleaudio_response(session_attributes, title, begin_output, audio_url, mid_output, audio2_url, end_output,
                               reprompt_text = None, should_end_session = False):
-    return build_response(session_attributes, build_doubleaudio_response(
-        title,  begin_output, audio_url, mid_output, audio2_url, end_output, reprompt_text, should_end_session))
+    return get_sequence_response(session_attributes, title,
+                                 (begin_output, audio_url, mid_output, audio2_url, end_output),
+                                 reprompt_text, should_end_session)
 
 # --------------- Database
-def SetStartingData(userID):
-    try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        table.put_item(
-            Item={
-                'UserID': userID,
-                'CanWarp': False,
-                'FloorNumber': 1,
-                'LastUpdate': time.strftime("%Y-%m-%d")
-            }
-        )
-    except ClientError as e1:
-        print('Failed Database Access')
+# A player with no stored item has the default progress (floor 1, no warp),
+# nothing is written for them until they first make progress.
+# Reads only fetch the progress attributes and are eventually consistent unless
+# consistent is set, or the player was saved moments ago by this container.
 
-def LoadFloorNumber(userID):
+def LoadFloorNumber(player, consistent=False):
     try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        response = table.get_item(
-            Key={
-                'UserID': userID
-            }
-        )
-        if (len(response) < 2):
-            SetStartingData(userID)
-            return 1
-        else:
-            item = response['Item']
-            floorNumber = item['FloorNumber']
-            if (floorNumber < 0 or floorNumber > 3):
-                SaveFloorNumber(userID, 1)
-                return 1
-            else:
-                return floorNumber
-    except ClientError as e1:
-        try:
-            SetStartingData(userID)
-            return 1
-        except ClientError as e2:
-            return 1
-
-def LoadCanWarp(userID):
+        item = player.get_item(Storage.PROGRESS_ATTRIBUTES, consistent)
+    except Storage.StorageError as e:
+        return Storage.DEFAULT_PROGRESS['FloorNumber']
+    if item is None:
+        return Storage.DEFAULT_PROGRESS['FloorNumber']
+    floorNumber = item['FloorNumber']
+    if (floorNumber < 0 or floorNumber > 3):
+        SaveFloorNumber(player, 1)
+        return 1
+    else:
+        return floorNumber
+
+def LoadCanWarp(player, consistent=False):
     try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        response = table.get_item(
-            Key={
-                'UserID': userID
-            }
-        )
-        if (len(response) < 2):
-            SetStartingData(userID)
-            return False
-        else:
-            item = response['Item']
-            canWarp = item['CanWarp']
-            return canWarp
-    except ClientError as e1:
-        try:
-            SetStartingData(userID)
-            return False
-        except ClientError as e2:
-            return False
+        item = player.get_item(Storage.PROGRESS_ATTRIBUTES, consistent)
+    except Storage.StorageError as e:
+        return Storage.DEFAULT_PROGRESS['CanWarp']
+    if item is None:
+        return Storage.DEFAULT_PROGRESS['CanWarp']
+    return item['CanWarp']
 
-def SaveFloorNumber(userID, floorNumber):
-    try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        response = table.update_item(
-            Key={
-                'UserID': userID
-            },
-            UpdateExpression="set CanWarp=:c, FloorNumber=:f, LastUpdate=:u",
-            ExpressionAttributeValues={
-                ':c': LoadCanWarp(userID),
-                ':f': floorNumber,
-                ':u': time.strftime("%Y-%m-%d")
-            },
-            ReturnValues = "UPDATED_NEW"
-        )
-    except ClientError as e:
-        print('Update Failed')
+def SaveFloorNumber(player, floorNumber):
+    player.save(FloorNumber=floorNumber)
 
-def SaveCanWarp(userID, canWarp):
-    try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        response = table.update_item(
-            Key={
-                'UserID': userID
-            },
-            UpdateExpression="set CanWarp=:c, FloorNumber=:f, LastUpdate=:u",
-            ExpressionAttributeValues={
-                ':c': canWarp,
-                ':f': LoadFloorNumber(userID),
-                ':u': time.strftime("%Y-%m-%d")
-            },
-            ReturnValues = "UPDATED_NEW"
-        )
-    except ClientError as e:
-        print('Update Failed')
+def SaveCanWarp(player, canWarp):
+    player.save(CanWarp=canWarp)
 
-def SaveAll(userID, canWarp, floorNumber):
-    try:
-        dynamodb = boto3.resource('dynamodb')
-        table = dynamodb.Table('MysteriousHouse')
-        response = table.update_item(
-            Key={
-                'UserID': userID
-            },
-            UpdateExpression="set CanWarp=:c, FloorNumber=:f, LastUpdate=:u",
-            ExpressionAttributeValues={
-                ':c': canWarp,
-                ':f': floorNumber,
-                ':u': time.strftime("%Y-%m-%d")
-            },
-            ReturnValues = "UPDATED_NEW"
-        )
-    except ClientError as e:
-        print('Update Failed')
+def SaveAll(player, canWarp, floorNumber):
+    player.save(CanWarp=canWarp, FloorNumber=floorNumber)
 
 
 # --------------- Attributes
@@ -254,7 +153,8 @@ def construct_floor2_attributes(x, y, osstate, mob_x, mob_y):
 
 
 def get_starting_floor2_attributes():
-    return  construct_floor2_attributes(0, 0, 0, 1, 1)
+    return construct_floor2_attributes(floor2.start[0], floor2.start[1], 0, floor2.armour_start[0],
+                                       floor2.armour_start[1])
 
 
 def get_starting_floor3_attributes():
@@ -361,1273 +261,684 @@ def jam_sound():
     return "https://www.benjamindring.co.uk/Resources/MysteriousHouse/Jam.mp3"
 
 # --------------- Locale
-
-def locale_de():
-    return locale == "de-DE"
-
-# --------------- Text Body
-
-def Speech_Start_1():
-    if locale_de():
-        return "Du kommst zu einem geheimnisvollen Haus und öffnest die Eingangstür. "
-    else:
-        return "You arrive at a mysterious house and open the front door. "
-
-def Speech_Start_2():
-    if locale_de():
-        return "Du siehst zwei weitere Türen – eine nach links und eine nach rechts. Welche Tür möchtest du zuerst öffnen? "
-    else:
-        return "You see two more doors, one left and one right. Which door would you like to open first? "
-
-def Speech_Start_repeat():
-    if locale_de():
-        return "Die linke oder die rechte Tür öffnen? "
-    else:
-        return "Open the left or right door? "
-
-def Speech_Load_Floor2_1():
-    if locale_de():
-        return "Gespeichertes Spiel geladen, sage „Neustart“, um erneut zu beginnen. Du befindest dich in einem schwach beleuchteten Korridor am unteren Ende einer Leiter. "
-    else:
-        return "Game Save Loaded, say restart to restart from the beginning. You are in a dimly lit corridor at the base of a ladder. "
-
-def Speech_Load_Floor2_2():
-    if locale_de():
-        return "Auf dem Boden ist etwas Rotes, Klebriges. Du hörst das Geräusch von Metall auf Metall. "
-    else:
-        return "There is something red and sticky on the floor. You can hear the clattering of metal. "
-
-def Speech_Load_Floor2_3():
-    if locale_de():
-        return "Etwas bewegt sich hier unten. Du kannst entweder vorwärts einen Korridor hinunter oder nach rechts " \
-               "in einen anderen Korridor gehen. Was möchtest du tun? "
-    else:
-        return "something is moving down here. You can either go forward down one corridor or move right " \
-               "down another. What would you like to do? "
-
-def Speech_Load_Floor2_repeat():
-    if locale_de():
-        return "Geradeaus oder nach rechts gehen? "
-    else:
-        return "Go straight ahead or right? "
-
-def Speech_Load_Floor3_1():
-    if locale_de():
-        return "Gespeichertes Spiel geladen, sage „Neustart“, um erneut zu beginnen. Du bist auf Etage 3, in " \
-               "einem einzelnen Raum. Du hörst ein Geräusch. "
-    else:
-        return "Game Save Loaded, say restart to restart from the beginning. You are on floor 3, in a single room. " \
-               "You hear a noise. "
-
-def Speech_Load_Floor3_2():
-    if locale_de():
-        return "Das Loch, in das du hinabgestiegen bist, wurde von der anderen Seite verschlossen. " \
-               "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, " \
-               "einen Teller mit glasierten Donuts und auf dem anderen Tisch einen Biskuitkuchen. " \
-               "Wofür entscheidest du dich? "
-    else:
-        return "The hole you had climbed down has been sealed from the other side. " \
-               "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, " \
-               "the other has a full Victoria sponge cake. Which do you choose? Which do you choose? "
-
-def Speech_Load_Floor3_repeat():
-    if locale_de():
-        return "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? "
-    else:
-        return "Which do you choose? The cake or the doughnuts? "
-
-def Speech_End():
-    if locale_de():
-        return "Viele Dank dafür, dass du Mysterious House spielst! "
-    else:
-        return "Thank you for playing Mysterious House! "
-
-def Speech_misunderstood():
-    if locale_de():
-        return "Ich habe leider nicht verstanden, was du damit meinst. Bitte sage etwas anderes. "
-    else:
-        return "Sorry I don't understand what you meant by that. Try saying something else. "
-
-def Speech_error(error_code):
-    if locale_de():
-        return "Leider ist etwas nicht in Ordnung, bitte melde den Vorfall, einen schönen Tag noch. " \
-               "Fehlercode " + error_code
-    else:
-        return "Sorry something has broken, please report this issue, have a nice day. Error code " + error_code
-
-def Speech_Floor1_X0_Help():
-    if locale_de():
-        return "Sage: „Sprechen“, um zu Barry zu sprechen, oder „Zurück“, um den Raum zu verlassen. "
-    else:
-        return "Say: Talk, to talk to Barry or say: Back, to leave the room. "
-
-def Speech_Floor1_X0_Revisit_1():
-    if locale_de():
-        return "Barry ist immer noch sehr an dem statischen Bild interessiert, "
-    else:
-        return "Barry is still very interested in the static picture, "
-
-def Speech_Floor1_X0_Revisit_2():
-    if locale_de():
-        return "Möchtest du zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Would you like to talk to Barry or head back? "
-
-def Speech_Floor1_X0_Visit_1():
-    if locale_de():
-        return "Ein entspannter Geist betrachtet einen statischen Fernsehbildschirm. Auf dem Namensschild auf seinem Tisch steht „Barry“. "
-    else:
-        return "A relaxed ghost is watching a static television screen. The name plate on his desk says Barry. "
-
-def Speech_Floor1_X0_Visit_2():
-    if locale_de():
-        return "Möchtest du zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Would you like to talk to Barry or head back? "
-
-def Speech_Floor1_X0_Visit_Rep():
-    if locale_de():
-        return "Zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Talk to Barry or go back? "
-
-def Speech_Floor1_X1_Help():
-    if locale_de():
-        return "Sage: „Links“, um durch die linke Tür zu gehen. Sage: „Rechts“, um durch die rechte Tür zu gehen. "
-    else:
-        return "Say: Left, to go through the left door. Say: Right, to go through the right door. "
-
-def Speech_Floor1_X1_Revisit_1():
-    if locale_de():
-        return "Du gelangst zur Eingangshalle zurück. "
-    else:
-        return "You return back to the entrance hall. "
-
-def Speech_Floor1_X1_Revisit_2():
-    if locale_de():
-        return "Möchtest du durch die linke oder durch die rechte Tür gehen? "
-    else:
-        return "Would you like to go through the left or right door? "
-
-def Speech_Floor1_X1_Visit_1():
-    if locale_de():
-        return "Du bist gerade an dem geheimnisvollen Haus angekommen. "
-    else:
-        return "You have just arrived at the mysterious house, "
-
-def Speech_Floor1_X1_Visit_2():
-    if locale_de():
-        return "Möchtest du durch die linke oder durch die rechte Tür gehen? "
-    else:
-        return "would you like to go through the left or right door? "
-
-def Speech_Floor1_X1_Visit_Rep():
-    if locale_de():
-        return "Linke oder rechte Tür? "
-    else:
-        return "Left or Right door? "
-
-def Speech_Floor1_X2_Help():
-    if locale_de():
-        return "Sage: „Sprechen“, um zu Larry zu sprechen, oder „Zurück“, um den Raum zu verlassen. "
-    else:
-        return "Say: Talk, to talk to Larry or say: Back, to leave the room. "
-
-def Speech_Floor1_X2_Revisit_1():
-    if locale_de():
-        return "Larry bewacht weiterhin die Leiter, er sieht etwas gelangweilt aus. "
-    else:
-        return "Larry remains guarding the ladder, he seems a bit bored. "
-
-def Speech_Floor1_X2_Revisit_2():
-    if locale_de():
-        return "Möchtest du zu Larry sprechen oder zurückgehen? "
-    else:
-        return "Would you like to talk to Larry or head back? "
-
-def Speech_Floor1_X2_Visit_1():
-    if locale_de():
-        return "Eine nach unten führende Leiter wird von einem müde aussehenden Geist bewacht. " \
-               "Auf seinem Namensschild steht „Larry“"
-    else:
-        return "A ladder leading underground is guarded by a tired-looking ghost. His name tag says Larry. "
-
-def Speech_Floor1_X2_Visit_2():
-    if locale_de():
-        return "Auf dem Boden befindet sich eine Art weißes Pulver. Möchtest du zu Larry sprechen oder zurückgehen?"
-    else:
-        return "There is some sort of white powder on the floor. Would you like to talk to Larry or head back? "
-
-def Speech_Floor1_X2_Visit_Rep():
-    if locale_de():
-        return "Zu Larry sprechen oder zurückgehen? "
-    else:
-        return "Talk to Larry or go back? "
-
-def Speech_Floor1_BarryInitial():
-    if locale_de():
-        return "Barry ruft: Du hast hier nichts zu suchen, raus! Möchtest du erneut zu Barry sprechen oder " \
-               "zurückgehen? "
-    else:
-        return "Barry yells: You're not allowed in here, Get out! Would you like to talk to Barry again or go back? "
-
-def Speech_Floor1_BarryAsk():
-    if locale_de():
-        return "Barry ruft: Was?! Ich soll eine Ebene hinab gehen? Kommt nicht in Frage. " \
-               "Möchtest du erneut zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Barry yells: What?! You want me to let you go down a level? No chance. " \
-               "Would you like to talk to Barry again or go back? "
-
-def Speech_Floor1_BarryAsk_Revisit():
-    if locale_de():
-        return "Barry ruft: Ich sagte „Nein“! Und jetzt raus! Möchtest du erneut zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Barry yells: I said no! Now get out! Would you like to talk to Barry again or go back? "
-
-def Speech_Floor1_BarryInitial_Repeat():
-    if locale_de():
-        return "Barry möchte nicht reden, möchtest du erneut versuchen, zu ihm zu sprechen, oder gehst du zurück? "
-    else:
-        return "Barry doesn't want to talk, try to speak again or go back? "
-
-def Speech_Floor1_BarryAsk_Repeat():
-    if locale_de():
-        return "Barry lehnt deine Bitte ab, erneut fragen oder zurück gehen? "
-    else:
-        return "Barry rejects your request, ask again or go back? "
-
-def Speech_Floor1_BarryAsk_Revisit_Repeat():
-    if locale_de():
-        return "Barry lehnt deine Bitte immer noch ab, erneut fragen oder zurück gehen? "
-    else:
-        return "Barry still rejects your request, ask again or go back? "
-
-def Speech_Floor1_Larry():
-    if locale_de():
-        return "Hallo, ich heiße Larry. Ich kann dich nicht weiter lassen. Wenn du weiter willst, " \
-               "frage Barry im anderen Raum. Möchtest du erneut zu Larry sprechen oder zurückgehen?"
-    else:
-        return "Hello I'm Larry, sorry, I can't let you continue, " \
-               "if you want to get past ask Barry in the other room. Would you like to talk to Larry again or go back?"
-
-def Speech_Floor1_Larry_Revisit():
-    if locale_de():
-        return "Larry sagt: Sprich mit Barry, wenn du weiter willst. "
-    else:
-        return "Larry says: Talk to Barry if you want to get past. "
-
-def Speech_Floor1_Larry_PostBarry():
-    if locale_de():
-        return "Larry sagt: Hat Barry „Ja“ gesagt? "
-    else:
-        return "Larry says: Did Barry say yes? "
-
-def Speech_Floor1_Larry_Repeat():
-    if locale_de():
-        return "Erneut zu Larry sprechen oder zurückgehen? "
-    else:
-        return "Talk to Larry again or go back? "
-
-def Speech_Floor2_Start():
-    if locale_de():
-        return "Du bist gerade die Leiter hinuntergeklettert, möchtest du geradeaus gehen? " \
-               "Oder möchtest du den Weg nach rechts nehmen? "
-    else:
-        return "You have just climbed down the ladder, would you like to go straight ahead? or take the path right? "
-
-def Speech_Floor2_Start_Repeat():
-    if locale_de():
-        return "Vorwärts oder nach rechts? "
-    else:
-        return "Go forward or right? "
-
-def Speech_Floor2_FLRB():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach links, nach rechts oder wieder zurück " \
-               "gehen? "
-    else:
-        return "You have reached a junction, would you like to go forward, left, right or go back the way you came? "
-
-def Speech_Floor2_FLRB_Repeat():
-    if locale_de():
-        return "Vorwärts, nach links, nach rechts, oder zurück? "
-    else:
-        return "Go forward, left, right or back? "
-
-def Speech_Floor2_FLR():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du geradeaus, nach links oder nach rechts gehen? "
-    else:
-        return "You have reached a junction, would you like to go straight on, left or right? "
-
-def Speech_Floor2_FLR_Repeat():
-    if locale_de():
-        return "Vorwärts, nach links oder nach rechts? "
-    else:
-        return "Go forward, left or right? "
-
-def Speech_Floor2_FLB():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach links oder wieder zurück gehen? "
-    else:
-        return "You have reached a junction, would you like to go forward, left, or go back the way you came? "
-
-def Speech_Floor2_FLB_Repeat():
-    if locale_de():
-        return "Vorwärts, nach links oder zurück? "
-    else:
-        return "Go forward, left or back? "
-
-def Speech_Floor2_FRB():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach rechts oder wieder zurück gehen? "
-    else:
-        return "You have reached a junction, would you like to go forward, right, or go back the way you came? "
-
-def Speech_Floor2_FRB_Repeat():
-    if locale_de():
-        return "Vorwärts, nach rechts oder zurück? "
-    else:
-        return "Go forward, right, or back? "
-
-def Speech_Floor2_LRB():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du nach links, nach rechts oder wieder zurück gehen? "
-    else:
-        return "You have reached a junction, would you like to go left, right or go back the way you came? "
-
-def Speech_Floor2_LRB_Repeat():
-    if locale_de():
-        return "Nach links, nach rechts oder wieder zurück? "
-    else:
-        return "Go left, right or back the way you came? "
-
-def Speech_Floor2_FL():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du geradeaus oder nach links gehen? "
-    else:
-        return "You have reached a junction, would you like to go straight on or left? "
-
-def Speech_Floor2_FL_Repeat():
-    if locale_de():
-        return "Vorwärts oder nach links? "
-    else:
-        return "Go forward or left? "
-
-def Speech_Floor2_FR():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du geradeaus oder nach rechts gehen? "
-    else:
-        return "You have reached a junction, would you like to go straight on or right? "
-
-def Speech_Floor2_FR_Repeat():
-    if locale_de():
-        return "Vorwärts oder nach rechts? "
-    else:
-        return "Go forward or right? "
-
-def Speech_Floor2_LR():
-    if locale_de():
-        return "Du hast eine Kreuzung erreicht, möchtest du nach links, nach rechts oder wieder zurück gehen? "
-    else:
-        return "You have reached a junction, would you like to go left, right or go back the way you came? "
-
-def Speech_Floor2_LR_Repeat():
-    if locale_de():
-        return "Nach links, nach rechts oder wieder zurück? "
-    else:
-        return "Go left, right or back the way you came? "
-
-def Speech_Floor2_LB():
-    if locale_de():
-        return "Der Weg knickt plötzlich nach links ab, " \
-               "möchtest du ihm weiter nach links folgen oder wieder zurück gehen? "
-    else:
-        return "The path bends suddenly to the left, " \
-               "would you like to follow the path left or go back the way you came? "
-
-def Speech_Floor2_LB_Repeat():
-    if locale_de():
-        return "möchtest du dem Pfad nach links folgen oder wieder zurück gehen? "
-    else:
-        return "would you like to follow the path left or go back the way you came? "
-
-def Speech_Floor2_RB():
-    if locale_de():
-        return "Der Weg knickt plötzlich nach rechts ab, " \
-               "möchtest du ihm weiter nach rechts folgen oder wieder zurück gehen? "
-    else:
-        return "The path bends suddenly to the right, " \
-               "would you like to follow the path right or go back the way you came? "
-
-def Speech_Floor2_RB_Repeat():
-    if locale_de():
-        return "möchtest du dem Pfad nach rechts folgen oder wieder zurück gehen? "
-    else:
-        return "would you like to follow the path right or go back the way you came? "
-
-def Speech_Floor2_Armour_1():
-    if locale_de():
-        return " Plötzlich tritt eine Geisterritterrüstung aus dem Schatten. "
-    else:
-        return " Suddenly A haunted suit of armour looms from the shadows. "
-
-def Speech_Floor2_Armour_2():
-    if locale_de():
-        return "Du fällst in Ohnmacht. Die erwachst am Fuße einer Leiter. " \
-               "Möchtest du geradeaus oder nach rechts gehen?"
-    else:
-        return "You black out. You awake at the base of the ladder. " \
-               "Would you like to go straight ahead or right? "
-
-def Speech_Floor2_Armour_Repeat():
-    if locale_de():
-        return "Geradeaus oder nach rechts? "
-    else:
-        return "Go straight ahead of right? "
-
-def Speech_Floor2_End_1():
-    if locale_de():
-        return " Die findest eine weitere Leiter, die eine weitere Ebene nach unten führt. " \
-               "Du kletterst hinunter und gelangst in einen einzelnen Raum. Du hörst ein Geräusch. "
-    else:
-        return " You found another ladder, going down another level deeper. " \
-               "You climb down and end up in a single room. You hear a noise.  "
-
-def Speech_Floor2_End_2():
-    if locale_de():
-        return " Das Loch, in das du gerade hinabgestiegen bist, wurde von der anderen Seite verschlossen. " \
-               "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, " \
-               "einen Teller mit glasierten Donuts und auf dem anderen Tisch einen Biskuitkuchen. " \
-               "Wofür entscheidest du dich? "
-    else:
-        return " The hole you just climbed down has been sealed from the other side. " \
-               "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, " \
-               "the other has a full Victoria sponge cake. Which do you choose? "
-
-def Speech_Floor2_End_Repeat():
-    if locale_de():
-        return "Wofür entscheidest du dich? Nimmst du die Donuts oder den Kuchen? "
-    else:
-        return "Which do you choose? The doughnuts or the cake? "
-
-def Speech_Floor2_Action_F():
-    if locale_de():
-        return "Du gehst weiter geradeaus. "
-    else:
-        return "You continue straight ahead. "
-
-def Speech_Floor2_Action_B():
-    if locale_de():
-        return "Du drehst dich um und gehst zurück. "
-    else:
-        return "You turn around and go back. "
-
-def Speech_Floor2_Action_L():
-    if locale_de():
-        return "Du wendest dich nach links. "
-    else:
-        return "You turn left. "
-
-def Speech_Floor2_Action_LF():
-    if locale_de():
-        return "Du folgst dem Pfad nach links. "
-    else:
-        return "You follow the path left. "
-
-def Speech_Floor2_Action_R():
-    if locale_de():
-        return "Du wendest dich nach rechts. "
-    else:
-        return "You turn right. "
-
-def Speech_Floor2_Action_RF():
-    if locale_de():
-        return "Du folgst dem Pfad nach rechts. "
-    else:
-        return "You follow the path right. "
-
-def Speech_Warp2_1():
-    if locale_de():
-        return "Du springst in einen schwach beleuchteten Korridor am unteren Ende einer Leiter, "
-    else:
-        return "You warp to a dimly lit corridor at the base of a ladder, "
-
-def Speech_Warp2_2():
-    if locale_de():
-        return "Auf dem Boden ist etwas Rotes, Klebriges. Du hörst das Geräusch von Metall auf Metall. "
-    else:
-        return "There is something red and sticky on the floor. You can hear the clattering of metal. "
-
-def Speech_Warp2_3():
-    if locale_de():
-        return "Etwas bewegt sich hier unten. Du kannst entweder vorwärts einen Korridor hinunter " \
-               "oder nach rechts in einen anderen Korridor gehen. Was möchtest du tun? "
-    else:
-        return "Something is moving down here. " \
-               "You can either go forward down one corridor or move right down another. What would you like to do? "
-
-def Speech_Warp2_Repeat():
-    if locale_de():
-        return "Geradeaus oder nach rechts gehen? "
-    else:
-        return "Go straight ahead or right? "
-
-def Speech_Warp3_1():
-    if locale_de():
-        return "Du springst auf Etage 3 und landest in einem einzelnen Raum. Du hörst ein Geräusch. "
-    else:
-        return "You warp to floor 3 and end up in a single room. You hear a noise. "
-
-def Speech_Warp3_2():
-    if locale_de():
-        return "Das Loch, in das du gerade hinabgestiegen bist, wurde von der anderen Seite verschlossen. " \
-               "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, " \
-               "einen Teller mit glasierten Donuts und auf dem anderen Tisch einen Biskuitkuchen. " \
-               "Wofür entscheidest du dich?"
-    else:
-        return "The hole you just climbed down has been sealed from the other side. " \
-               "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, " \
-               "the other has a full Victoria sponge cake. Which do you choose? "
-
-def Speech_Warp3_Repeat():
-    if locale_de():
-        return "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? "
-    else:
-        return "Which do you choose? The cake or the doughnuts? "
-
-def Speech_Warp_InvalidNumber():
-    if locale_de():
-        return "Diese Etage gibt es nicht, du kannst nur zu den Etagen eins, zwei und drei springen. "
-    else:
-        return "That floor does not exist, you can only warp to floors one, two and three. "
-
-def Speech_Warp_InvalidString():
-    if locale_de():
-        return "Du kannst nicht zu dieser Etage springen. "
-    else:
-        return "You cannot warp to that floor. "
-
-def Speech_Warp_Locked():
-    if locale_de():
-        return "Du hast die Sprungfunktion noch nicht entsperrt. "
-    else:
-        return "You have not unlocked warping yet. "
-
-def Speech_Floor1_LeftInvalid():
-    if locale_de():
-        return "Du kannst hier nicht nach links gehen. "
-    else:
-        return "You can't go left here. "
-
-def Speech_Floor1_RightInvalid():
-    if locale_de():
-        return "Du kannst hier nicht nach rechts gehen. "
-    else:
-        return "You can't go right here. "
-
-def Speech_Floor1_Repeat_Barry():
-    if locale_de():
-        return "Zu Barry sprechen oder zurückgehen? "
-    else:
-        return "Talk to Barry or go back? "
-
-def Speech_Floor1_Repeat_Larry():
-    if locale_de():
-        return "Zu Larry sprechen oder zurückgehen? "
-    else:
-        return "Talk to Larry or go back? "
-
-def Speech_Floor1_Repeat_Entrance():
-    if locale_de():
-        return "Nach links oder nach rechts? "
-    else:
-        return "Go left or right? "
-
-def Speech_Floor1_SpeakInvalid():
-    if locale_de():
-        return "Hier ist niemand, mit dem du sprechen könntest. "
-    else:
-        return "There is nobody to speak to here. "
-
-def Speech_Floor1_NoEscape():
-    if locale_de():
-        return "Du bist in der Eingangshalle, es gibt kein Entkommen. "
-    else:
-        return "You are in the entrance hall, there is no escaping. "
-
-def Speech_Floor1_BarrySaidNo():
-    if locale_de():
-        return "Larry sagt: Leider kann ich dich nicht gehen lassen. "
-    else:
-        return "Larry Says: Oh Too bad, sorry I can't let you go. "
-
-def Speech_Floor1_BarrySaidYes_1():
-    if locale_de():
-        return "Larry wirkt überrascht, aber lässt dich die Leiter hinabsteigen. " \
-               "Die Leiter endet in einem schwach. "
-    else:
-        return "Larry seems surprised but lets you climb down the ladder anyway. " \
-               "The ladder stops in a dimly lit corridor. "
-
-def Speech_Floor1_BarrySaidYes_2():
-    if locale_de():
-        return "Auf dem Boden ist etwas Rotes, Klebriges. " \
-               "Du hörst das Geräusch von Metall auf Metall. "
-    else:
-        return "There is something red and sticky on the floor. " \
-               "You can hear the clattering of metal. "
-
-def Speech_Floor1_BarrySaidYes_3():
-    if locale_de():
-        return "Etwas bewegt sich hier unten. " \
-               "Du kannst entweder vorwärts einen Korridor hinunter oder nach rechts in einen anderen Korridor gehen. " \
-               "Was möchtest du tun?"
-    else:
-        return "Something is moving down here. " \
-               "You can either go forward down one corridor or move right down another. " \
-               "What would you like to do?"
-
-def Speech_Floor2_Help():
-    if locale_de():
-        return "Auf dieser Etage kannst du die Figur bewegen. " \
-               "Sage: „Vorwärts“, um in Blickrichtung der Figur zu gehen. " \
-               "Sage: „Links“, um dich nach links zu wenden. " \
-               "Sage: „Rechts“, um dich nach rechts zu wenden; sage „Zurück“, um wieder zurückzugehen. "
-    else:
-        return "On this floor you can move the character. " \
-               "Say: forward, to move the direction the character is facing. " \
-               "Say: left, to turn left. Say: right, to turn right, " \
-               "Say: back, to turn around and go back to where you came from. "
-
-def Speech_Floor2_InvalidDirection_F():
-    if locale_de():
-        return "Du kannst hier nicht vorwärts gehen. "
-    else:
-        return "You cannot move forward here. "
-
-def Speech_Floor2_InvalidDirection_L():
-    if locale_de():
-        return "Du kannst hier nicht nach links gehen. "
-    else:
-        return "You cannot move left here. "
-
-def Speech_Floor2_InvalidDirection_R():
-    if locale_de():
-        return "Du kannst hier nicht nach rechts gehen. "
-    else:
-        return "You cannot move right here. "
-
-def Speech_Floor2_InvalidDirection_B():
-    if locale_de():
-        return "Es gibt kein Entkommen. "
-    else:
-        return "There is no escape. "
-
-def Speech_Floor2_InvalidDirection_Continue():
-    if locale_de():
-        return "Die kannst hier nicht weiter vorwärts gehen. "
-    else:
-        return "You can't continue forward here. "
-
-def Speech_Floor3_Start():
-    if locale_de():
-        return "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, " \
-               "einen Teller mit glasierten Donuts und auf dem anderen Tisch einen Biskuitkuchen. " \
-               "Wofür entscheidest du dich? "
-    else:
-        return "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, " \
-               "the other has a full Victoria sponge cake. Which do you choose? "
-
-def Speech_Floor3_Help():
-    if locale_de():
-        return "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, " \
-               "einen Teller mit glasierten Donuts und auf dem anderen Tisch einen Biskuitkuchen. " \
-               "Um den Kuchen zu wählen, sage: „Kuchen“. Um die Donuts zu wählen, sage: „Donuts“. " \
-               "Wählst du den Kuchen oder die Donuts? "
-    else:
-        return "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, " \
-               "the other has a full Victoria sponge cake. To choose the cake, Say: Cake. " \
-               "To choose the doughnuts, Say: Doughnuts. Do you choose the cake or the doughnuts? "
-
-def Speech_Floor3_Repeat():
-    if locale_de():
-        return "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? "
-    else:
-        return "Which do you choose? The cake or the doughnuts? "
-
-def Speech_Floor3_Cake():
-    if locale_de():
-        return "Du nimmst ein Stück von dem Biskuitkuchen. Dies ist der beste Kuchen, den du je gegessen hast. " \
-               "Plötzlich beginnst du, heftig zu husten. Du wurdest vergiftet. " \
-               "Du drehst dich um und siehst eine Geisterritterrüstung. Diese sagt: „Danke, ich bin frei. " \
-               "Der Geist verlässt die Rüstung und verschwindet im Nichts. Du fällst in Ohnmacht. " \
-               "Als du erwachst, hast du keinen Körper, du bist ein Geist in dieser Ritterrüstung, " \
-               "dazu verurteilt, immer in diesen Räumen hin und her zu gehen. Ende. " \
-               "In künftigen Spielen kannst du „Zu Etage X springen“ sagen, " \
-               "um einen beliebigen Teil erneut zu spielen. Vielen Dank für das Spiel! "
-    else:
-        return "You take a slice of Victoria sponge cake. It's the most delicious cake you've ever eaten. " \
-               "Suddenly you start coughing violently. You have been poisoned. " \
-               "You turn around to find a haunted suit of armour. He says: I'm free thank you. " \
-               "The spirit possessing the armour, leaves the suit and fades away into nothingness. " \
-               "You black out. You awake to find you have no body, " \
-               "you are a spirit possessing the same suit of armour, " \
-               "doomed to walk these halls forever. The End. On future replays you can say, warp to floor X, " \
-               "to replay any part you like. Thank you for playing! "
-
-def Speech_Floor3_Doughnuts():
-    if locale_de():
-        return "Die beginnst, die Donuts zu essen. Sie haben einen Geschmack, den du noch niemals erlebt hast. " \
-               "Dies sind die besten Donuts, die du jemals gegessen hast; plötzlich fühlst du einen Schmerz im Bauch. " \
-               "Du wurdest vergiftet. Du drehst dich um und siehst ein bekanntes Gesicht. Es ist Larry. " \
-               "Er sagt: Vielen Dank, ich kann jetzt weitergehen. Er verschwindet im Nichts. Du fällst in Ohnmacht. " \
-               "Du wachst am oberen Ende der ersten Leiter auf, " \
-               "siehst an dir herunter – du bist durchsichtig und schwebst. " \
-               "Du trägst ein Namensschild mit der Aufschrift „Larry“. Ende. " \
-               "In künftigen Spielen kannst du „Zu Etage X springen“ sagen, " \
-               "um einen beliebigen Teil erneut zu spielen. Vielen Dank für das Spiel! "
-    else:
-        return "You start eating the doughnuts. The insides ooze with a flavour you've never tasted before. " \
-               "They are the most delicious doughnuts you've ever eaten, you get a sudden pain in the stomach. " \
-               "You have been poisoned. You look back to find a familiar face. It's Larry. " \
-               "He says: Thank you, I can now move on. He fades away into nothingness. You black out. " \
-               "You awake at the top of the first ladder, you look down at yourself, " \
-               "you're transparent and floating, You are wearing a nametag, it says Larry. The End. " \
-               "On future replays you can say, warp to floor X, to replay any part you like. Thank you for playing! "
-
-def Speech_Floor3_Both():
-    if locale_de():
-        return "Du isst einen Donut. Du fühlst einen plötzlichen Schmerz im Bauch. " \
-               "Du nimmst schnell einen Bissen von dem Kuchen. Der Schmerz verschwindet so schnell, " \
-               "wie er gekommen ist. Du drehst dich um und siehst ein bekanntes Gesicht. Es ist Barry. " \
-               "Er lacht und sagt: „Dummkopf, sie sind vergiftet und du bist jetzt mein Gefangener.“ " \
-               "Du und Barry warten einen unangenehmen Moment lang. „Ich verstehe das nicht“, " \
-               "ruft Barry, „Das Gift in beiden Speisen muss sich doch gegenseitig aufheben.“ " \
-               "Ihr starrt euch eine Weile lang an. Barry bringt dich nicht dazu, das Gift zu nehmen, " \
-               "und du kannst einen Geist nicht angreifen. Du verlässt das geheimnisvolle Haus. " \
-               "Du hast das Geheimnis gelöst und überlebt – Barry bleibt verärgert zurück. Ende. " \
-               "In künftigen Spielen kannst du „Zu Etage X springen“ sagen, um einen beliebigen Teil " \
-               "erneut zu spielen. Vielen Dank für das Spiel! "
-    else:
-        return "You eat a doughnut. You get a sudden pain in the stomach. You quickly take a bite of cake. " \
-               "The pain stopped as suddenly as it started. You look back to find a familiar face. It's Barry. " \
-               "He laughs and says, fool, they were poisoned and now you'll be my prisoner. B" \
-               "oth you and Barry wait for an awkward amount of time. I don't understand, exclaimed Barry, " \
-               "the poison in both foods must cancel each other out. You and Barry stare at each other for a while. " \
-               "Barry can't trick you into taking poison, and you can't attack a ghost. " \
-               "You leave the mysterious house. You solved the mystery and survived, leaving an irked Barry behind. " \
-               "The End. On future replays you can say, warp to floor X, to replay any part you like. " \
-               "Thank you for playing! "
-
-def Speech_Floor3_Invalid():
-    if locale_de():
-        return "Ich habe das nicht verstanden, möchtest du den Kuchen oder die Donuts? "
-    else:
-        return "I'm sorry I didn't understand that, do you want the cake or the doughnuts? "
-
-def Speech_Floor3_Invalid_Repeat():
-    if locale_de():
-        return "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? "
-    else:
-        return "Which do you choose? The cake or the doughnuts? "
-
-# --------------- Text Card Titles
-
-def Title_Start():
-    if locale_de():
-        return "Du kommst zu einem geheimnisvollen Haus"
-    else:
-        return "You arrive at a mysterious house"
-
-def Title_Load_Floor2():
-    if locale_de():
-        return "Gespeichertes Spiel geladen – Etage 2"
-    else:
-        return "Game Save Loaded - Floor 2"
-
-def Title_Load_Floor3():
-    if locale_de():
-        return "Gespeichertes Spiel geladen – Etage 3"
-    else:
-        return "Game Save Loaded - Floor 3"
-
-def Title_End():
-    if locale_de():
-        return "Vielen Dank für dein Spiel!"
-    else:
-        return "Thanks for playing!"
-
-def Title_Floor1_X0():
-    if locale_de():
-        return "Barry, der Geist"
-    else:
-        return "Barry the Ghost"
-
-def Title_Floor1_Entrance():
-    if locale_de():
-        return "Linke oder rechte Tür?"
-    else:
-        return "Left or right Door?"
-
-def Title_Floor1_Larry():
-    if locale_de():
-        return "Larry, der Geist"
-    else:
-        return "Larry the Ghost"
-
-def Title_Floor1_Barry_Reply():
-    if locale_de():
-        return "Barry sagt „Nein“"
-    else:
-        return "Barry says No"
-
-def Title_Floor1_Barry_InitialSpeech():
-    if locale_de():
-        return "Barry scheint wütend zu sein"
-    else:
-        return "Barry seems angry"
-
-def Title_Floor2_Caught():
-    if locale_de():
-        return "Du bist gefangen!"
-    else:
-        return "You got caught!"
-
-def Title_Floor2_Prompt():
-    if locale_de():
-        return "Wohin jetzt?"
-    else:
-        return "Where to move?"
-
-def Title_Warp2():
-    if locale_de():
-        return "Sprung zu Etage 2"
-    else:
-        return "Warp to floor 2"
-
-def Title_Warp3():
-    if locale_de():
-        return "Sprung zu Etage 3"
-    else:
-        return "Warp to floor 3"
-
-def Title_Invalid():
-    if locale_de():
-        return "Ungültige Aktion"
-    else:
-        return "Invalid Action"
-
-def Title_Floor2_RepeatHelp():
-    if locale_de():
-        return "Wie möchtest du dich bewegen?"
-    else:
-        return "How do you want to move?"
-
-def Title_Floor3_Choice():
-    if locale_de():
-        return "Wofür entscheidest du dich?"
-    else:
-        return "What do you choose?"
-
-def Title_Floor3_Cake():
-    if locale_de():
-        return "Du hast den Kuchen gegessen"
-    else:
-        return "You ate the cake"
-
-def Title_Floor3_Doughnut():
-    if locale_de():
-        return "Du hast die Donuts gegessen"
-    else:
-        return "You ate the doughnuts"
-
-def Title_Floor3_Both():
-    if locale_de():
-        return "Du hast die Donuts und den Kuchen gegessen"
-    else:
-        return "You ate both the doughnuts and the cake"
+# The request's locale and its text catalog are set once per request by
+# lambda_handler, texts are then looked up by message id. Both are kept in a
+# context variable, so requests served concurrently on threads or asyncio
+# tasks each see their own.
+
+request_locale = contextvars.ContextVar("request_locale",
+                                        default=(Texts.DEFAULT_LOCALE, Texts.get_catalog(Texts.DEFAULT_LOCALE)))
+
+def set_locale(locale):
+    # Returns a token for reset_locale
+    return request_locale.set((locale, Texts.get_catalog(locale)))
+
+def reset_locale(token):
+    request_locale.reset(token)
+
+def get_locale():
+    return request_locale.get()[0]
+
+def text(message_id):
+    return request_locale.get()[1][message_id]
+
+def get_text_locale():
+    # Locales sharing the same texts share templates and cached responses
+    return Texts.get_catalog_language(get_locale())
+
+# --------------- Card Summaries
+# Message ids of short card texts for long scenes, shown instead of the full
+# speech when a response is over its size budget or short cards are turned on
+
+CARD_SUMMARIES = {
+    "LoadFloor2": "Summary_Load_Floor2",
+    "LoadFloor3": "Summary_Load_Floor3",
+    "Warp2": "Summary_Warp2",
+    "Warp3": "Summary_Warp3",
+    "Floor1BarrySaidYes": "Summary_Floor1_BarrySaidYes",
+    "Floor2End": "Summary_Floor2_End",
+    "Floor3Cake": "Summary_Floor3_Cake",
+    "Floor3Doughnut": "Summary_Floor3_Doughnuts",
+    "Floor3Both": "Summary_Floor3_Both"
+}
+
+# --------------- Response Size
+# Responses are measured as serialized JSON, session attributes included, each
+# time one is served. The speechlet of a template or cached response is only
+# measured when it is built and its size kept with it. A response over the
+# budget gets its scene's card summary and, if still too large, no card. Sizes
+# are collected per scene in response_sizes.
+
+# Bytes allowed for the response, Alexa rejects responses over 24 kilobytes
+RESPONSE_SIZE_BUDGET = int(os.environ.get("MYSTERIOUS_HOUSE_RESPONSE_BUDGET", 24 * 1024))
+
+# Show the card summary instead of the full speech on every card
+SHORT_CARDS = os.environ.get("MYSTERIOUS_HOUSE_SHORT_CARDS") == "1"
+
+# Cards of scenes without a summary are cut to this many characters
+CARD_SUMMARY_LENGTH = 160
+
+# Scene of responses that aren't built from a template, a cached situation or fit_scene_response
+UNKNOWN_SCENE = "Other"
+
+size_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=Storage.json_default)
+
+def get_response_size(speechlet_response):
+    return len(size_encoder.encode(speechlet_response).encode('utf-8'))
+
+def get_card_summary(scene, content):
+    if scene in CARD_SUMMARIES:
+        return text(CARD_SUMMARIES[scene])
+    if len(content) <= CARD_SUMMARY_LENGTH:
+        return content
+    # Cut after the last whole sentence that fits
+    end = content.rfind(". ", 0, CARD_SUMMARY_LENGTH)
+    if end == -1:
+        return content[:CARD_SUMMARY_LENGTH - 3].rstrip() + "..."
+    return content[:end + 1]
+
+def with_card_content(speechlet_response, content):
+    speechlet_response = dict(speechlet_response)
+    speechlet_response['card'] = dict(speechlet_response['card'], content=content)
+    return speechlet_response
+
+class ResponseSizeStats(object):
+    """ Count, total and largest serialized size of the responses served per scene """
+
+    def __init__(self):
+        self._scenes = {}
+        self._lock = threading.Lock()
+
+    def record(self, scene, size, over_budget):
+        with self._lock:
+            stats = self._scenes.get(scene)
+            if stats is None:
+                stats = self._scenes[scene] = {'count': 0, 'total': 0, 'max': 0, 'over_budget': 0}
+            stats['count'] += 1
+            stats['total'] += size
+            stats['max'] = max(stats['max'], size)
+            if over_budget:
+                stats['over_budget'] += 1
+
+    def get(self):
+        with self._lock:
+            return dict((scene, dict(stats)) for scene, stats in self._scenes.items())
+
+    def clear(self):
+        with self._lock:
+            self._scenes.clear()
+
+response_sizes = ResponseSizeStats()
+
+def fit_response(speechlet_response, scene, budget=RESPONSE_SIZE_BUDGET):
+    """ Returns speechlet_response with its card cut down to serialize to at most budget bytes """
+    if SHORT_CARDS and 'card' in speechlet_response:
+        speechlet_response = with_card_content(
+            speechlet_response, get_card_summary(scene, speechlet_response['card']['content']))
+    if get_response_size(speechlet_response) > budget and 'card' in speechlet_response:
+        speechlet_response = with_card_content(
+            speechlet_response, get_card_summary(scene, speechlet_response['card']['content']))
+        if get_response_size(speechlet_response) > budget:
+            # Cards are optional, the speech is not
+            speechlet_response = dict(speechlet_response)
+            del speechlet_response['card']
+    return speechlet_response
+
+# Speechlet, scene and speechlet size of the response the current request answers with
+served_speechlet = contextvars.ContextVar("served_speechlet", default=None)
+
+def set_served_speechlet(response, scene, size=None):
+    if size is None:
+        size = get_response_size(response['response'])
+    served_speechlet.set((response['response'], scene, size))
+    return response
+
+def fit_scene_response(response, scene):
+    response['response'] = fit_response(response['response'], scene)
+    return set_served_speechlet(response, scene)
+
+def get_envelope_size(response):
+    # Everything but the speechlet, which serializes in place of the null
+    return get_response_size(dict(response, response=None)) - len("null")
+
+def account_response(response):
+    """ Records the size of a response being served, cutting its card if the whole response is over budget """
+    if not response:
+        return response
+    speechlet_response = response['response']
+    served = served_speechlet.get()
+    if served is not None and served[0] is speechlet_response:
+        scene, size = served[1], served[2]
+    else:
+        scene, size = UNKNOWN_SCENE, get_response_size(speechlet_response)
+    envelope_size = get_envelope_size(response)
+    if envelope_size + size > RESPONSE_SIZE_BUDGET and 'card' in speechlet_response:
+        speechlet_response = fit_response(speechlet_response, scene, RESPONSE_SIZE_BUDGET - envelope_size)
+        response = dict(response, response=speechlet_response)
+        size = get_response_size(speechlet_response)
+    size += envelope_size
+    response_sizes.record(scene, size, size > RESPONSE_SIZE_BUDGET)
+    return response
+
+# --------------- Response Templates
+# Responses that only depend on the locale are built once per text language,
+# the first time a request in it arrives, and shared by every request, which
+# only attaches its session attributes. Templates must never be modified.
+
+def build_scene_templates():
+    templates = {
+        "Start": build_sequence_response(
+            text("Title_Start"), (text("Speech_Start_1"), door_sound(), text("Speech_Start_2")),
+            text("Speech_Start_repeat")),
+        "LoadFloor2": build_sequence_response(
+            text("Title_Load_Floor2"),
+            (text("Speech_Load_Floor2_1"), jam_sound(), text("Speech_Load_Floor2_2"), armour_sound(),
+             text("Speech_Load_Floor2_3")),
+            text("Speech_Load_Floor2_repeat")),
+        "LoadFloor3": build_sequence_response(
+            text("Title_Load_Floor3"), (text("Speech_Load_Floor3_1"), hatch_sound(), text("Speech_Load_Floor3_2")),
+            text("Speech_Load_Floor3_repeat")),
+        "End": build_sequence_response(
+            text("Title_End"), (text("Speech_End"), jingle_sound(), ""),
+            None, True),
+        "Misunderstood": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_misunderstood"), text("Speech_misunderstood")),
+        "Warp2": build_sequence_response(
+            text("Title_Warp2"),
+            (text("Speech_Warp2_1"), jam_sound(), text("Speech_Warp2_2"), armour_sound(), text("Speech_Warp2_3")),
+            text("Speech_Warp2_Repeat")),
+        "Warp3": build_sequence_response(
+            text("Title_Floor3_Choice"), (text("Speech_Warp3_1"), hatch_sound(), text("Speech_Warp3_2")),
+            text("Speech_Warp3_Repeat")),
+        "Floor1LeftInvalidBarry": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_LeftInvalid"), text("Speech_Floor1_Repeat_Barry")),
+        "Floor1LeftInvalidLarry": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_LeftInvalid"), text("Speech_Floor1_Repeat_Larry")),
+        "Floor1RightInvalidBarry": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_RightInvalid"), text("Speech_Floor1_Repeat_Barry")),
+        "Floor1RightInvalidLarry": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_RightInvalid"), text("Speech_Floor1_Repeat_Larry")),
+        "Floor1NoEscape": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_NoEscape"), text("Speech_Floor1_Repeat_Entrance")),
+        "Floor1SpeakInvalid": build_speechlet_response(
+            text("Title_Invalid"), text("Speech_Floor1_SpeakInvalid"), text("Speech_Floor1_Repeat_Entrance")),
+        "Floor1BarryRevisit": build_speechlet_response(
+            text("Title_Floor1_Barry_Reply"), text("Speech_Floor1_BarryAsk_Revisit"),
+            text("Speech_Floor1_BarryAsk_Revisit_Repeat")),
+        "Floor1BarryAsk": build_speechlet_response(
+            text("Title_Floor1_Barry_Reply"), text("Speech_Floor1_BarryAsk"), text("Speech_Floor1_BarryAsk_Repeat")),
+        "Floor1BarryInitial": build_speechlet_response(
+            text("Title_Floor1_Barry_InitialSpeech"), text("Speech_Floor1_BarryInitial"),
+            text("Speech_Floor1_BarryInitial_Repeat")),
+        "Floor1LarryPostBarry": build_speechlet_response(
+            text("Title_Floor1_Larry"), text("Speech_Floor1_Larry_PostBarry"), text("Speech_Floor1_Larry_PostBarry")),
+        "Floor1LarryRevisit": build_speechlet_response(
+            text("Title_Floor1_Larry"), text("Speech_Floor1_Larry_Revisit"), text("Speech_Floor1_Larry_Repeat")),
+        "Floor1Larry": build_speechlet_response(
+            text("Title_Floor1_Larry"), text("Speech_Floor1_Larry"), text("Speech_Floor1_Larry_Repeat")),
+        "Floor1BarrySaidNo": build_speechlet_response(
+            text("Title_Floor1_Larry"), text("Speech_Floor1_BarrySaidNo"), None),
+        "Floor1BarrySaidYes": build_sequence_response(
+            text("Title_Floor2_Prompt"),
+            (text("Speech_Floor1_BarrySaidYes_1"), jam_sound(), text("Speech_Floor1_BarrySaidYes_2"), armour_sound(),
+             text("Speech_Floor1_BarrySaidYes_3")),
+            None),
+        "Floor3Help": build_speechlet_response(
+            text("Title_Floor3_Choice"), text("Speech_Floor3_Help"), text("Speech_Floor3_Repeat")),
+        "Floor3Cake": build_sequence_response(
+            text("Title_Floor3_Cake"), (text("Speech_Floor3_Cake"), jingle_sound(), ""),
+            None, True),
+        "Floor3Doughnut": build_sequence_response(
+            text("Title_Floor3_Doughnut"), (text("Speech_Floor3_Doughnuts"), jingle_sound(), ""),
+            None, True),
+        "Floor3Both": build_sequence_response(
+            text("Title_Floor3_Both"), (text("Speech_Floor3_Both"), jingle_sound(), ""),
+            None, True),
+        "Floor3Invalid": build_speechlet_response(
+            text("Title_Floor3_Choice"), text("Speech_Floor3_Invalid"), text("Speech_Floor3_Invalid_Repeat"))
+    }
+    return dict((scene, fit_response(template, scene)) for scene, template in templates.items())
+
+scene_templates = {}
+scene_template_sizes = {}
+scene_templates_lock = threading.Lock()
+
+def load_templates(language):
+    with scene_templates_lock:
+        templates = scene_templates.get(language)
+        if templates is None:
+            token = set_locale(language)
+            try:
+                templates = build_scene_templates()
+            finally:
+                reset_locale(token)
+            # Sizes first, templates are looked up without the lock
+            scene_template_sizes[language] = dict(
+                (scene, get_response_size(template)) for scene, template in templates.items())
+            scene_templates[language] = templates
+        return templates
+
+def get_scene_response(session_attributes, scene):
+    language = get_text_locale()
+    templates = scene_templates.get(language)
+    if templates is None:
+        templates = load_templates(language)
+    return set_served_speechlet(build_response(session_attributes, templates[scene]), scene,
+                                scene_template_sizes[language][scene])
+
+# --------------- Response Cache
+# Situation responses only depend on the locale and the game state passed in,
+# finished responses are kept in a bounded LRU keyed on both. Callers get a
+# copy so changing a response never changes the cached one.
+
+RESPONSE_CACHE_SIZE = 4096
+
+def copy_response(value):
+    if isinstance(value, dict):
+        return dict((key, copy_response(item)) for key, item in value.items())
+    elif isinstance(value, list):
+        return [copy_response(item) for item in value]
+    else:
+        return value
+
+def get_state_key(value):
+    if isinstance(value, dict):
+        return tuple(sorted(value.items()))
+    else:
+        return value
+
+class ResponseCache(object):
+    """ Bounded LRU of finished responses and their speechlet sizes keyed on (locale, handler, state) """
+
+    def __init__(self, size=RESPONSE_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._responses = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        # Returns (response, size) or None
+        with self._lock:
+            entry = self._responses.pop(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._responses[key] = entry
+        return copy_response(entry[0]), entry[1]
+
+    def put(self, key, response, size):
+        with self._lock:
+            self._responses.pop(key, None)
+            self._responses[key] = (response, size)
+            if len(self._responses) > self.size:
+                self._responses.popitem(last=False)
+        return copy_response(response)
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+            self.hits = 0
+            self.misses = 0
+
+response_cache = ResponseCache()
+
+def cached_response(handler):
+    """ Serves handler's responses from response_cache, handler must only depend on its arguments and the locale """
+    @functools.wraps(handler)
+    def get_cached(*state):
+        key = (get_text_locale(), handler.__name__, tuple(get_state_key(value) for value in state))
+        cached = response_cache.get(key)
+        if cached is None:
+            response = handler(*state)
+            response['response'] = fit_response(response['response'], handler.__name__)
+            size = get_response_size(response['response'])
+            response = response_cache.put(key, response, size)
+        else:
+            response, size = cached
+        return set_served_speechlet(response, handler.__name__, size)
+    return get_cached
 
 # --------------- Responses
 
 def get_start_response():
-    return get_audio_response(
-        get_starting_floor1_attributes(),
-        Title_Start(),
-        Speech_Start_1() ,
-        door_sound(),
-        Speech_Start_2(),
-        Speech_Start_repeat()
-    )
+    return get_scene_response(get_starting_floor1_attributes(), "Start")
 
-def initial_load_response(userID):
-    floor_number = LoadFloorNumber(userID)
+def initial_load_response(player):
+    floor_number = LoadFloorNumber(player)
     if (floor_number == 1):
         return get_start_response()
     elif (floor_number == 2):
-        return get_doubleaudio_response(
-            get_starting_floor2_attributes(),
-            Title_Load_Floor2(),
-            Speech_Load_Floor2_1(),
-            jam_sound(),
-            Speech_Load_Floor2_2(),
-            armour_sound(),
-            Speech_Load_Floor2_3(),
-            Speech_Load_Floor2_repeat()
-        )
+        return get_scene_response(get_starting_floor2_attributes(), "LoadFloor2")
     elif (floor_number == 3):
-        return get_audio_response(
-            get_starting_floor3_attributes(),
-            Title_Load_Floor3(),
-            Speech_Load_Floor3_1(),
-            hatch_sound(),
-            Speech_Load_Floor3_2(),
-            Speech_Load_Floor3_repeat()
-        )
+        return get_scene_response(get_starting_floor3_attributes(), "LoadFloor3")
     else:
         return get_start_response()
 
 def get_end_response():
-    return get_audio_response(
-        {},
-        Title_End(),
-        Speech_End(),
-        jingle_sound(),
-        "",
-        None,
-        True
-    )
+    return get_scene_response({}, "End")
 
 def get_misunderstood_response(session_attributes):
-    return get_response(
-        session_attributes,
-        Title_Invalid(),
-        Speech_misunderstood(),
-        Speech_misunderstood()
-    )
+    return get_scene_response(session_attributes, "Misunderstood")
 
 def get_error_response(error_code):
     return get_response(
         {},
-        Title_Invalid(),
-        Speech_error(error_code),
+        text("Title_Invalid"),
+        text("Speech_error") + error_code,
         None,
         True
     )
 
 # --------------- Floor 1
 
+@cached_response
 def get_floor1_situation(x, visited_larry, visited_barry, session_attributes, play_door, warp_text = "", help_request = False):
     if x == 0:
 
         help_text = ""
         if help_request:
-            help_text = Speech_Floor1_X0_Help()
+            help_text = text("Speech_Floor1_X0_Help")
 
         if visited_barry:
             if play_door:
                 return get_audio_response(
                     session_attributes,
-                    Title_Floor1_X0(),
+                    text("Title_Floor1_X0"),
                     "",
                     door_sound(),
-                    warp_text + Speech_Floor1_X0_Revisit_1() + help_text +
-                    Speech_Floor1_X0_Revisit_2(),
-                    Speech_Floor1_X0_Visit_Rep()
+                    warp_text + text("Speech_Floor1_X0_Revisit_1") + help_text +
+                    text("Speech_Floor1_X0_Revisit_2"),
+                    text("Speech_Floor1_X0_Visit_Repeat")
                 )
             else:
                 return get_response(
                     session_attributes,
-                    Title_Floor1_X0(),
-                    warp_text + Speech_Floor1_X0_Revisit_1() + help_text +
-                    Speech_Floor1_X0_Revisit_2(),
-                    Speech_Floor1_X0_Visit_Rep()
+                    text("Title_Floor1_X0"),
+                    warp_text + text("Speech_Floor1_X0_Revisit_1") + help_text +
+                    text("Speech_Floor1_X0_Revisit_2"),
+                    text("Speech_Floor1_X0_Visit_Repeat")
                 )
         else:
             if play_door:
                 return get_audio_response(
                     session_attributes,
-                    Title_Floor1_X0(),
+                    text("Title_Floor1_X0"),
                     "",
                     door_sound(),
-                    warp_text + Speech_Floor1_X0_Visit_1() +
-                    help_text  + Speech_Floor1_X0_Visit_2(),
-                    Speech_Floor1_X0_Visit_Rep()
+                    warp_text + text("Speech_Floor1_X0_Visit_1") +
+                    help_text  + text("Speech_Floor1_X0_Visit_2"),
+                    text("Speech_Floor1_X0_Visit_Repeat")
                 )
             else:
                 return get_response(
                     session_attributes,
-                    Title_Floor1_X0(),
-                    warp_text + Speech_Floor1_X0_Visit_1() +
-                    help_text + Speech_Floor1_X0_Visit_2(),
-                    Speech_Floor1_X0_Visit_Rep()
+                    text("Title_Floor1_X0"),
+                    warp_text + text("Speech_Floor1_X0_Visit_1") +
+                    help_text + text("Speech_Floor1_X0_Visit_2"),
+                    text("Speech_Floor1_X0_Visit_Repeat")
                 )
     elif x == 1:
 
         help_text = ""
         if help_request:
-            help_text = Speech_Floor1_X1_Help()
+            help_text = text("Speech_Floor1_X1_Help")
 
         if play_door:
             print(warp_text)
             return get_audio_response(
                 session_attributes,
-                Title_Floor1_Entrance(),
+                text("Title_Floor1_Entrance"),
                 warp_text,
                  door_sound(),
-                Speech_Floor1_X1_Revisit_1() + help_text +
-                Speech_Floor1_X1_Revisit_2(),
-                Speech_Floor1_X1_Visit_Rep()
+                text("Speech_Floor1_X1_Revisit_1") + help_text +
+                text("Speech_Floor1_X1_Revisit_2"),
+                text("Speech_Floor1_X1_Visit_Repeat")
             )
         elif not visited_larry and not visited_barry:
             return get_response(
                 session_attributes,
-                Title_Floor1_Entrance(),
-                warp_text + Speech_Floor1_X1_Visit_1() + help_text +
-                Speech_Floor1_X1_Visit_2(),
-                Speech_Floor1_X1_Visit_Rep()
+                text("Title_Floor1_Entrance"),
+                warp_text + text("Speech_Floor1_X1_Visit_1") + help_text +
+                text("Speech_Floor1_X1_Visit_2"),
+                text("Speech_Floor1_X1_Visit_Repeat")
             )
         else:
             return get_response(
                 session_attributes,
-                Title_Floor1_Entrance(),
-                warp_text + Speech_Floor1_X1_Revisit_1() + help_text +
-                Speech_Floor1_X1_Revisit_2(),
-                Speech_Floor1_X1_Visit_Rep()
+                text("Title_Floor1_Entrance"),
+                warp_text + text("Speech_Floor1_X1_Revisit_1") + help_text +
+                text("Speech_Floor1_X1_Revisit_2"),
+                text("Speech_Floor1_X1_Visit_Repeat")
             )
     elif x == 2:
 
         help_text = ""
         if help_request:
-            help_text = Speech_Floor1_X2_Help()
+            help_text = text("Speech_Floor1_X2_Help")
 
         if visited_larry:
             if play_door:
                 return get_audio_response(
                     session_attributes,
-                    Title_Floor1_Larry(),
+                    text("Title_Floor1_Larry"),
                     warp_text,
                     door_sound(),
-                    Speech_Floor1_X2_Revisit_1() + help_text +
-                    Speech_Floor1_X2_Revisit_2(),
-                    Speech_Floor1_X2_Visit_Rep()
+                    text("Speech_Floor1_X2_Revisit_1") + help_text +
+                    text("Speech_Floor1_X2_Revisit_2"),
+                    text("Speech_Floor1_X2_Visit_Repeat")
                 )
             else:
                 return get_response(
                     session_attributes,
-                    Title_Floor1_Larry(),
-                    warp_text + Speech_Floor1_X2_Revisit_1() + help_text +
-                    Speech_Floor1_X2_Revisit_2(),
-                    Speech_Floor1_X2_Visit_Rep()
+                    text("Title_Floor1_Larry"),
+                    warp_text + text("Speech_Floor1_X2_Revisit_1") + help_text +
+                    text("Speech_Floor1_X2_Revisit_2"),
+                    text("Speech_Floor1_X2_Visit_Repeat")
                 )
         else:
             if play_door:
                 return get_audio_response(
                     session_attributes,
-                    Title_Floor1_Larry(),
+                    text("Title_Floor1_Larry"),
                     warp_text,
                     door_sound(),
-                    Speech_Floor1_X2_Visit_1() +
+                    text("Speech_Floor1_X2_Visit_1") +
                     help_text +
-                    Speech_Floor1_X2_Visit_2(),
-                    Speech_Floor1_X2_Visit_Rep()
+                    text("Speech_Floor1_X2_Visit_2"),
+                    text("Speech_Floor1_X2_Visit_Repeat")
                 )
             else:
                 return get_response(
                     session_attributes,
-                    Title_Floor1_Larry(),
+                    text("Title_Floor1_Larry"),
                     warp_text +
-                    Speech_Floor1_X2_Visit_1() +
+                    text("Speech_Floor1_X2_Visit_1") +
                     help_text +
-                    Speech_Floor1_X2_Visit_2(),
-                    Speech_Floor1_X2_Visit_Rep()
+                    text("Speech_Floor1_X2_Visit_2"),
+                    text("Speech_Floor1_X2_Visit_Repeat")
                 )
     else:
         return get_error_response("One")
 
 def get_barry_speech(spoken_to_barry, spoken_to_larry, visited_larry):
     if spoken_to_barry:
-        return get_response(
+        return get_scene_response(
             construct_floor1_attributes(0, True, True, True, True, False),
-            Title_Floor1_Barry_Reply(),
-            Speech_Floor1_BarryAsk_Revisit(),
-            Speech_Floor1_BarryAsk_Revisit_Repeat()
+            "Floor1BarryRevisit"
         )
     elif spoken_to_larry:
-        return get_response(
+        return get_scene_response(
             construct_floor1_attributes(0, True, True, True, True, False),
-            Title_Floor1_Barry_Reply(),
-            Speech_Floor1_BarryAsk(),
-            Speech_Floor1_BarryAsk_Repeat()
+            "Floor1BarryAsk"
         )
     else:
-        return get_response(
+        return get_scene_response(
             construct_floor1_attributes(0, True, visited_larry, False, False, False),
-            Title_Floor1_Barry_InitialSpeech(),
-            Speech_Floor1_BarryInitial(),
-            Speech_Floor1_BarryInitial_Repeat()
+            "Floor1BarryInitial"
         )
 
 def get_larry_speech(spoken_to_barry, spoken_to_larry, visited_barry):
     if spoken_to_larry:
         if spoken_to_barry:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(2, True, True, True, True, True),
-                Title_Floor1_Larry(),
-                Speech_Floor1_Larry_PostBarry(),
-                Speech_Floor1_Larry_PostBarry()
+                "Floor1LarryPostBarry"
             )
         else:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(2, visited_barry, True, False, True, False),
-                Title_Floor1_Larry(),
-                Speech_Floor1_Larry_Revisit(),
-                Speech_Floor1_Larry_Repeat()
+                "Floor1LarryRevisit"
             )
     else:
-        return get_response(
+        return get_scene_response(
             construct_floor1_attributes(2, visited_barry, True, False, True, False),
-            Title_Floor1_Larry(),
-            Speech_Floor1_Larry(),
-            Speech_Floor1_Larry_Repeat()
+            "Floor1Larry"
         )
 
 
 # --------------- Floor 2
 
-def get_floor2_node_info():
-    # Flipped For Convenience
-    return [
-        [True, True, False, False, False],
-        [True, True, True, True, False],
-        [True, True, True, True, False],
-        [True, True, False, True, True]
-    ]
+# Maze file of floor 2, a seasonal floor can be swapped in without touching the handlers
+FLOOR2_MAZE_VARIABLE = 'MYSTERIOUS_HOUSE_FLOOR2_MAZE'
+DEFAULT_FLOOR2_MAZE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Floor2.json')
 
+floor2 = Maze.load_maze(os.environ.get(FLOOR2_MAZE_VARIABLE) or DEFAULT_FLOOR2_MAZE)
 
-def get_floor2_xmax():
-    return 4
 
+def is_at_floor2_end(x, y):
+    return floor2.is_end(x, y)
 
-def get_floor2_ymax():
-    return 3
 
+def get_haunted_armour_pos(x, y):
+    return floor2.get_armour_next(x, y)
 
-def is_at_floor2_end(x, y):
-    #top right
-    return  y == get_floor2_ymax() and x == get_floor2_xmax()
 
+# Exits relative to the way the player faces, a maze cell's exits rotated by the orientation
+FLOOR2_FORWARD_EXIT = 1
+FLOOR2_RIGHT_EXIT = 2
+FLOOR2_BACKWARD_EXIT = 4
+FLOOR2_LEFT_EXIT = 8
 
-def get_haunted_armour_pos(x, y):
-    if y == 1:
-        if x == 0:
-            return [0, 2]
-        else:
-            return [x-1, 1]
-    else:
-        if x == get_floor2_xmax():
-            return [get_floor2_xmax(), 1]
-        else:
-            return [x+1, 2]
+def is_at_floor2_start(osstate, x, y):
+    # The starting orientation only counts on the start cell, Maze only accepts start cells open forward and right
+    return osstate == 0 and x == floor2.start[0] and y == floor2.start[1]
 
 
 def get_floor2_directions(osstate, x, y):
-    forward = False
-    backward = False
-    left = False
-    right = False
-
-    node_info = get_floor2_node_info()
-    max_y = get_floor2_ymax()
-    max_x = get_floor2_xmax()
-
-    if osstate == 0:
-        forward = True
-        backward = False
-        left = False
-        right = True
-    if osstate == 1:  # Facing North
-        forward = y != max_y and node_info[y + 1][x]  # North
-        backward = y != 0 and node_info[y - 1][x]  # South
-        left = x != 0 and node_info[y][x - 1]  # West
-        right = x != max_x and node_info[y][x + 1]  # East
-    elif osstate == 2:  # Facing East
-        left = y != max_y and node_info[y + 1][x]  # North
-        right = y != 0 and node_info[y - 1][x]  # South
-        backward = x != 0 and node_info[y][x - 1]  # West
-        forward = x != max_x and node_info[y][x + 1]  # East
-    elif osstate == 3:  # Facing South
-        backward = y != max_y and node_info[y + 1][x]  # North
-        forward = y != 0 and node_info[y - 1][x]  # South
-        right = x != 0 and node_info[y][x - 1]  # West
-        left = x != max_x and node_info[y][x + 1]  # East
-    elif osstate == 4:  # Facing West
-        right = y != max_y and node_info[y + 1][x]  # North
-        left = y != 0 and node_info[y - 1][x]  # South
-        forward = x != 0 and node_info[y][x - 1]  # West
-        backward = x != max_x and node_info[y][x + 1]  # East
-
-    return [forward, backward, left, right]
-
-
-def get_floor2_movement_options_state(osstate, x, y):
-    # Start State
-    if osstate == 0:
-        return [Speech_Floor2_Start(),
-                Speech_Floor2_Start_Repeat()]
-
-    directions = get_floor2_directions(osstate, x, y)
-    forward = directions[0]
-    backward = directions[1]
-    left = directions[2]
-    right = directions[3]
-
-    if forward:
-        if backward:
-            if left:
-                if right:
-                    return [Speech_Floor2_FLRB(), Speech_Floor2_FLRB_Repeat()]
-                else:
-                    return [Speech_Floor2_FLB(), Speech_Floor2_FLB_Repeat()]
-            elif right:
-                return [Speech_Floor2_FRB(), Speech_Floor2_FRB_Repeat()]
-            else:
-                return ["You have reached a set or crates, would you like to go past or go back the way you came?",
-                        "would you like to keep going or go back?"]
-        elif left:
-            if right:
-                return [Speech_Floor2_FLR(), Speech_Floor2_FLR_Repeat()]
-            else:
-                return [Speech_Floor2_FL(), Speech_Floor2_FL_Repeat()]
-        elif right:
-            return  [Speech_Floor2_FR(), Speech_Floor2_FR_Repeat()]
-        else:
-            return ["You have reached a set or crates, would you like to keep going?",
-                    "Would you like to keep going forward?"]
-    elif backward:
-        if left:
-            if right:
-                return [Speech_Floor2_LRB(), Speech_Floor2_LRB_Repeat()]
-            else:
-                return [Speech_Floor2_LB(), Speech_Floor2_LB_Repeat()]
-        elif right:
-            return [Speech_Floor2_RB(), Speech_Floor2_RB_Repeat()]
-        else:
-            return ["You have reached a dead end, would you like to go back the way you came?",
-                    "A dead end, would you like to go back the way you came?"]
-    elif left:
-        if right:
-            return [Speech_Floor2_LR(), Speech_Floor2_LR_Repeat()]
-        else:
-            return ["The path bends suddenly to the left, would you like to follow the path?",
-                    "Would you like to follow the path to the left?"]
-    elif right:
-        return ["The path bends suddenly to the right, would you like to follow the path?",
-                "Would you like to follow the path to the right?"]
+    # Mask of the directions open relative to the player, see FLOOR2_FORWARD_EXIT
+    if osstate < 0 or osstate > 4:
+        return 0
+    mask = floor2.get_exits(x, y)
+    # The starting orientation faces north
+    rotation = max(osstate, 1) - 1
+    return ((mask >> rotation) | (mask << (4 - rotation))) & 15
+
+
+# Prompt and reprompt ids by mask of open directions
+FLOOR2_OPTION_IDS = (
+    None,
+    ("Speech_Floor2_F", "Speech_Floor2_F_Repeat"),
+    ("Speech_Floor2_R", "Speech_Floor2_R_Repeat"),
+    ("Speech_Floor2_FR", "Speech_Floor2_FR_Repeat"),
+    ("Speech_Floor2_B", "Speech_Floor2_B_Repeat"),
+    ("Speech_Floor2_FB", "Speech_Floor2_FB_Repeat"),
+    ("Speech_Floor2_RB", "Speech_Floor2_RB_Repeat"),
+    ("Speech_Floor2_FRB", "Speech_Floor2_FRB_Repeat"),
+    ("Speech_Floor2_L", "Speech_Floor2_L_Repeat"),
+    ("Speech_Floor2_FL", "Speech_Floor2_FL_Repeat"),
+    ("Speech_Floor2_LR", "Speech_Floor2_LR_Repeat"),
+    ("Speech_Floor2_FLR", "Speech_Floor2_FLR_Repeat"),
+    ("Speech_Floor2_LB", "Speech_Floor2_LB_Repeat"),
+    ("Speech_Floor2_FLB", "Speech_Floor2_FLB_Repeat"),
+    ("Speech_Floor2_LRB", "Speech_Floor2_LRB_Repeat"),
+    ("Speech_Floor2_FLRB", "Speech_Floor2_FLRB_Repeat")
+)
+
+
+# Turns relative to the way the player faces, clockwise
+FLOOR2_FORWARD = 0
+FLOOR2_RIGHT = 1
+FLOOR2_BACKWARD = 2
+FLOOR2_LEFT = 3
+
+# Step taken facing north, east, south and west
+FLOOR2_STEPS = {1: (0, 1), 2: (1, 0), 3: (0, -1), 4: (-1, 0)}
+
+# Intents moving the player, see build_floor2_moves
+FLOOR2_MOVE_INTENTS = ("ForwardIntent", "BackwardIntent", "LeftIntent", "ContinueLeftIntent", "RightIntent",
+                       "ContinueRightIntent", "ContinueIntent")
+
+
+def get_floor2_next_state(osstate, x, y, turn):
+    # The starting orientation faces north, any move leaves it
+    heading = (max(osstate, 1) - 1 + turn) % 4 + 1
+    step = FLOOR2_STEPS[heading]
+    return x + step[0], y + step[1], heading
+
+
+def build_floor2_moves(directions):
+    """ Returns {intent name: (turn or None, speech id)} for a mask of open directions
+
+    Intents that can't be followed have None and the id of the speech explaining why.
+    """
+
+    def move(exit_bit, turn, speech_id, invalid_id):
+        if directions & exit_bit:
+            return turn, speech_id
+        return None, invalid_id
+
+    moves = {
+        "ForwardIntent": move(FLOOR2_FORWARD_EXIT, FLOOR2_FORWARD, "Speech_Floor2_Action_F",
+                              "Speech_Floor2_InvalidDirection_F"),
+        "BackwardIntent": move(FLOOR2_BACKWARD_EXIT, FLOOR2_BACKWARD, "Speech_Floor2_Action_B",
+                               "Speech_Floor2_InvalidDirection_B"),
+        "LeftIntent": move(FLOOR2_LEFT_EXIT, FLOOR2_LEFT, "Speech_Floor2_Action_L",
+                           "Speech_Floor2_InvalidDirection_L"),
+        "ContinueLeftIntent": move(FLOOR2_LEFT_EXIT, FLOOR2_LEFT, "Speech_Floor2_Action_LF",
+                                   "Speech_Floor2_InvalidDirection_L"),
+        "RightIntent": move(FLOOR2_RIGHT_EXIT, FLOOR2_RIGHT, "Speech_Floor2_Action_R",
+                            "Speech_Floor2_InvalidDirection_R"),
+        "ContinueRightIntent": move(FLOOR2_RIGHT_EXIT, FLOOR2_RIGHT, "Speech_Floor2_Action_RF",
+                                    "Speech_Floor2_InvalidDirection_R")
+    }
+    # Continue follows the only way on other than back, or goes forward
+    ahead = directions & (FLOOR2_FORWARD_EXIT | FLOOR2_LEFT_EXIT | FLOOR2_RIGHT_EXIT)
+    if ahead == FLOOR2_RIGHT_EXIT:
+        moves["ContinueIntent"] = moves["ContinueRightIntent"]
+    elif ahead == FLOOR2_LEFT_EXIT:
+        moves["ContinueIntent"] = moves["ContinueLeftIntent"]
+    else:
+        moves["ContinueIntent"] = move(FLOOR2_FORWARD_EXIT, FLOOR2_FORWARD, "Speech_Floor2_Action_F",
+                                       "Speech_Floor2_InvalidDirection_Continue")
+    return moves
+
 
+# Moves of every combination of open directions, the same for any size of maze
+floor2_moves = tuple(build_floor2_moves(directions) for directions in range(16))
 
-def get_move_response(osstate, x, y, flavour_text, mob_x, mob_y, userId):
+
+def get_floor2_option_ids(osstate, x, y):
+    if is_at_floor2_start(osstate, x, y):
+        return "Speech_Floor2_Start", "Speech_Floor2_Start_Repeat"
+    return FLOOR2_OPTION_IDS[get_floor2_directions(osstate, x, y)]
+
+
+@cached_response
+def get_floor2_situation(osstate, x, y, mob_x, mob_y, title, speech, show_options = True):
+    option_ids = get_floor2_option_ids(osstate, x, y)
+    if show_options:
+        speech = speech + text(option_ids[0])
+    return get_response(
+        construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
+        title,
+        speech,
+        text(option_ids[1])
+    )
+
+
+def get_move_response(osstate, x, y, flavour_text, mob_x, mob_y, player):
 
     # Find New Armour Pos
     haunted_armour_pos = get_haunted_armour_pos(mob_x, mob_y)
@@ -1636,119 +947,32 @@ def get_move_response(osstate, x, y, flavour_text, mob_x, mob_y, userId):
 
     # Mob Detection
     if (x == mob_x and y == mob_y):
-        return get_audio_response(
+        return fit_scene_response(get_audio_response(
             get_starting_floor2_attributes(),
-            Title_Floor2_Caught(),
-            flavour_text + Speech_Floor2_Armour_1(),
+            text("Title_Floor2_Caught"),
+            flavour_text + text("Speech_Floor2_Armour_1"),
             armour_sound(),
-            Speech_Floor2_Armour_2(),
-            Speech_Floor2_Armour_Repeat()
-        )
+            text("Speech_Floor2_Armour_2"),
+            text("Speech_Floor2_Armour_Repeat")
+        ), "Floor2Caught")
 
     # End Detection
     elif is_at_floor2_end(x, y):
-        SaveFloorNumber(userId, 3)
-        return  get_audio_response(
+        SaveFloorNumber(player, 3)
+        return fit_scene_response(get_audio_response(
             get_starting_floor3_attributes(),
-            Title_Floor3_Choice(),
-            flavour_text + Speech_Floor2_End_1(),
+            text("Title_Floor3_Choice"),
+            flavour_text + text("Speech_Floor2_End_1"),
             hatch_sound(),
-            Speech_Floor2_End_2(),
-            Speech_Floor2_End_Repeat()
-        )
+            text("Speech_Floor2_End_2"),
+            text("Speech_Floor2_End_Repeat")
+        ), "Floor2End")
 
     # Normal Update
     else:
-        movement_options = get_floor2_movement_options_state(osstate, x, y)
-        return get_response(
-            construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-            Title_Floor2_Prompt(),
-            flavour_text + movement_options[0],
-            movement_options[1]
-        )
+        return get_floor2_situation(osstate, x, y, mob_x, mob_y, text("Title_Floor2_Prompt"), flavour_text)
 
 
-def get_move_forward_response(osstate, x, y, mob_x, mob_y, userId):
-        if osstate <= 1: # north
-            y+=1
-        elif osstate == 2: # east
-            x+=1
-        elif osstate == 3: # south
-            y-=1
-        elif osstate == 4: # west
-            x-=1
-        else:
-            return  get_error_response("Two")
-        return get_move_response(osstate, x, y, Speech_Floor2_Action_F(), mob_x, mob_y, userId)
-
-
-def get_move_backward_response(osstate, x, y, mob_x, mob_y, userId):
-        directions = get_floor2_directions(osstate, x, y)
-        if osstate <= 1:  # south
-            y -= 1
-            osstate = 3
-        elif osstate == 2:  # west
-            x -= 1
-            osstate = 4
-        elif osstate == 3:  # north
-            y += 1
-            osstate = 1
-        elif osstate == 4:  # east
-            x += 1
-            osstate = 2
-        else:
-            return get_error_response("Three")
-        return get_move_response(osstate, x, y, Speech_Floor2_Action_B(), mob_x, mob_y, userId)
-
-
-def get_move_left_response(osstate, x, y, is_continue, mob_x, mob_y, userId):
-        directions = get_floor2_directions(osstate, x, y)
-        if osstate <= 1:  # west
-            x -= 1
-            osstate = 4
-        elif osstate == 2:  # north
-            y += 1
-            osstate = 1
-        elif osstate == 3:  # east
-            x += 1
-            osstate = 2
-        elif osstate == 4:  # south
-            y -= 1
-            osstate = 3
-        else:
-            return get_error_response("Four")
-
-        flavour_text = ""
-        if is_continue:
-            flavour_text = Speech_Floor2_Action_LF()
-        else:
-            flavour_text = Speech_Floor2_Action_L()
-        return get_move_response(osstate, x, y, flavour_text, mob_x, mob_y, userId)
-
-
-def get_move_right_response(osstate, x, y, is_continue, mob_x, mob_y, userId):
-        if osstate <= 1:  # east
-            x += 1
-            osstate = 2
-        elif osstate == 2:  # south
-            y -= 1
-            osstate = 3
-        elif osstate == 3:  # west
-            x -= 1
-            osstate = 4
-        elif osstate == 4:  # north
-            y += 1
-            osstate = 1
-        else:
-            return get_error_response("Five")
-
-        flavour_text = ""
-        if is_continue:
-            flavour_text = Speech_Floor2_Action_RF()
-        else:
-            flavour_text = Speech_Floor2_Action_R()
-        return get_move_response(osstate, x, y, flavour_text, mob_x, mob_y, userId)
-
 # --------------- Events ------------------
 
 
@@ -1770,7 +994,7 @@ def on_launch(launch_request, session):
     return get_start_response()
 
 
-def on_intent(intent_request, session):
+def on_intent(intent_request, session, player):
     """ Called when the user specifies an intent for this skill """
 
     print("on_intent requestId=" + intent_request['requestId'] +
@@ -1778,7 +1002,6 @@ def on_intent(intent_request, session):
 
     intent = intent_request['intent']
     intent_name = intent_request['intent']['name']
-    userId = session['user']['userId']
     warp_response = ""
 
     # Deal with stops and start overs
@@ -1787,7 +1010,7 @@ def on_intent(intent_request, session):
     elif intent_name == "AMAZON.StartOverIntent":
         return get_start_response()
     elif intent_name == "WarpIntent":
-        [warp_error, warp_response] = on_intent_warp(intent, session, userId)
+        [warp_error, warp_response] = on_intent_warp(intent, session, player)
         if (warp_error == False):
             return warp_response
 
@@ -1795,62 +1018,46 @@ def on_intent(intent_request, session):
     floor = get_floor_number(session)
     # Select correct event based on floor
     if floor == 1:
-        return on_intent_floor1(intent_name, session, userId, warp_response)
+        return on_intent_floor1(intent_name, session, player, warp_response)
     elif floor == 2:
-        return on_intent_floor2(intent_name, session, userId, warp_response)
+        return on_intent_floor2(intent_name, session, player, warp_response)
     elif floor == 3:
-        return on_intent_floor3(intent_name, session, userId, warp_response)
+        return on_intent_floor3(intent_name, session, player, warp_response)
     else:
-        return initial_load_response(userId)
+        return initial_load_response(player)
 
-def on_intent_warp(intent, session, userId):
+def on_intent_warp(intent, session, player):
     isError = False
     response = ""
 
-    if (LoadCanWarp(userId)):
+    if (LoadCanWarp(player)):
         if intent.get('slots', {}) and "floor" in intent.get('slots', {}) and "value" in intent['slots']['floor']:
             floor_number = intent['slots']['floor']['value']
             if (floor_number == '1'):
                 response = get_start_response()
             elif (floor_number == '2'):
-                response = get_doubleaudio_response(
-                    get_starting_floor2_attributes(),
-                    Title_Warp2(),
-                    Speech_Warp2_1(),
-                    jam_sound(),
-                    Speech_Warp2_2(),
-                    armour_sound(),
-                    Speech_Warp2_3(),
-                    Speech_Warp2_Repeat()
-                )
+                response = get_scene_response(get_starting_floor2_attributes(), "Warp2")
             elif (floor_number == '3'):
-                response = get_audio_response(
-                    get_starting_floor3_attributes(),
-                    Title_Floor3_Choice(),
-                    Speech_Warp3_1(),
-                    hatch_sound(),
-                    Speech_Warp3_2(),
-                    Speech_Warp3_Repeat()
-                )
+                response = get_scene_response(get_starting_floor3_attributes(), "Warp3")
             elif session.get('attributes', {}) and "Floor" in session.get('attributes', {}):
                 isError = True
-                response = Speech_Warp_InvalidNumber()
+                response = text("Speech_Warp_InvalidNumber")
             else:
                 response = get_start_response()
         elif session.get('attributes', {}) and "Floor" in session.get('attributes', {}):
             isError = True
-            response = Speech_Warp_InvalidString()
+            response = text("Speech_Warp_InvalidString")
     else:
         if session.get('attributes', {}) and "Floor" in session.get('attributes', {}):
             isError = True
-            response = Speech_Warp_Locked()
+            response = text("Speech_Warp_Locked")
         else:
             response = get_start_response()
 
     return [isError, response]
 
 
-def on_intent_floor1(intent_name, session, userId, warp_text):
+def on_intent_floor1(intent_name, session, player, warp_text):
     # Get Values and Check validity
     x = get_x(session)
     if x == -1:
@@ -1892,20 +1099,16 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
                                                                     spoken_to_larry, asking_larry), True, ""
                                         )
         elif x == 0:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_LeftInvalid(),
-                Speech_Floor1_Repeat_Barry()
+                "Floor1LeftInvalidBarry"
             )
         else:
-            return  get_response(
+            return  get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_LeftInvalid(),
-                Speech_Floor1_Repeat_Larry()
+                "Floor1LeftInvalidLarry"
             )
     elif intent_name == "RightIntent":
         # Move to right room when in entrance hall
@@ -1915,20 +1118,16 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
                                                                     spoken_to_larry, asking_larry), True, ""
                                         )
         elif x == 0:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_RightInvalid(),
-                Speech_Floor1_Repeat_Barry()
+                "Floor1RightInvalidBarry"
             )
         else:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_RightInvalid(),
-                Speech_Floor1_Repeat_Larry()
+                "Floor1RightInvalidLarry"
             )
     elif intent_name == "BackwardIntent" or intent_name == "FirstFloorBackwardIntent":
         # Move back to the entrance hall
@@ -1938,12 +1137,10 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
                                                                     spoken_to_larry, asking_larry), True, ""
                                         )
         else:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_NoEscape(),
-                Speech_Floor1_Repeat_Entrance()
+                "Floor1NoEscape"
             )
     elif intent_name == "TalkIntent" or \
                     intent_name == "TalkToLarryIntent" or \
@@ -1953,20 +1150,17 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
         elif x == 2:
             return  get_larry_speech(spoken_to_barry, spoken_to_larry, visited_barry)
         else:
-            return  get_response(
+            return  get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
                                             spoken_to_larry, asking_larry),
-                Title_Invalid(),
-                Speech_Floor1_SpeakInvalid(),
-                Speech_Floor1_Repeat_Entrance()
+                "Floor1SpeakInvalid"
             )
     elif intent_name == "AMAZON.NoIntent" or intent_name == "BarrySaidNoIntent":
         if asking_larry:
-            return get_response(
+            return get_scene_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, False,
                                             spoken_to_larry, False),
-                Title_Floor1_Larry(),
-                Speech_Floor1_BarrySaidNo()
+                "Floor1BarrySaidNo"
             )
         else:
             return get_misunderstood_response(
@@ -1974,16 +1168,8 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
                                             spoken_to_larry, asking_larry))
     elif intent_name == "AMAZON.YesIntent" or intent_name == "BarrySaidYesIntent":
         if asking_larry:
-            SaveFloorNumber(userId, 2)
-            return get_doubleaudio_response(
-                get_starting_floor2_attributes(),
-                Title_Floor2_Prompt(),
-                Speech_Floor1_BarrySaidYes_1(),
-                jam_sound(),
-                Speech_Floor1_BarrySaidYes_2(),
-                armour_sound(),
-                Speech_Floor1_BarrySaidYes_3()
-            )
+            SaveFloorNumber(player, 2)
+            return get_scene_response(get_starting_floor2_attributes(), "Floor1BarrySaidYes")
         else:
             return get_misunderstood_response(
                 construct_floor1_attributes(x, visited_barry, visited_larry, spoken_to_barry,
@@ -1994,7 +1180,7 @@ def on_intent_floor1(intent_name, session, userId, warp_text):
                                     spoken_to_larry, asking_larry))
 
 
-def on_intent_floor2(intent_name, session, userId, warp_text):
+def on_intent_floor2(intent_name, session, player, warp_text):
     # Get values and validate
     x = get_x(session)
     if x == -1:
@@ -2021,152 +1207,49 @@ def on_intent_floor2(intent_name, session, userId, warp_text):
 
     # Handle Intent
     if intent_name == "AMAZON.RepeatIntent" or intent_name == "PlayIntent" or intent_name == "WarpIntent":
-        movement_options = get_floor2_movement_options_state(osstate, x, y)
-        return get_response(
-            construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-            Title_Floor2_Prompt(),
-            warp_text + movement_options[0],
-            movement_options[1]
-        )
+        return get_floor2_situation(osstate, x, y, mob_x, mob_y, text("Title_Floor2_Prompt"), warp_text)
     elif intent_name == "AMAZON.HelpIntent":
-        movement_options = get_floor2_movement_options_state(osstate, x, y)
-        return get_response(
-            construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-            Title_Floor2_Prompt(),
-            Speech_Floor2_Help() + movement_options[0],
-            movement_options[1]
-        )
-    elif intent_name == "ForwardIntent":
-        directions = get_floor2_directions(osstate, x, y)
-        if directions[0]:
-            return get_move_forward_response(osstate, x, y, mob_x, mob_y, userId)
-        else:
-            movement_options = get_floor2_movement_options_state(osstate, x, y)
-            return get_response(
-                construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-                Title_Invalid(),
-                Speech_Floor2_InvalidDirection_F(),
-                movement_options[1]
-            )
-    elif intent_name == "BackwardIntent":
-        directions = get_floor2_directions(osstate, x, y)
-        if directions[1]:
-            return get_move_backward_response(osstate, x, y, mob_x, mob_y, userId)
-        else:
-            movement_options = get_floor2_movement_options_state(osstate, x, y)
-            return get_response(
-                construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-                Title_Invalid(),
-                Speech_Floor2_InvalidDirection_B(),
-                movement_options[1]
-            )
-    elif intent_name == "LeftIntent" or intent_name == "ContinueLeftIntent":
-        directions = get_floor2_directions(osstate, x, y)
-        if directions[2]:
-            return get_move_left_response(osstate, x, y, intent_name == "ContinueLeftIntent", mob_x, mob_y, userId)
-        else:
-            movement_options = get_floor2_movement_options_state(osstate, x, y)
-            return get_response(
-                construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-                Title_Invalid(),
-                Speech_Floor2_InvalidDirection_L(),
-                movement_options[1]
-            )
-    elif intent_name == "RightIntent" or intent_name == "ContinueRightIntent":
-        directions = get_floor2_directions(osstate, x, y)
-        if directions[3]:
-            return  get_move_right_response(osstate, x, y, intent_name == "ContinueRightIntent", mob_x, mob_y, userId)
-        else:
-            movement_options = get_floor2_movement_options_state(osstate, x, y)
-            return  get_response(
-                construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-                Title_Invalid(),
-                Speech_Floor2_InvalidDirection_R(),
-                movement_options[1]
-            )
-    elif intent_name == "ContinueIntent":
-        directions = get_floor2_directions(osstate, x, y)
-        # Right Only (except back)
-        if (not directions[0]) and (not directions[2]) and directions[3]:
-            return get_move_right_response(osstate, x, y, True, mob_x, mob_y, userId)
-
-        # Left Only (except back)
-        elif (not directions[0]) and directions[2] and (not directions[3]):
-            return get_move_left_response(osstate, x, y, True, mob_x, mob_y, userId)
-
-        # Forward
-        elif (directions[0]):
-            return get_move_forward_response(osstate, x, y, mob_x, mob_y, userId)
-        else:
-            movement_options = get_floor2_movement_options_state(osstate, x, y)
-            return get_response(
-                construct_floor2_attributes(x, y, osstate, mob_x, mob_y),
-                Title_Invalid(),
-                Speech_Floor2_InvalidDirection_Continue(),
-                movement_options[1]
-            )
+        return get_floor2_situation(osstate, x, y, mob_x, mob_y, text("Title_Floor2_Prompt"),
+                                    text("Speech_Floor2_Help"))
+    elif intent_name in FLOOR2_MOVE_INTENTS:
+        turn, speech_id = floor2_moves[get_floor2_directions(osstate, x, y)][intent_name]
+        if turn is None:
+            return get_floor2_situation(osstate, x, y, mob_x, mob_y, text("Title_Invalid"), text(speech_id), False)
+        x, y, osstate = get_floor2_next_state(osstate, x, y, turn)
+        return get_move_response(osstate, x, y, text(speech_id), mob_x, mob_y, player)
     return get_misunderstood_response(
         construct_floor2_attributes(x, y, osstate, mob_x, mob_y))
 
 
-def on_intent_floor3(intent_name, session, userId, warp_text):
+@cached_response
+def get_floor3_situation(warp_text):
+    return get_response(
+        get_starting_floor3_attributes(),
+        text("Title_Floor3_Choice"),
+        warp_text +
+        text("Speech_Floor3_Start"),
+        text("Speech_Floor3_Repeat")
+    )
+
+
+def on_intent_floor3(intent_name, session, player, warp_text):
     # No attributes just intent checks
     if intent_name == "AMAZON.RepeatIntent" or intent_name == "PlayIntent" or intent_name == "WarpIntent":
-        return get_response(
-            get_starting_floor3_attributes(),
-            Title_Floor3_Choice(),
-            warp_text +
-            Speech_Floor3_Start(),
-            Speech_Floor3_Repeat()
-        )
+        return get_floor3_situation(warp_text)
     elif intent_name == "AMAZON.HelpIntent":
-        return get_response(
-            get_starting_floor3_attributes(),
-            Title_Floor3_Choice(),
-            Speech_Floor3_Help(),
-            Speech_Floor3_Repeat()
-        )
+        return get_scene_response(get_starting_floor3_attributes(), "Floor3Help")
     # Cake
     elif intent_name == "CakeIntent":
-        SaveAll(userId, True, 1)
-        return get_audio_response(
-            {},
-            Title_Floor3_Cake(),
-            Speech_Floor3_Cake(),
-            jingle_sound(),
-            "",
-            None,
-            True # End Game Here
-        )
+        SaveAll(player, True, 1)
+        return get_scene_response({}, "Floor3Cake")  # End Game Here
     elif intent_name == "DoughnutIntent":
-        SaveAll(userId, True, 1)
-        return get_audio_response(
-            {},
-            Title_Floor3_Doughnut(),
-            Speech_Floor3_Doughnuts(),
-            jingle_sound(),
-            "",
-            None,
-            True  # End Game Here
-        )
+        SaveAll(player, True, 1)
+        return get_scene_response({}, "Floor3Doughnut")  # End Game Here
     elif intent_name == "BothTreatsIntent":
-        SaveAll(userId, True, 1)
-        return get_audio_response(
-            {},
-            Title_Floor3_Both(),
-            Speech_Floor3_Both(),
-            jingle_sound(),
-            "",
-            None,
-            True  # End Game Here
-        )
+        SaveAll(player, True, 1)
+        return get_scene_response({}, "Floor3Both")  # End Game Here
     else:
-        return get_response(
-            get_starting_floor3_attributes(),
-            Title_Floor3_Choice(),
-            Speech_Floor3_Invalid(),
-            Speech_Floor3_Invalid_Repeat()
-        )
+        return get_scene_response(get_starting_floor3_attributes(), "Floor3Invalid")
     return get_misunderstood_response(get_starting_floor3_attributes())
 
 
@@ -2180,6 +1263,17 @@ def on_session_ended(session_ended_request, session):
     # add cleanup logic here
 
 
+def add_session_progress(response, player):
+    """ Carries the player's signed progress to the next turn of the session """
+    progress = player.get_session_progress()
+    if progress is None or not response or response['response'].get('shouldEndSession'):
+        return response
+    session_attributes = dict(response['sessionAttributes'])
+    session_attributes[Storage.SESSION_PROGRESS_ATTRIBUTE] = progress
+    response['sessionAttributes'] = session_attributes
+    return response
+
+
 # --------------- Main handler ------------------
 
 def lambda_handler(event, context):
@@ -2193,19 +1287,42 @@ def lambda_handler(event, context):
              "amzn1.ask.skill.499ef157-c8f7-455f-b547-257916c78946"):
          raise ValueError("Invalid Application ID")
 
-    global locale
-    locale = event['request']['locale']
-    print("locale is " + locale)
+    token = set_locale(event['request']['locale'])
+    served_token = served_speechlet.set(None)
+    try:
+        print("locale is " + get_locale())
+        return account_response(handle_request(event))
+    finally:
+        served_speechlet.reset(served_token)
+        reset_locale(token)
+
 
+def handle_request(event):
+    """ Handles the request in the current locale """
     if event['session']['new']:
         on_session_started({'requestId': event['request']['requestId']},
                            event['session'])
 
-    boto3.setup_default_session(region_name='eu-west-1')
-
     if event['request']['type'] == "LaunchRequest":
         return on_launch(event['request'], event['session'])
     elif event['request']['type'] == "IntentRequest":
-        return on_intent(event['request'], event['session'])
+        request_id = event['request']['requestId']
+        response, first = Storage.replay_cache.begin(request_id)
+        if response is not None:
+            # Retried by Alexa, answer again without repeating the saves
+            return response
+        try:
+            player = Storage.PlayerRecord(event['session']['user']['userId'])
+            player.load_session(event['session'].get('attributes'))
+            response = on_intent(event['request'], event['session'], player)
+            if first and player.is_dirty() and Storage.claim_request(request_id):
+                # Progress saves are written once the response has been built, only requests
+                # with saves claim their requestId
+                Storage.write_buffer.commit(player)
+            response = add_session_progress(response, player)
+        finally:
+            if first:
+                Storage.replay_cache.finish(request_id, response)
+        return response
     elif event['request']['type'] == "SessionEndedRequest":
         return on_session_ended(event['request'], event['session'])
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+"""
+Self-hosted web service endpoint for the Mysterious House skill
+
+Alexa request JSON POSTed to the server is routed through the same
+lambda_handler the Lambda function uses, and the response is sent back as
+JSON. Connections are kept alive, idle ones wait in a selector and are only
+handed to the fixed pool of worker threads once a request arrives on them, so
+idle clients never hold a worker. Responses built from a scene template reuse
+the template's serialized bytes. Request signatures are checked as Alexa
+requires of a web service, see Verification.
+
+    python Server.py --port 443 --certfile cert.pem --keyfile key.pem
+    python Server.py --port 8080 --no-verify
+
+Without a certificate the server speaks plain HTTP, for local testing or
+behind a proxy terminating HTTPS.
+"""
+
+from __future__ import print_function
+import argparse
+import json
+import queue
+import selectors
+import socket
+import ssl
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import MysteriousHouse
+import Storage
+import Verification
+
+DEFAULT_HOST = '0.0.0.0'
+DEFAULT_PORT = 8080
+DEFAULT_WORKERS = 16
+
+# Idle keep-alive connections are closed after this many seconds
+KEEP_ALIVE_TIMEOUT = 15
+
+# Longest wait for the rest of a request once it has started arriving, in seconds
+REQUEST_TIMEOUT = 10
+
+# Largest request body accepted, Alexa requests are a few kilobytes
+MAX_BODY_SIZE = 128 * 1024
+
+# The response to requests the handlers return nothing for, such as SessionEndedRequest
+EMPTY_RESPONSE = {
+    'version': '1.0',
+    'response': {}
+}
+
+encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False, default=Storage.json_default)
+
+
+def encode(value):
+    return encoder.encode(value).encode('utf-8')
+
+
+# Serialized inner response of every scene template, by id so lookups don't hash the dicts
+template_bytes = {}
+template_languages = set()
+
+
+def load_template_bytes():
+    # Templates are built per language on first use, so pick up languages loaded since the last call
+    for language, templates in list(MysteriousHouse.scene_templates.items()):
+        if language not in template_languages:
+            for template in templates.values():
+                template_bytes[id(template)] = (template, encode(template))
+            template_languages.add(language)
+
+
+def serialize_response(response):
+    if isinstance(response, dict) and len(response) == 3 and 'sessionAttributes' in response:
+        if len(template_languages) != len(MysteriousHouse.scene_templates):
+            load_template_bytes()
+        template = template_bytes.get(id(response.get('response')))
+        if template is not None and template[0] is response['response']:
+            return b''.join((
+                b'{"version":', encode(response['version']),
+                b',"sessionAttributes":', encode(response['sessionAttributes']),
+                b',"response":', template[1], b'}'
+            ))
+    return encode(response)
+
+
+def handle_event(event):
+    response = MysteriousHouse.lambda_handler(event, None)
+    if response is None:
+        response = EMPTY_RESPONSE
+    return serialize_response(response)
+
+
+class SkillRequestHandler(BaseHTTPRequestHandler):
+    """ Answers Alexa requests POSTed as JSON, keeping the connection open between them
+
+    Unlike other request handlers it lives as long as its connection: the
+    server calls handle_turn whenever a request is waiting and finish once the
+    connection is closed.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = REQUEST_TIMEOUT
+
+    def __init__(self, request, client_address, server):
+        self.request = request
+        self.client_address = client_address
+        self.server = server
+        self.close_connection = False
+        self.setup()
+
+    def handle_turn(self):
+        """ Answers the requests waiting on the connection, returns False once it should be closed """
+        self.handle_one_request()
+        while not self.close_connection and self.has_pending_request():
+            self.handle_one_request()
+        return not self.close_connection
+
+    def has_pending_request(self):
+        # A pipelined request may already sit in the read buffer, where the selector can't see it
+        self.connection.settimeout(0)
+        try:
+            return len(self.rfile.peek(1)) > 0
+        except (OSError, ValueError):
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > MAX_BODY_SIZE:
+            self.close_connection = True
+            self.send_body(413 if length > MAX_BODY_SIZE else 400, encode({'error': "Invalid Content-Length"}))
+            return
+        body = self.rfile.read(length)
+        try:
+            event = json.loads(body.decode('utf-8'))
+        except ValueError:
+            self.send_body(400, encode({'error': "Invalid JSON"}))
+            return
+        if self.server.verifier is not None:
+            try:
+                self.server.verifier.verify(self.headers, body, event)
+            except Verification.VerificationError as e:
+                self.send_body(400, encode({'error': str(e)}))
+                return
+        try:
+            payload = handle_event(event)
+        except (KeyError, TypeError, ValueError) as e:
+            # Not a request this skill accepts, such as another skill's application id
+            self.send_body(400, encode({'error': str(e)}))
+            return
+        except Exception:
+            traceback.print_exc()
+            self.send_body(500, encode({'error': "Internal error"}))
+            return
+        self.send_body(200, payload)
+
+    def do_GET(self):
+        # Health check for load balancers
+        self.send_body(200, encode({'status': "ok"}))
+
+    def send_body(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json;charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPRequestHandler.log_message(self, format, *args)
+
+
+class PooledHTTPServer(HTTPServer):
+    """ HTTPServer waiting on idle connections with a selector and answering requests on a pool of threads
+
+    The thread running serve_forever accepts connections and watches the idle
+    ones. A connection is handed to a worker once it is readable and comes
+    back to the selector after its response, or is closed.
+    """
+
+    def __init__(self, address, handler_class=SkillRequestHandler, workers=DEFAULT_WORKERS, verifier=None,
+                 verbose=False, idle_timeout=KEEP_ALIVE_TIMEOUT):
+        HTTPServer.__init__(self, address, handler_class)
+        self.verifier = verifier
+        self.verbose = verbose
+        self.idle_timeout = idle_timeout
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # Connections the workers are done with, registered again by the serving thread
+        self._returned = queue.Queue()
+        self._wakeup_reader, self._wakeup_writer = socket.socketpair()
+        self._wakeup_writer.setblocking(False)
+        self._running = False
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    def serve_forever(self, poll_interval=0.5):
+        self._stopped.clear()
+        self._running = True
+        idle = {}
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        selector.register(self._wakeup_reader, selectors.EVENT_READ)
+        try:
+            while self._running:
+                for key, events in selector.select(poll_interval):
+                    if key.fileobj is self.socket:
+                        self.accept_connection(selector, idle)
+                    elif key.fileobj is self._wakeup_reader:
+                        self._wakeup_reader.recv(4096)
+                    else:
+                        selector.unregister(key.fileobj)
+                        del idle[key.data]
+                        self.executor.submit(self.process_turn, key.data)
+                while True:
+                    try:
+                        handler = self._returned.get_nowait()
+                    except queue.Empty:
+                        break
+                    self.watch(selector, idle, handler)
+                now = time.time()
+                for handler, since in list(idle.items()):
+                    if now - since > self.idle_timeout:
+                        selector.unregister(handler.request)
+                        del idle[handler]
+                        self.close_handler(handler)
+        finally:
+            for handler in idle:
+                self.close_handler(handler)
+            selector.close()
+            self._stopped.set()
+
+    def accept_connection(self, selector, idle):
+        try:
+            request, client_address = self.get_request()
+        except OSError:
+            return
+        try:
+            handler = self.RequestHandlerClass(request, client_address, self)
+        except Exception:
+            self.handle_error(request, client_address)
+            self.shutdown_request(request)
+            return
+        self.watch(selector, idle, handler)
+
+    def watch(self, selector, idle, handler):
+        selector.register(handler.request, selectors.EVENT_READ, handler)
+        idle[handler] = time.time()
+
+    def process_turn(self, handler):
+        try:
+            keep_open = handler.handle_turn()
+        except Exception:
+            self.handle_error(handler.request, handler.client_address)
+            keep_open = False
+        if not keep_open:
+            self.close_handler(handler)
+            return
+        self._returned.put(handler)
+        self.wake()
+
+    def wake(self):
+        try:
+            self._wakeup_writer.send(b'\0')
+        except (BlockingIOError, OSError):
+            # Already woken, the byte waiting is enough
+            pass
+
+    def close_handler(self, handler):
+        try:
+            handler.finish()
+        except OSError:
+            pass
+        self.shutdown_request(handler.request)
+
+    def shutdown(self):
+        self._running = False
+        self.wake()
+        self._stopped.wait()
+
+    def server_close(self):
+        HTTPServer.server_close(self)
+        self.executor.shutdown(wait=True)
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
+
+
+def create_server(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=DEFAULT_WORKERS, certfile=None, keyfile=None,
+                  verify=True, verbose=False):
+    verifier = Verification.RequestVerifier() if verify else None
+    server = PooledHTTPServer((host, port), SkillRequestHandler, workers, verifier, verbose)
+    if certfile is not None:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        # The handshake happens on the worker thread, not while accepting
+        server.socket = context.wrap_socket(server.socket, server_side=True, do_handshake_on_connect=False)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the Mysterious House skill over HTTP")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    parser.add_argument('--certfile', help="Certificate chain to serve HTTPS with")
+    parser.add_argument('--keyfile', help="Private key of the certificate, if not in certfile")
+    parser.add_argument('--no-verify', dest='verify', action='store_false',
+                        help="Accept unsigned requests, for local testing only")
+    parser.add_argument('--verbose', action='store_true', help="Log every request")
+    args = parser.parse_args(argv)
+
+    server = create_server(args.host, args.port, args.workers, args.certfile, args.keyfile, args.verify,
+                           args.verbose)
+    print("Serving on " + args.host + ":" + str(args.port), file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
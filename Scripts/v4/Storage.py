@@ -0,0 +1,1014 @@
+# -*- coding: utf-8 -*-
+"""
+Player progress storage for Mysterious House
+
+Progress is kept behind a StorageBackend chosen by configuration: the
+MysteriousHouse DynamoDB table, a local DynamoDB stand-in, an SQLite file or
+an in-memory dict. The backend is built once per container and then shared by
+every invocation, so warm requests reuse the same connection pool. Progress
+writes are buffered per request and flushed after the response is built.
+"""
+
+import collections
+import copy
+import decimal
+import hashlib
+import hmac
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+REGION_NAME = 'eu-west-1'
+TABLE_NAME = 'MysteriousHouse'
+
+# Environment variables selecting the backend
+BACKEND_VARIABLE = 'MYSTERIOUS_HOUSE_STORAGE'
+SQLITE_PATH_VARIABLE = 'MYSTERIOUS_HOUSE_SQLITE_PATH'
+ENDPOINT_VARIABLE = 'MYSTERIOUS_HOUSE_DYNAMODB_ENDPOINT'
+
+# Table holding claimed request ids, requests are only claimed when it is set
+REQUEST_TABLE_VARIABLE = 'MYSTERIOUS_HOUSE_REQUEST_TABLE'
+
+DEFAULT_SQLITE_PATH = 'MysteriousHouse.db'
+DEFAULT_LOCAL_ENDPOINT = 'http://localhost:8000'
+
+# Progress of a player with no stored item
+DEFAULT_PROGRESS = {
+    'CanWarp': False,
+    'FloorNumber': 1
+}
+
+# Attributes the handlers read, used as the projection for progress lookups
+PROGRESS_ATTRIBUTES = ('CanWarp', 'FloorNumber', 'Version')
+
+# Reads of a player saved by this container within this many seconds are strongly consistent
+CONSISTENT_READ_WINDOW = 2.0
+RECENT_SAVES_SIZE = 1024
+
+# Player items kept in memory across invocations of a warm container
+PLAYER_CACHE_SIZE = 1024
+PLAYER_CACHE_TTL = 300.0
+
+# DynamoDB error codes worth retrying
+RETRYABLE_ERROR_CODES = (
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded',
+    'InternalServerError',
+    'ServiceUnavailable'
+)
+
+# Retries with jittered exponential backoff, in seconds
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.025
+BACKOFF_CAP = 0.4
+
+# Failed calls in a row that open the circuit breaker, and how long it stays open
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0
+
+# Items returned by one page of a scan
+SCAN_PAGE_SIZE = 500
+
+# Threads writing buffered player records in parallel
+FLUSH_WORKERS = 8
+
+# Responses kept for retried requests, and how long a claimed request id is held, in seconds
+REPLAY_CACHE_SIZE = 1024
+REQUEST_CLAIM_TTL = 3600
+
+# Longest a retry arriving while its request is still being handled waits for that response, in seconds
+REPLAY_WAIT_TIMEOUT = 5.0
+
+# Session attribute carrying the signed copy of the player's progress, and
+# the environment variable holding the key it is signed with
+SESSION_PROGRESS_ATTRIBUTE = 'Progress'
+SESSION_KEY_VARIABLE = 'MYSTERIOUS_HOUSE_SESSION_KEY'
+
+
+class StorageError(Exception):
+    """ Raised by a backend when the store cannot be read or written
+
+    retryable is set for throttling and transient service errors.
+    """
+
+    def __init__(self, message, retryable=False):
+        Exception.__init__(self, message)
+        self.retryable = retryable
+
+
+class ConditionFailedError(StorageError):
+    """ Raised by a backend when the stored Version is not the expected one """
+
+
+class CircuitOpenError(StorageError):
+    """ Raised without calling the backend while the circuit breaker is open """
+
+
+def get_last_update():
+    return time.strftime("%Y-%m-%d")
+
+
+def project(item, attributes):
+    if item is None or attributes is None:
+        return item
+    return dict((name, item[name]) for name in attributes if name in item)
+
+
+def get_version(item):
+    if item is None:
+        return 0
+    return item.get('Version', 0)
+
+
+def check_version(item, expected_version):
+    if expected_version is not None and get_version(item) != expected_version:
+        raise ConditionFailedError("Version is not " + str(expected_version))
+
+
+def json_default(value):
+    # DynamoDB returns numbers as Decimal, written to JSON as plain numbers
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(repr(value) + " is not JSON serializable")
+
+
+def get_segment(user_id, total_segments):
+    # Stable across processes, unlike hash()
+    return zlib.crc32(user_id.encode('utf-8')) % total_segments
+
+
+def apply_update(item, user_id, values, defaults, touch=True):
+    # Same result as an UpdateExpression setting values and if_not_exists(defaults)
+    version = get_version(item) + 1
+    if item is None:
+        item = {'UserID': user_id}
+    else:
+        item = dict(item)
+    for name in defaults:
+        if name not in item:
+            item[name] = defaults[name]
+    item.update(values)
+    if touch:
+        item['LastUpdate'] = get_last_update()
+    item['Version'] = version
+    return item
+
+
+# --------------- Backends
+
+class StorageBackend(object):
+    """ Interface every progress store implements """
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        """ Returns the stored item for user_id or None
+
+        attributes limits the returned item to those names, consistent asks for a
+        strongly consistent read where the store distinguishes the two.
+        """
+        raise NotImplementedError()
+
+    def update_item(self, user_id, values, defaults, expected_version=None, touch=True):
+        """ Sets values and LastUpdate, missing attributes get defaults, returns the new item
+
+        Every update increments Version. When expected_version is given the update
+        only happens if the stored Version matches it (0 meaning no Version yet),
+        otherwise ConditionFailedError is raised. Updates the player didn't make,
+        such as migrations, pass touch=False to leave LastUpdate alone.
+        """
+        raise NotImplementedError()
+
+    def put_items(self, items):
+        """ Replaces whole items in bulk """
+        raise NotImplementedError()
+
+    def scan_page(self, segment, total_segments, start_key=None, limit=SCAN_PAGE_SIZE):
+        """ Returns (items, next_key) for one page of one segment of a parallel scan
+
+        next_key is None once the segment is exhausted, otherwise it is passed back
+        as start_key to read the following page.
+        """
+        raise NotImplementedError()
+
+    def claim_request(self, request_id, expires):
+        """ Records request_id as handled until expires, returns False if it already was """
+        raise NotImplementedError()
+
+
+def scan_segment(backend, segment, total_segments, limit=SCAN_PAGE_SIZE):
+    # Yields every item of one scan segment, a page at a time
+    start_key = None
+    while True:
+        items, start_key = backend.scan_page(segment, total_segments, start_key, limit)
+        for item in items:
+            yield item
+        if start_key is None:
+            return
+
+
+class MemoryBackend(StorageBackend):
+    """ Progress kept in a dict, for benchmarks and offline soak tests """
+
+    def __init__(self):
+        self.items = {}
+        self.requests = {}
+        self._lock = threading.Lock()
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        with self._lock:
+            item = self.items.get(user_id)
+            return None if item is None else project(dict(item), attributes)
+
+    def update_item(self, user_id, values, defaults, expected_version=None, touch=True):
+        with self._lock:
+            check_version(self.items.get(user_id), expected_version)
+            item = apply_update(self.items.get(user_id), user_id, values, defaults, touch)
+            self.items[user_id] = item
+            return dict(item)
+
+    def put_items(self, items):
+        with self._lock:
+            for item in items:
+                self.items[item['UserID']] = dict(item)
+
+    def scan_page(self, segment, total_segments, start_key=None, limit=SCAN_PAGE_SIZE):
+        with self._lock:
+            user_ids = sorted(user_id for user_id in self.items
+                              if get_segment(user_id, total_segments) == segment and
+                              (start_key is None or user_id > start_key))
+            page = [dict(self.items[user_id]) for user_id in user_ids[:limit]]
+        next_key = page[-1]['UserID'] if len(user_ids) > limit else None
+        return page, next_key
+
+    def claim_request(self, request_id, expires):
+        with self._lock:
+            if self.requests.get(request_id, 0) > time.time():
+                return False
+            self.requests[request_id] = expires
+            return True
+
+
+class SQLiteBackend(StorageBackend):
+    """ Progress kept in an SQLite file, one JSON item per player """
+
+    def __init__(self, path=DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS Progress (UserID TEXT PRIMARY KEY, Item TEXT NOT NULL)")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS Requests (RequestID TEXT PRIMARY KEY, Expires REAL NOT NULL)")
+
+    def _select(self, user_id):
+        row = self._connection.execute("SELECT Item FROM Progress WHERE UserID = ?", (user_id,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _replace(self, item):
+        # An upsert keeps the rowid, so an item updated during a scan isn't read again further on
+        self._connection.execute(
+            "INSERT INTO Progress (UserID, Item) VALUES (?, ?) ON CONFLICT(UserID) DO UPDATE SET Item = excluded.Item",
+            (item['UserID'], json.dumps(item, default=json_default)))
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        try:
+            with self._lock:
+                return project(self._select(user_id), attributes)
+        except sqlite3.Error as e:
+            raise StorageError(str(e))
+
+    def update_item(self, user_id, values, defaults, expected_version=None, touch=True):
+        try:
+            with self._lock, self._connection:
+                item = self._select(user_id)
+                check_version(item, expected_version)
+                item = apply_update(item, user_id, values, defaults, touch)
+                self._replace(item)
+                return item
+        except sqlite3.Error as e:
+            raise StorageError(str(e))
+
+    def put_items(self, items):
+        try:
+            with self._lock, self._connection:
+                for item in items:
+                    self._replace(item)
+        except sqlite3.Error as e:
+            raise StorageError(str(e))
+
+    def scan_page(self, segment, total_segments, start_key=None, limit=SCAN_PAGE_SIZE):
+        # Segments split the table by rowid, start_key is the last rowid read
+        try:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT rowid, Item FROM Progress WHERE rowid % ? = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (total_segments, segment, start_key or 0, limit + 1)).fetchall()
+        except sqlite3.Error as e:
+            raise StorageError(str(e))
+        next_key = rows[limit - 1][0] if len(rows) > limit else None
+        return [json.loads(row[1]) for row in rows[:limit]], next_key
+
+    def claim_request(self, request_id, expires):
+        try:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM Requests WHERE RequestID = ? AND Expires <= ?",
+                                         (request_id, time.time()))
+                cursor = self._connection.execute(
+                    "INSERT OR IGNORE INTO Requests (RequestID, Expires) VALUES (?, ?)", (request_id, expires))
+                return cursor.rowcount == 1
+        except sqlite3.Error as e:
+            raise StorageError(str(e))
+
+
+class DynamoDBBackend(StorageBackend):
+    """ Progress kept in a DynamoDB table, or a local stand-in when endpoint_url is given
+
+    The boto3 session, client and table are built on first use and kept for the
+    life of the container, so boto3 is only imported when this backend is used.
+    """
+
+    def __init__(self, table_name=TABLE_NAME, endpoint_url=None, region_name=REGION_NAME,
+                 request_table_name=None):
+        self.table_name = table_name
+        self.endpoint_url = endpoint_url
+        self.region_name = region_name
+        self.request_table_name = request_table_name
+        self._session = None
+        self._resource = None
+        self._client = None
+        self._table = None
+        self._request_table = None
+        self._lock = threading.Lock()
+
+    def get_config(self):
+        from botocore.config import Config
+        # Retries are left to ResilientBackend so they share its backoff and breaker
+        return Config(
+            region_name=self.region_name,
+            max_pool_connections=10,
+            tcp_keepalive=True,
+            connect_timeout=1,
+            read_timeout=1,
+            retries={'max_attempts': 0}
+        )
+
+    def get_session(self):
+        if self._session is None:
+            import boto3
+            self._session = boto3.session.Session(region_name=self.region_name)
+        return self._session
+
+    def get_table(self):
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    self._resource = self.get_session().resource('dynamodb', config=self.get_config(),
+                                                                 endpoint_url=self.endpoint_url)
+                    table = self._resource.Table(self.table_name)
+                    self._client = table.meta.client
+                    self._table = table
+        return self._table
+
+    def get_request_table(self):
+        # Shares the progress table's connection pool
+        if self._request_table is None:
+            self.get_table()
+            self._request_table = self._resource.Table(self.request_table_name)
+        return self._request_table
+
+    def get_client(self):
+        self.get_table()
+        return self._client
+
+    def _error(self, e):
+        from botocore.exceptions import ClientError
+        if not isinstance(e, ClientError):
+            # Connection failures and timeouts
+            return StorageError(str(e), True)
+        code = e.response.get('Error', {}).get('Code')
+        if code == 'ConditionalCheckFailedException':
+            return ConditionFailedError(str(e))
+        return StorageError(str(e), code in RETRYABLE_ERROR_CODES)
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        from botocore.exceptions import BotoCoreError, ClientError
+        request = {
+            'Key': {
+                'UserID': user_id
+            },
+            'ConsistentRead': consistent
+        }
+        if attributes is not None:
+            names = dict(('#a' + str(index), name) for index, name in enumerate(attributes))
+            request['ProjectionExpression'] = ', '.join(sorted(names))
+            request['ExpressionAttributeNames'] = names
+        try:
+            response = self.get_table().get_item(**request)
+        except (BotoCoreError, ClientError) as e:
+            raise self._error(e)
+        return response.get('Item')
+
+    def update_item(self, user_id, values, defaults, expected_version=None, touch=True):
+        from botocore.exceptions import BotoCoreError, ClientError
+        assignments = ['Version=if_not_exists(Version, :zero) + :one']
+        expression_values = {':zero': 0, ':one': 1}
+        if touch:
+            assignments.insert(0, 'LastUpdate=:u')
+            expression_values[':u'] = get_last_update()
+        expression_names = {}
+        for index, name in enumerate(sorted(set(defaults) | set(values))):
+            key = ':v' + str(index)
+            placeholder = '#n' + str(index)
+            expression_names[placeholder] = name
+            if name in values:
+                assignments.append(placeholder + '=' + key)
+                expression_values[key] = values[name]
+            else:
+                # Only the changed attributes are written, a new item gets the defaults
+                assignments.append(placeholder + '=if_not_exists(' + placeholder + ', ' + key + ')')
+                expression_values[key] = defaults[name]
+        request = {
+            'Key': {
+                'UserID': user_id
+            },
+            'UpdateExpression': 'set ' + ', '.join(assignments),
+            'ExpressionAttributeNames': expression_names,
+            'ExpressionAttributeValues': expression_values,
+            'ReturnValues': "ALL_NEW"
+        }
+        if expected_version == 0:
+            request['ConditionExpression'] = 'attribute_not_exists(Version)'
+        elif expected_version is not None:
+            request['ConditionExpression'] = 'Version = :expected'
+            expression_values[':expected'] = expected_version
+        try:
+            response = self.get_table().update_item(**request)
+        except (BotoCoreError, ClientError) as e:
+            raise self._error(e)
+        return response['Attributes']
+
+    def put_items(self, items):
+        from botocore.exceptions import BotoCoreError, ClientError
+        try:
+            with self.get_table().batch_writer(overwrite_by_pkeys=['UserID']) as writer:
+                for item in items:
+                    writer.put_item(Item=item)
+        except (BotoCoreError, ClientError) as e:
+            raise self._error(e)
+
+    def scan_page(self, segment, total_segments, start_key=None, limit=SCAN_PAGE_SIZE):
+        from botocore.exceptions import BotoCoreError, ClientError
+        request = {
+            'Segment': segment,
+            'TotalSegments': total_segments,
+            'Limit': limit
+        }
+        if start_key is not None:
+            request['ExclusiveStartKey'] = start_key
+        try:
+            response = self.get_table().scan(**request)
+        except (BotoCoreError, ClientError) as e:
+            raise self._error(e)
+        return response.get('Items', []), response.get('LastEvaluatedKey')
+
+    def claim_request(self, request_id, expires):
+        from botocore.exceptions import BotoCoreError, ClientError
+        # ExpiresAt doubles as the table's TTL attribute
+        request = {
+            'Item': {
+                'RequestID': request_id,
+                'ExpiresAt': int(expires)
+            },
+            'ConditionExpression': 'attribute_not_exists(RequestID) OR ExpiresAt < :now',
+            'ExpressionAttributeValues': {':now': int(time.time())}
+        }
+        try:
+            self.get_request_table().put_item(**request)
+        except (BotoCoreError, ClientError) as e:
+            error = self._error(e)
+            if isinstance(error, ConditionFailedError):
+                return False
+            raise error
+        return True
+
+
+def create_backend(name=None):
+    if name is None:
+        name = os.environ.get(BACKEND_VARIABLE, 'dynamodb')
+    if name == 'dynamodb':
+        return DynamoDBBackend(request_table_name=os.environ.get(REQUEST_TABLE_VARIABLE))
+    elif name == 'local':
+        return DynamoDBBackend(endpoint_url=os.environ.get(ENDPOINT_VARIABLE, DEFAULT_LOCAL_ENDPOINT),
+                               request_table_name=os.environ.get(REQUEST_TABLE_VARIABLE))
+    elif name == 'sqlite':
+        return SQLiteBackend(os.environ.get(SQLITE_PATH_VARIABLE, DEFAULT_SQLITE_PATH))
+    elif name == 'memory':
+        return MemoryBackend()
+    else:
+        raise ValueError("Unknown storage backend " + name)
+
+
+class CircuitBreaker(object):
+    """ Opens after threshold failed calls in a row and rejects calls until reset_timeout has passed
+
+    Once the timeout has passed a single trial call is let through, its result
+    closes the breaker again or keeps it open for another timeout.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, reset_timeout=BREAKER_RESET_TIMEOUT, clock=time.time):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        with self._lock:
+            return self._opened_at is not None and self.clock() - self._opened_at < self.reset_timeout
+
+    def allow(self):
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self.clock() - self._opened_at < self.reset_timeout:
+                return False
+            # Half open, restart the timeout so only this call goes through
+            self._opened_at = self.clock()
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self._opened_at = self.clock()
+
+
+class ResilientBackend(StorageBackend):
+    """ Wraps a backend with jittered retries of transient errors and a circuit breaker
+
+    The backoff grows with the failures the breaker has seen in a row, so retries
+    thin out while the store is throttling. Calls fail fast with CircuitOpenError
+    while the breaker is open.
+    """
+
+    def __init__(self, backend, breaker=None, max_attempts=MAX_ATTEMPTS, sleep=time.sleep):
+        self.backend = backend
+        self.breaker = CircuitBreaker() if breaker is None else breaker
+        self.max_attempts = max_attempts
+        self.sleep = sleep
+
+    def get_delay(self, attempt):
+        exponent = attempt + min(self.breaker.failures, BREAKER_THRESHOLD)
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** exponent))
+
+    def call(self, method, *args):
+        if not self.breaker.allow():
+            raise CircuitOpenError("Storage circuit breaker is open")
+        attempt = 0
+        while True:
+            try:
+                result = method(*args)
+            except ConditionFailedError:
+                # The store answered, only the Version check failed
+                self.breaker.record_success()
+                raise
+            except StorageError as e:
+                attempt += 1
+                if not e.retryable or attempt >= self.max_attempts:
+                    self.breaker.record_failure()
+                    raise
+                self.sleep(self.get_delay(attempt))
+            else:
+                self.breaker.record_success()
+                return result
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        return self.call(self.backend.get_item, user_id, attributes, consistent)
+
+    def update_item(self, user_id, values, defaults, expected_version=None, touch=True):
+        return self.call(self.backend.update_item, user_id, values, defaults, expected_version, touch)
+
+    def put_items(self, items):
+        return self.call(self.backend.put_items, items)
+
+    def scan_page(self, segment, total_segments, start_key=None, limit=SCAN_PAGE_SIZE):
+        return self.call(self.backend.scan_page, segment, total_segments, start_key, limit)
+
+    def claim_request(self, request_id, expires):
+        return self.call(self.backend.claim_request, request_id, expires)
+
+
+_backend = None
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = ResilientBackend(create_backend())
+    return _backend
+
+
+def set_backend(backend):
+    global _backend, _claim_backend
+    _backend = backend
+    _claim_backend = None
+
+
+_claim_backend = None
+
+
+def get_claim_backend():
+    # The request table has its own breaker, failing claims must not open the one guarding progress
+    global _claim_backend
+    if _claim_backend is None:
+        backend = get_backend()
+        if isinstance(backend, ResilientBackend):
+            backend = backend.backend
+        _claim_backend = ResilientBackend(backend)
+    return _claim_backend
+
+
+_recent_saves = collections.OrderedDict()
+_recent_saves_lock = threading.Lock()
+
+
+def note_saved(user_id):
+    with _recent_saves_lock:
+        _recent_saves.pop(user_id, None)
+        _recent_saves[user_id] = time.time()
+        if len(_recent_saves) > RECENT_SAVES_SIZE:
+            _recent_saves.popitem(last=False)
+
+
+def is_recently_saved(user_id):
+    with _recent_saves_lock:
+        saved = _recent_saves.get(user_id)
+    return saved is not None and time.time() - saved < CONSISTENT_READ_WINDOW
+
+
+# --------------- Retried Requests
+# Alexa retries a request that timed out with the same requestId. The response
+# built the first time is kept per container and returned again, a retry
+# arriving while the first attempt is still running waits for it. With a
+# request table configured each requestId is also claimed in the store so a
+# retry landing on another container does not repeat the saves.
+
+class ReplayCache(object):
+    """ Bounded map of requestId to the response already returned for it, and the requests in flight """
+
+    def __init__(self, size=REPLAY_CACHE_SIZE, timeout=REPLAY_WAIT_TIMEOUT):
+        self.size = size
+        self.timeout = timeout
+        self._responses = collections.OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def get(self, request_id):
+        with self._lock:
+            response = self._responses.get(request_id)
+        return None if response is None else copy.deepcopy(response)
+
+    def begin(self, request_id):
+        """ Returns (response, first) for a request about to be handled
+
+        The first invocation for request_id gets (None, True) and must call
+        finish. A duplicate gets the first one's response, waiting for it while
+        it is in flight, or (None, False) if none arrives in time, in which case
+        it must not repeat the saves.
+        """
+        with self._lock:
+            response = self._responses.get(request_id)
+            if response is None:
+                done = self._in_flight.get(request_id)
+                if done is None:
+                    self._in_flight[request_id] = threading.Event()
+                    return None, True
+        if response is None:
+            done.wait(self.timeout)
+            with self._lock:
+                response = self._responses.get(request_id)
+        return None if response is None else copy.deepcopy(response), False
+
+    def finish(self, request_id, response=None):
+        # Ends the request begin marked in flight, keeping its response unless it failed
+        if response is not None:
+            self.put(request_id, response)
+        with self._lock:
+            done = self._in_flight.pop(request_id, None)
+        if done is not None:
+            done.set()
+
+    def put(self, request_id, response):
+        response = copy.deepcopy(response)
+        with self._lock:
+            self._responses.pop(request_id, None)
+            self._responses[request_id] = response
+            if len(self._responses) > self.size:
+                self._responses.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._responses.clear()
+
+
+replay_cache = ReplayCache()
+
+
+def claim_request(request_id):
+    # True unless another invocation already handled request_id
+    if not os.environ.get(REQUEST_TABLE_VARIABLE):
+        return True
+    try:
+        return get_claim_backend().claim_request(request_id, time.time() + REQUEST_CLAIM_TTL)
+    except StorageError:
+        # Can't tell, handling it twice beats not handling it
+        return True
+
+
+def covers(known_attributes, attributes):
+    # Whether an item read with known_attributes (None for all) holds attributes
+    if known_attributes is None:
+        return True
+    return attributes is not None and known_attributes.issuperset(attributes)
+
+
+class PlayerCache(object):
+    """ Least recently used player items, each kept for at most ttl seconds
+
+    Entries may go stale when another container saves the player, the Version
+    check on the next save detects that and the entry is refreshed.
+    """
+
+    def __init__(self, size=PLAYER_CACHE_SIZE, ttl=PLAYER_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id, attributes, stale=False):
+        # Returns (item, known_attributes) or None when there is no fresh entry,
+        # expired entries are kept until evicted and returned when stale is set
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            item, known_attributes, expires = entry
+            if expires < time.time() and not stale:
+                return None
+            if item is not None and not covers(known_attributes, attributes):
+                return None
+            self._entries.pop(user_id)
+            self._entries[user_id] = entry
+        return (None if item is None else dict(item)), known_attributes
+
+    def put(self, user_id, item, known_attributes):
+        if item is not None:
+            item = dict(item)
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._entries[user_id] = (item, known_attributes, time.time() + self.ttl)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+player_cache = PlayerCache()
+
+
+# --------------- Session Progress
+# Progress read during a session is mirrored into the session attributes with
+# an HMAC signature, later turns of the session trust the signed copy instead
+# of reading the store again. Without a configured key each container signs
+# with its own random key, so a turn served elsewhere simply reads the store.
+
+_session_key = None
+
+
+def get_session_key():
+    global _session_key
+    if _session_key is None:
+        key = os.environ.get(SESSION_KEY_VARIABLE)
+        _session_key = key.encode('utf-8') if key else os.urandom(32)
+    return _session_key
+
+
+def get_progress_signature(user_id, can_warp, floor_number, version):
+    message = json.dumps([user_id, can_warp, floor_number, version])
+    return hmac.new(get_session_key(), message.encode('utf-8'), hashlib.sha256).hexdigest()
+
+
+def sign_progress(user_id, item):
+    can_warp = bool(item.get('CanWarp', DEFAULT_PROGRESS['CanWarp']))
+    floor_number = int(item.get('FloorNumber', DEFAULT_PROGRESS['FloorNumber']))
+    version = int(get_version(item))
+    return {
+        'CanWarp': can_warp,
+        'FloorNumber': floor_number,
+        'Version': version,
+        'Signature': get_progress_signature(user_id, can_warp, floor_number, version)
+    }
+
+
+def verify_progress(user_id, progress):
+    # The progress item from a signed session copy, or None if it is missing or tampered with
+    try:
+        can_warp = progress['CanWarp']
+        floor_number = progress['FloorNumber']
+        version = progress['Version']
+        signature = get_progress_signature(user_id, can_warp, floor_number, version)
+        if not hmac.compare_digest(signature, str(progress['Signature'])):
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    return {
+        'CanWarp': can_warp,
+        'FloorNumber': floor_number,
+        'Version': version
+    }
+
+
+# --------------- Player Records
+
+class PlayerRecord(object):
+    """ One player's stored progress, read at most once per request
+
+    Reads are served from the container's player cache when it has a fresh entry,
+    or from an expired entry when the backend cannot be reached. Saves are
+    buffered on the record and written together by flush(), conditional on the
+    Version that was read.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self._item = None
+        self._loaded = False
+        self._attributes = None
+        self._unavailable = False
+        self._pending = {}
+
+    def get_item(self, attributes=PROGRESS_ATTRIBUTES, consistent=False):
+        if self._unavailable:
+            # Already failed this request, don't wait on the backend again
+            raise StorageError("Player record unavailable")
+        if not self._loaded or not self._covers(attributes):
+            self._load(attributes, consistent)
+        if not self._pending:
+            return self._item
+        item = dict(DEFAULT_PROGRESS) if self._item is None else dict(self._item)
+        item.update(self._pending)
+        return item
+
+    def _load(self, attributes, consistent):
+        # Eventually consistent unless asked for, or this container saved the player moments ago
+        cached = None if consistent else player_cache.get(self.user_id, attributes)
+        if cached is not None:
+            self._item, self._attributes = cached
+        else:
+            consistent = consistent or is_recently_saved(self.user_id)
+            try:
+                self._item = get_backend().get_item(self.user_id, attributes, consistent)
+            except StorageError:
+                cached = player_cache.get(self.user_id, attributes, True)
+                if cached is None:
+                    self._unavailable = True
+                    raise
+                self._item, self._attributes = cached
+            else:
+                self._attributes = None if attributes is None else frozenset(attributes)
+                player_cache.put(self.user_id, self._item, self._attributes)
+        self._loaded = True
+
+    def _covers(self, attributes):
+        return self._item is None or covers(self._attributes, attributes)
+
+    def load_session(self, session_attributes):
+        # Trust the signed progress carried in the session instead of reading it
+        if not session_attributes:
+            return
+        item = verify_progress(self.user_id, session_attributes.get(SESSION_PROGRESS_ATTRIBUTE))
+        if item is not None:
+            self._item = item
+            self._attributes = frozenset(PROGRESS_ATTRIBUTES)
+            self._loaded = True
+
+    def get_session_progress(self):
+        # Signed copy of the progress for the session, None if it was not read this request
+        if not self._loaded:
+            return None
+        item = self._item
+        if item is None or self._pending:
+            item = apply_update(item, self.user_id, self._pending, DEFAULT_PROGRESS)
+            item['Version'] = get_version(self._item)
+        return sign_progress(self.user_id, item)
+
+    def set_item(self, item):
+        self._item = item
+        self._attributes = None
+        self._loaded = True
+
+    def save(self, **values):
+        self._pending.update(values)
+
+    def is_dirty(self):
+        return len(self._pending) > 0
+
+    def merge(self, other):
+        # Coalesce a later record for the same player into this one
+        if other._loaded:
+            self._item = other._item
+            self._attributes = other._attributes
+            self._loaded = True
+        self._pending.update(other._pending)
+
+    def flush(self):
+        if not self._pending:
+            return
+        values = self._pending
+        self._pending = {}
+        expected_version = get_version(self._item) if self._loaded else None
+        try:
+            try:
+                item = get_backend().update_item(self.user_id, values, DEFAULT_PROGRESS, expected_version)
+            except ConditionFailedError as e:
+                # Saved elsewhere since it was read, refresh and write over the newer version
+                self._load(PROGRESS_ATTRIBUTES, True)
+                item = get_backend().update_item(self.user_id, values, DEFAULT_PROGRESS,
+                                                 get_version(self._item))
+            self.set_item(item)
+            player_cache.put(self.user_id, item, None)
+            note_saved(self.user_id)
+        except StorageError as e:
+            player_cache.invalidate(self.user_id)
+            print('Update Failed')
+
+
+class WriteBehindBuffer(object):
+    """ Collects dirty player records and writes them once the responses are built
+
+    Every record is written with its own update conditional on the Version it
+    read. With auto_flush each request commits its own record, otherwise records
+    are buffered and flush writes them all in parallel.
+    """
+
+    def __init__(self, auto_flush=True, workers=FLUSH_WORKERS):
+        self.auto_flush = auto_flush
+        self.workers = workers
+        self._records = {}
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        if not record.is_dirty():
+            return
+        with self._lock:
+            if record.user_id in self._records:
+                self._records[record.user_id].merge(record)
+            else:
+                self._records[record.user_id] = record
+
+    def commit(self, record):
+        if not self.auto_flush:
+            self.add(record)
+            return
+        # Only the committing request's record, so it is written on this thread before
+        # the response reads it, records buffered with add wait for flush
+        record.flush()
+
+    def get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def flush(self):
+        with self._lock:
+            records = list(self._records.values())
+            self._records = {}
+        if len(records) == 1:
+            records[0].flush()
+            return
+        # PlayerRecord.flush handles its own storage errors
+        for future in [self.get_executor().submit(record.flush) for record in records]:
+            future.result()
+
+
+write_buffer = WriteBehindBuffer()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Bulk export, import and migration of Mysterious House player records
+
+Exports scan the store in parallel segments across a pool of workers and
+stream the items to newline-delimited JSON, imports stream them back in
+batches. Only a bounded number of pages or batches is held in memory at once.
+
+    python TableTool.py export --output players.ndjson --segments 8
+    python TableTool.py import --input players.ndjson
+    python TableTool.py migrate --set 'Season="winter"' --if-missing
+
+The backend is chosen with --backend (dynamodb, local, sqlite or memory), or
+the same environment variables the skill uses.
+"""
+
+from __future__ import print_function
+import argparse
+import decimal
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import Storage
+
+DEFAULT_SEGMENTS = 8
+DEFAULT_WORKERS = 8
+BATCH_SIZE = 25
+
+# Pages or batches a worker may have waiting, bounds the memory used
+QUEUE_DEPTH = 2
+
+
+def read_items(stream):
+    # Floats become Decimal so they can be written back to DynamoDB
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line, parse_float=decimal.Decimal)
+
+
+def open_output(path):
+    return sys.stdout if path == '-' else open(path, 'w')
+
+
+def open_input(path):
+    return sys.stdin if path == '-' else open(path, 'r')
+
+
+def scan_parallel(backend, segments, workers, handle_page):
+    """ Calls handle_page(items) for every page of every segment, pages arrive from several threads """
+
+    def scan(segment):
+        start_key = None
+        while True:
+            items, start_key = backend.scan_page(segment, segments, start_key)
+            handle_page(items)
+            if start_key is None:
+                return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(scan, segment) for segment in range(segments)]:
+            future.result()
+
+
+def export_items(backend, stream, segments=DEFAULT_SEGMENTS, workers=DEFAULT_WORKERS):
+    lock = threading.Lock()
+    count = [0]
+    encoder = json.JSONEncoder(separators=(',', ':'), sort_keys=True, default=Storage.json_default)
+
+    def write_page(items):
+        lines = ''.join(encoder.encode(item) + '\n' for item in items)
+        with lock:
+            stream.write(lines)
+            count[0] += len(items)
+
+    scan_parallel(backend, segments, workers, write_page)
+    return count[0]
+
+
+def run_batches(batches, workers, handle_batch):
+    """ Runs handle_batch over each batch on a pool, with at most QUEUE_DEPTH waiting per worker """
+    slots = threading.BoundedSemaphore(workers * QUEUE_DEPTH)
+    futures = []
+
+    def run(batch):
+        try:
+            return handle_batch(batch)
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch in batches:
+            slots.acquire()
+            futures.append(executor.submit(run, batch))
+            # Drop finished futures so memory stays bounded for long imports
+            if len(futures) > workers * QUEUE_DEPTH:
+                running = []
+                for future in futures:
+                    if future.done():
+                        future.result()
+                    else:
+                        running.append(future)
+                futures = running
+        for future in futures:
+            future.result()
+
+
+def chunk(items, size=BATCH_SIZE):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def import_items(backend, stream, workers=DEFAULT_WORKERS):
+    lock = threading.Lock()
+    count = [0]
+
+    def put(batch):
+        backend.put_items(batch)
+        with lock:
+            count[0] += len(batch)
+
+    run_batches(chunk(read_items(stream)), workers, put)
+    return count[0]
+
+
+def migrate_items(backend, values, if_missing=False, segments=DEFAULT_SEGMENTS, workers=DEFAULT_WORKERS):
+    """ Sets values on every stored item, or only where the attribute is missing
+
+    Each item is updated conditionally on the Version it was scanned with, so an
+    item a player saves during the migration is counted as a conflict and left
+    alone rather than overwritten. LastUpdate keeps the player's own last
+    activity. Returns (updated, conflicts).
+    """
+    lock = threading.Lock()
+    counts = [0, 0]
+
+    def migrate_page(items):
+        updated = conflicts = 0
+        for item in items:
+            changes = dict((name, value) for name, value in values.items()
+                           if not (if_missing and name in item))
+            if not changes:
+                continue
+            try:
+                backend.update_item(item['UserID'], changes, {}, Storage.get_version(item), touch=False)
+                updated += 1
+            except Storage.ConditionFailedError:
+                conflicts += 1
+        with lock:
+            counts[0] += updated
+            counts[1] += conflicts
+
+    scan_parallel(backend, segments, workers, migrate_page)
+    return counts[0], counts[1]
+
+
+# Attributes maintained by the storage layer itself
+RESERVED_ATTRIBUTES = ('UserID', 'LastUpdate', 'Version')
+
+
+def parse_assignment(text):
+    name, separator, value = text.partition('=')
+    if not separator or not name:
+        raise argparse.ArgumentTypeError("Expected NAME=JSON, got " + text)
+    if name in RESERVED_ATTRIBUTES:
+        raise argparse.ArgumentTypeError(name + " cannot be migrated")
+    return name, json.loads(value, parse_float=decimal.Decimal)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk tooling for the Mysterious House player table")
+    parser.add_argument('--backend', choices=('dynamodb', 'local', 'sqlite', 'memory'),
+                        help="Storage backend, defaults to " + Storage.BACKEND_VARIABLE)
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS)
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    export_parser = commands.add_parser('export', help="Write every player record as NDJSON")
+    export_parser.add_argument('--output', default='-')
+    export_parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS)
+
+    import_parser = commands.add_parser('import', help="Write player records from NDJSON")
+    import_parser.add_argument('--input', default='-')
+
+    migrate_parser = commands.add_parser('migrate', help="Set attributes on every player record")
+    migrate_parser.add_argument('--set', dest='assignments', type=parse_assignment, action='append',
+                                required=True, metavar='NAME=JSON')
+    migrate_parser.add_argument('--if-missing', action='store_true',
+                                help="Only set attributes the record does not have yet")
+    migrate_parser.add_argument('--segments', type=int, default=DEFAULT_SEGMENTS)
+
+    args = parser.parse_args(argv)
+    backend = Storage.ResilientBackend(Storage.create_backend(args.backend))
+
+    if args.command == 'export':
+        stream = open_output(args.output)
+        try:
+            count = export_items(backend, stream, args.segments, args.workers)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+        print("Exported " + str(count) + " records", file=sys.stderr)
+    elif args.command == 'import':
+        stream = open_input(args.input)
+        try:
+            count = import_items(backend, stream, args.workers)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+        print("Imported " + str(count) + " records", file=sys.stderr)
+    elif args.command == 'migrate':
+        updated, conflicts = migrate_items(backend, dict(args.assignments), args.if_missing,
+                                           args.segments, args.workers)
+        print("Updated " + str(updated) + " records, " + str(conflicts) + " changed during the migration",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
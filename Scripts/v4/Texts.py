@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Speech, card title and card summary texts of Mysterious House by language
+
+Each language's catalog, mapping a message id to its text, lives in its own
+module (TextsEN, TextsDE), generated from the text workbooks by BuildTexts,
+and is only imported the first time a request needs it, then stays loaded.
+Locales are resolved to a language through a fallback map built once at
+import, so de-AT and de-CH get the German texts, en-GB and en-IN the English
+ones, and locales of languages without a catalog English.
+Adding a language means adding its workbook to BuildTexts and listing its
+module in LANGUAGES.
+"""
+
+import importlib
+import threading
+
+# Catalog module of each language
+LANGUAGES = {
+    "en": "TextsEN",
+    "de": "TextsDE"
+}
+
+DEFAULT_LANGUAGE = "en"
+DEFAULT_LOCALE = "en-US"
+
+# Locales requests are expected in, resolved ahead of time
+KNOWN_LOCALES = (
+    "en-US", "en-GB", "en-IN", "en-AU", "en-CA",
+    "de-DE", "de-AT", "de-CH",
+    "es-ES", "es-MX", "es-US", "fr-FR", "fr-CA", "it-IT", "ja-JP", "pt-BR", "hi-IN", "ar-SA"
+)
+
+
+def get_language(locale):
+    # The language whose catalog serves locale
+    language = (locale or "").split("-")[0].lower()
+    if language in LANGUAGES:
+        return language
+    return DEFAULT_LANGUAGE
+
+
+def build_fallbacks():
+    fallbacks = dict((locale, get_language(locale)) for locale in KNOWN_LOCALES)
+    fallbacks.update((language, language) for language in LANGUAGES)
+    return fallbacks
+
+
+fallbacks = build_fallbacks()
+
+
+def get_catalog_language(locale):
+    language = fallbacks.get(locale)
+    if language is None:
+        # Not cached, so odd locales can't grow the map
+        language = get_language(locale)
+    return language
+
+
+catalogs = {}
+catalogs_lock = threading.Lock()
+
+
+def load_catalog(language):
+    with catalogs_lock:
+        catalog = catalogs.get(language)
+        if catalog is None:
+            catalog = importlib.import_module(LANGUAGES[language]).TEXTS
+            catalogs[language] = catalog
+        return catalog
+
+
+def get_catalog(locale):
+    language = get_catalog_language(locale)
+    catalog = catalogs.get(language)
+    if catalog is None:
+        catalog = load_catalog(language)
+    return catalog
@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+# Generated by BuildTexts.py from DE/MysteriousHouseTexts.xlsx, do not edit
+"""
+German texts of Mysterious House, loaded by Texts on first use
+"""
+
+VERSION = "2bff2f0cd8a8"
+
+TEXTS = {
+    "Speech_Start_1": "Du kommst zu einem geheimnisvollen Haus und öffnest die Eingangstür. ",
+    "Speech_Start_2": (
+        "Du siehst zwei weitere Türen – eine nach links und eine nach rechts. Welche Tür möchtest du zuerst öffnen? "
+    ),
+    "Speech_Start_repeat": "Die linke oder die rechte Tür öffnen? ",
+    "Speech_Load_Floor2_1": (
+        "Gespeichertes Spiel geladen, sage „Neustart“, um erneut zu beginnen. Du befindest dich in einem schwach "
+        "beleuchteten Korridor am unteren Ende einer Leiter. "
+    ),
+    "Speech_Load_Floor2_2": "Auf dem Boden ist etwas Rotes, Klebriges. Du hörst das Geräusch von Metall auf Metall. ",
+    "Speech_Load_Floor2_3": (
+        "Etwas bewegt sich hier unten. Du kannst entweder vorwärts einen Korridor hinunter oder nach rechts in einen "
+        "anderen Korridor gehen. Was möchtest du tun? Geradeaus oder nach rechts gehen? "
+    ),
+    "Speech_Load_Floor2_repeat": "Geradeaus oder nach rechts gehen? ",
+    "Speech_Load_Floor3_1": (
+        "Gespeichertes Spiel geladen, sage „Neustart“, um erneut zu beginnen. Du bist auf Etage 3, in einem "
+        "einzelnen Raum. Du hörst ein Geräusch. "
+    ),
+    "Speech_Load_Floor3_2": (
+        "Das Loch, in das du hinabgestiegen bist, wurde von der anderen Seite verschlossen. Vor dir siehst du zwei "
+        "leckere Sachen auf kleinen Holztischen, einen Teller mit glasierten Donuts und auf dem anderen Tisch einen "
+        "Biskuitkuchen. Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? "
+    ),
+    "Speech_Load_Floor3_repeat": "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? ",
+    "Speech_End": "Viele Dank dafür, dass du Mysterious House spielst! ",
+    "Speech_misunderstood": "Ich habe leider nicht verstanden, was du damit meinst. Bitte sage etwas anderes. ",
+    "Speech_error": "Leider ist etwas nicht in Ordnung, bitte melde den Vorfall, einen schönen Tag noch. Fehlercode ",
+    "Speech_Floor1_X0_Help": "Sage: „Sprechen“, um zu Barry zu sprechen, oder „Zurück“, um den Raum zu verlassen. ",
+    "Speech_Floor1_X0_Revisit_1": "Barry ist immer noch sehr an dem statischen Bild interessiert. ",
+    "Speech_Floor1_X0_Revisit_2": "Möchtest du zu Barry sprechen oder zurückgehen? ",
+    "Speech_Floor1_X0_Visit_1": (
+        "Ein entspannter Geist betrachtet einen statischen Fernsehbildschirm. Auf dem Namensschild auf seinem Tisch "
+        "steht „Barry“. "
+    ),
+    "Speech_Floor1_X0_Visit_2": "Möchtest du zu Barry sprechen oder zurückgehen? ",
+    "Speech_Floor1_X0_Visit_Repeat": "Zu Barry sprechen oder zurückgehen? ",
+    "Speech_Floor1_X1_Help": (
+        "Sage: „Links“, um durch die linke Tür zu gehen. Sage: „Rechts“, um durch die rechte Tür zu gehen. "
+    ),
+    "Speech_Floor1_X1_Revisit_1": "Du gelangst zur Eingangshalle zurück. ",
+    "Speech_Floor1_X1_Revisit_2": "Möchtest du durch die linke oder durch die rechte Tür gehen? ",
+    "Speech_Floor1_X1_Visit_1": "Du bist gerade an dem geheimnisvollen Haus angekommen. ",
+    "Speech_Floor1_X1_Visit_2": "Möchtest du durch die linke oder durch die rechte Tür gehen? ",
+    "Speech_Floor1_X1_Visit_Repeat": "Linke oder rechte Tür? ",
+    "Speech_Floor1_X2_Help": "Sage: „Sprechen“, um zu Larry zu sprechen, oder „Zurück“, um den Raum zu verlassen. ",
+    "Speech_Floor1_X2_Revisit_1": "Larry bewacht weiterhin die Leiter, er sieht etwas gelangweilt aus. ",
+    "Speech_Floor1_X2_Revisit_2": "Möchtest du zu Larry sprechen oder zurückgehen? ",
+    "Speech_Floor1_X2_Visit_1": (
+        "Eine nach unten führende Leiter wird von einem müde aussehenden Geist bewacht. Auf seinem Namensschild "
+        "steht „Larry“"
+    ),
+    "Speech_Floor1_X2_Visit_2": (
+        "Auf dem Boden befindet sich eine Art weißes Pulver. Möchtest du zu Larry sprechen oder zurückgehen?"
+    ),
+    "Speech_Floor1_X2_Visit_Repeat": "Zu Larry sprechen oder zurückgehen? ",
+    "Speech_Floor1_BarryInitial": (
+        "Barry ruft: Du hast hier nichts zu suchen, raus! Möchtest du erneut zu Barry sprechen oder zurückgehen? "
+    ),
+    "Speech_Floor1_BarryAsk": (
+        "Barry ruft: Was?! Ich soll eine Ebene hinab gehen? Kommt nicht in Frage. Möchtest du erneut zu Barry "
+        "sprechen oder zurückgehen? "
+    ),
+    "Speech_Floor1_BarryAsk_Revisit": (
+        "Barry ruft: Ich sagte „Nein“! Und jetzt raus! Möchtest du erneut zu Barry sprechen oder zurückgehen? "
+    ),
+    "Speech_Floor1_BarryInitial_Repeat": (
+        "Barry möchte nicht reden, möchtest du erneut versuchen, zu ihm zu sprechen, oder gehst du zurück? "
+    ),
+    "Speech_Floor1_BarryAsk_Repeat": "Barry lehnt deine Bitte ab, erneut fragen oder zurück gehen? ",
+    "Speech_Floor1_BarryAsk_Revisit_Repeat": "Barry lehnt deine Bitte immer noch ab, erneut fragen oder zurück gehen? ",
+    "Speech_Floor1_Larry": (
+        "Hallo, ich heiße Larry. Ich kann dich nicht weiter lassen. Wenn du weiter willst, frage Barry im anderen "
+        "Raum. Möchtest du erneut zu Larry sprechen oder zurückgehen?"
+    ),
+    "Speech_Floor1_Larry_Revisit": "Larry sagt: Sprich mit Barry, wenn du weiter willst. ",
+    "Speech_Floor1_Larry_PostBarry": "Larry sagt: Hat Barry „Ja“ gesagt? ",
+    "Speech_Floor1_Larry_Repeat": "Erneut zu Larry sprechen oder zurückgehen? ",
+    "Speech_Floor2_Start": (
+        "Du bist gerade die Leiter hinuntergeklettert, möchtest du geradeaus gehen? Oder möchtest du den Weg nach "
+        "rechts nehmen? "
+    ),
+    "Speech_Floor2_Start_Repeat": "Vorwärts oder nach rechts? ",
+    "Speech_Floor2_FLRB": (
+        "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach links, nach rechts oder wieder zurück gehen? "
+    ),
+    "Speech_Floor2_FLRB_Repeat": "Vorwärts, nach links, nach rechts, oder zurück? ",
+    "Speech_Floor2_FLR": "Du hast eine Kreuzung erreicht, möchtest du geradeaus, nach links oder nach rechts gehen? ",
+    "Speech_Floor2_FLR_Repeat": "Vorwärts, nach links oder nach rechts? ",
+    "Speech_Floor2_FLB": "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach links oder wieder zurück gehen? ",
+    "Speech_Floor2_FLB_Repeat": "Vorwärts, nach links oder zurück? ",
+    "Speech_Floor2_FRB": "Du hast eine Kreuzung erreicht, möchtest du vorwärts, nach rechts oder wieder zurück gehen? ",
+    "Speech_Floor2_FRB_Repeat": "Vorwärts, nach rechts oder zurück? ",
+    "Speech_Floor2_LRB": (
+        "Du hast eine Kreuzung erreicht, möchtest du nach links, nach rechts oder wieder zurück gehen? "
+    ),
+    "Speech_Floor2_LRB_Repeat": "Nach links, nach rechts oder wieder zurück? ",
+    "Speech_Floor2_FL": "Du hast eine Kreuzung erreicht, möchtest du geradeaus oder nach links gehen? ",
+    "Speech_Floor2_FL_Repeat": "Vorwärts oder nach links? ",
+    "Speech_Floor2_FR": "Du hast eine Kreuzung erreicht, möchtest du geradeaus oder nach rechts gehen? ",
+    "Speech_Floor2_FR_Repeat": "Vorwärts oder nach rechts? ",
+    "Speech_Floor2_LR": (
+        "Du hast eine Kreuzung erreicht, möchtest du nach links, nach rechts oder wieder zurück gehen? "
+    ),
+    "Speech_Floor2_LR_Repeat": "Nach links, nach rechts oder wieder zurück? ",
+    "Speech_Floor2_LB": (
+        "Der Weg knickt plötzlich nach links ab, möchtest du ihm weiter nach links folgen oder wieder zurück gehen? "
+    ),
+    "Speech_Floor2_LB_Repeat": "möchtest du dem Pfad nach links folgen oder wieder zurück gehen? ",
+    "Speech_Floor2_RB": (
+        "Der Weg knickt plötzlich nach rechts ab, möchtest du ihm weiter nach rechts folgen oder wieder zurück "
+        "gehen? "
+    ),
+    "Speech_Floor2_RB_Repeat": "möchtest du dem Pfad nach rechts folgen oder wieder zurück gehen? ",
+    "Speech_Floor2_FB": "You have reached a set or crates, would you like to go past or go back the way you came?",
+    "Speech_Floor2_FB_Repeat": "would you like to keep going or go back?",
+    "Speech_Floor2_F": "You have reached a set or crates, would you like to keep going?",
+    "Speech_Floor2_F_Repeat": "Would you like to keep going forward?",
+    "Speech_Floor2_B": "You have reached a dead end, would you like to go back the way you came?",
+    "Speech_Floor2_B_Repeat": "A dead end, would you like to go back the way you came?",
+    "Speech_Floor2_L": "The path bends suddenly to the left, would you like to follow the path?",
+    "Speech_Floor2_L_Repeat": "Would you like to follow the path to the left?",
+    "Speech_Floor2_R": "The path bends suddenly to the right, would you like to follow the path?",
+    "Speech_Floor2_R_Repeat": "Would you like to follow the path to the right?",
+    "Speech_Floor2_Armour_1": "Plötzlich tritt eine Geisterritterrüstung aus dem Schatten. ",
+    "Speech_Floor2_Armour_2": (
+        "Du fällst in Ohnmacht. Die erwachst am Fuße einer Leiter. Möchtest du geradeaus oder nach rechts gehen?"
+    ),
+    "Speech_Floor2_Armour_Repeat": "Geradeaus oder nach rechts? ",
+    "Speech_Floor2_End_1": (
+        "Die findest eine weitere Leiter, die eine weitere Ebene nach unten führt. Du kletterst hinunter und "
+        "gelangst in einen einzelnen Raum. Du hörst ein Geräusch. "
+    ),
+    "Speech_Floor2_End_2": (
+        "Das Loch, in das du gerade hinabgestiegen bist, wurde von der anderen Seite verschlossen. Vor dir siehst du "
+        "zwei leckere Sachen auf kleinen Holztischen, einen Teller mit glasierten Donuts und auf dem anderen Tisch "
+        "einen Biskuitkuchen. Wofür entscheidest du dich? "
+    ),
+    "Speech_Floor2_End_Repeat": "Wofür entscheidest du dich? Nimmst du die Donuts oder den Kuchen? ",
+    "Speech_Floor2_Action_F": "Du gehst weiter geradeaus. ",
+    "Speech_Floor2_Action_B": "Du drehst dich um und gehst zurück. ",
+    "Speech_Floor2_Action_L": "Du wendest dich nach links. ",
+    "Speech_Floor2_Action_LF": "Du folgst dem Pfad nach links. ",
+    "Speech_Floor2_Action_R": "Du wendest dich nach rechts. ",
+    "Speech_Floor2_Action_RF": "Du folgst dem Pfad nach rechts. ",
+    "Speech_Warp2_1": "Du springst in einen schwach beleuchteten Korridor am unteren Ende einer Leiter. ",
+    "Speech_Warp2_2": "Auf dem Boden ist etwas Rotes, Klebriges. Du hörst das Geräusch von Metall auf Metall. ",
+    "Speech_Warp2_3": (
+        "Etwas bewegt sich hier unten. Du kannst entweder vorwärts einen Korridor hinunter oder nach rechts in einen "
+        "anderen Korridor gehen. Was möchtest du tun? "
+    ),
+    "Speech_Warp2_Repeat": "Geradeaus oder nach rechts gehen? ",
+    "Speech_Warp3_1": "Du springst auf Etage 3 und landest in einem einzelnen Raum. Du hörst ein Geräusch. ",
+    "Speech_Warp3_2": (
+        "Das Loch, in das du gerade hinabgestiegen bist, wurde von der anderen Seite verschlossen. Vor dir siehst du "
+        "zwei leckere Sachen auf kleinen Holztischen, einen Teller mit glasierten Donuts und auf dem anderen Tisch "
+        "einen Biskuitkuchen. Wofür entscheidest du dich?"
+    ),
+    "Speech_Warp3_Repeat": "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? ",
+    "Speech_Warp_InvalidNumber": (
+        "Diese Etage gibt es nicht, du kannst nur zu den Etagen eins, zwei und drei springen. "
+    ),
+    "Speech_Warp_InvalidString": "Du kannst nicht zu dieser Etage springen. ",
+    "Speech_Warp_Locked": "Du hast die Sprungfunktion noch nicht entsperrt. ",
+    "Speech_Floor1_LeftInvalid": "Du kannst hier nicht nach links gehen. ",
+    "Speech_Floor1_RightInvalid": "Du kannst hier nicht nach rechts gehen. ",
+    "Speech_Floor1_Repeat_Barry": "Zu Barry sprechen oder zurückgehen? ",
+    "Speech_Floor1_Repeat_Larry": "Zu Larry sprechen oder zurückgehen? ",
+    "Speech_Floor1_Repeat_Entrance": "Nach links oder nach rechts? ",
+    "Speech_Floor1_SpeakInvalid": "Hier ist niemand, mit dem du sprechen könntest. ",
+    "Speech_Floor1_NoEscape": "Du bist in der Eingangshalle, es gibt kein Entkommen. ",
+    "Speech_Floor1_BarryNotHere": "Zu Barry sprechen oder zurückgehen?",
+    "Speech_Floor1_LarryNotHere": "Zu Larry sprechen oder zurückgehen?",
+    "Speech_Floor1_BarrySaidNo": "Larry sagt: Leider kann ich dich nicht gehen lassen. ",
+    "Speech_Floor1_BarrySaidYes_1": (
+        "Larry wirkt überrascht, aber lässt dich die Leiter hinabsteigen. Die Leiter endet in einem schwach "
+        "beleuchteten Korridor. "
+    ),
+    "Speech_Floor1_BarrySaidYes_2": (
+        "Auf dem Boden ist etwas Rotes, Klebriges. Du hörst das Geräusch von Metall auf Metall. "
+    ),
+    "Speech_Floor1_BarrySaidYes_3": (
+        "Etwas bewegt sich hier unten. Du kannst entweder vorwärts einen Korridor hinunter oder nach rechts in einen "
+        "anderen Korridor gehen. Was möchtest du tun?"
+    ),
+    "Speech_Floor2_Help": (
+        "Auf dieser Etage kannst du die Figur bewegen. Sage: „Vorwärts“, um in Blickrichtung der Figur zu gehen. "
+        "Sage: „Links“, um dich nach links zu wenden. Sage: „Rechts“, um dich nach rechts zu wenden; sage „Zurück“, "
+        "um wieder zurückzugehen. "
+    ),
+    "Speech_Floor2_InvalidDirection_F": "Du kannst hier nicht vorwärts gehen. ",
+    "Speech_Floor2_InvalidDirection_L": "Du kannst hier nicht nach links gehen. ",
+    "Speech_Floor2_InvalidDirection_R": "Du kannst hier nicht nach rechts gehen. ",
+    "Speech_Floor2_InvalidDirection_B": "Es gibt kein Entkommen. ",
+    "Speech_Floor2_InvalidDirection_Continue": "Die kannst hier nicht weiter vorwärts gehen. ",
+    "Speech_Floor3_Start": (
+        "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, einen Teller mit glasierten Donuts und auf "
+        "dem anderen Tisch einen Biskuitkuchen. Wofür entscheidest du dich? "
+    ),
+    "Speech_Floor3_Help": (
+        "Vor dir siehst du zwei leckere Sachen auf kleinen Holztischen, einen Teller mit glasierten Donuts und auf "
+        "dem anderen Tisch einen Biskuitkuchen. Um den Kuchen zu wählen, sage: „Kuchen“. Um die Donuts zu wählen, "
+        "sage: „Donuts“. Wählst du den Kuchen oder die Donuts? "
+    ),
+    "Speech_Floor3_Repeat": "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? ",
+    "Speech_Floor3_Cake": (
+        "Du nimmst ein Stück von dem Biskuitkuchen. Dies ist der beste Kuchen, den du je gegessen hast. Plötzlich "
+        "beginnst du, heftig zu husten. Du wurdest vergiftet. Du drehst dich um und siehst eine "
+        "Geisterritterrüstung. Diese sagt: „Danke, ich bin frei. Der Geist verlässt die Rüstung und verschwindet im "
+        "Nichts. Du fällst in Ohnmacht. Als du erwachst, hast du keinen Körper, du bist ein Geist in dieser "
+        "Ritterrüstung, dazu verurteilt, immer in diesen Räumen hin und her zu gehen. Ende. In künftigen Spielen "
+        "kannst du „Zu Etage X springen“ sagen, um einen beliebigen Teil erneut zu spielen. Vielen Dank für das "
+        "Spiel! "
+    ),
+    "Speech_Floor3_Doughnuts": (
+        "Die beginnst, die Donuts zu essen. Sie haben einen Geschmack, den du noch niemals erlebt hast. Dies sind "
+        "die besten Donuts, die du jemals gegessen hast; plötzlich fühlst du einen Schmerz im Bauch. Du wurdest "
+        "vergiftet. Du drehst dich um und siehst ein bekanntes Gesicht. Es ist Larry. Er sagt: Vielen Dank, ich kann "
+        "jetzt weitergehen. Er verschwindet im Nichts. Du fällst in Ohnmacht. Du wachst am oberen Ende der ersten "
+        "Leiter auf, siehst an dir herunter – du bist durchsichtig und schwebst. Du trägst ein Namensschild mit der "
+        "Aufschrift „Larry“. Ende. In künftigen Spielen kannst du „Zu Etage X springen“ sagen, um einen beliebigen "
+        "Teil erneut zu spielen. Vielen Dank für das Spiel! "
+    ),
+    "Speech_Floor3_Both": (
+        "Du isst einen Donut. Du fühlst einen plötzlichen Schmerz im Bauch. Du nimmst schnell einen Bissen von dem "
+        "Kuchen. Der Schmerz verschwindet so schnell, wie er gekommen ist. Du drehst dich um und siehst ein "
+        "bekanntes Gesicht. Es ist Barry. Er lacht und sagt: „Dummkopf, sie sind vergiftet und du bist jetzt mein "
+        "Gefangener.“ Du und Barry warten einen unangenehmen Moment lang. „Ich verstehe das nicht“, ruft Barry, „Das "
+        "Gift in beiden Speisen muss sich doch gegenseitig aufheben.“ Ihr starrt euch eine Weile lang an. Barry "
+        "bringt dich nicht dazu, das Gift zu nehmen, und du kannst einen Geist nicht angreifen. Du verlässt das "
+        "geheimnisvolle Haus. Du hast das Geheimnis gelöst und überlebt – Barry bleibt verärgert zurück. Ende. In "
+        "künftigen Spielen kannst du „Zu Etage X springen“ sagen, um einen beliebigen Teil erneut zu spielen. Vielen "
+        "Dank für das Spiel! "
+    ),
+    "Speech_Floor3_Invalid": "Ich habe das nicht verstanden, möchtest du den Kuchen oder die Donuts? ",
+    "Speech_Floor3_Invalid_Repeat": "Wofür entscheidest du dich? Nimmst du den Kuchen oder die Donuts? ",
+    "Title_Start": "Du kommst zu einem geheimnisvollen Haus.",
+    "Title_Load_Floor2": "Gespeichertes Spiel geladen – Etage 2",
+    "Title_Load_Floor3": "Gespeichertes Spiel geladen – Etage 3",
+    "Title_End": "Vielen Dank für dein Spiel!",
+    "Title_Floor1_X0": "Barry, der Geist.",
+    "Title_Floor1_Entrance": "Linke oder rechte Tür?",
+    "Title_Floor1_Larry": "Larry, der Geist.",
+    "Title_Floor1_Barry_Reply": "Barry sagt „Nein“.",
+    "Title_Floor1_Barry_InitialSpeech": "Barry scheint wütend zu sein.",
+    "Title_Floor2_Caught": "Du bist gefangen!",
+    "Title_Floor2_Prompt": "Wohin jetzt?",
+    "Title_Warp2": "Sprung zu Etage 2.",
+    "Title_Warp3": "Sprung zu Etage 3.",
+    "Title_Invalid": "Ungültige Aktion.",
+    "Title_Floor2_RepeatHelp": "Wie möchtest du dich bewegen?",
+    "Title_Floor3_Choice": "Wofür entscheidest du dich?",
+    "Title_Floor3_Cake": "Du hast den Kuchen gegessen.",
+    "Title_Floor3_Doughnut": "Du hast die Donuts gegessen.",
+    "Title_Floor3_Both": "Du hast die Donuts und den Kuchen gegessen.",
+    "Summary_Load_Floor2": (
+        "Spiel geladen. Du bist in einem schwach beleuchteten Korridor auf Etage 2. Gehe vorwärts oder nach rechts."
+    ),
+    "Summary_Load_Floor3": "Spiel geladen. Du bist auf Etage 3. Kuchen oder Donuts?",
+    "Summary_Warp2": "Du bist zu Etage 2 gesprungen. Gehe vorwärts oder nach rechts.",
+    "Summary_Warp3": "Du bist zu Etage 3 gesprungen. Kuchen oder Donuts?",
+    "Summary_Floor1_BarrySaidYes": "Larry lässt dich die Leiter hinab zu Etage 2. Gehe vorwärts oder nach rechts.",
+    "Summary_Floor2_End": "Du bist zu Etage 3 hinabgestiegen. Kuchen oder Donuts?",
+    "Summary_Floor3_Cake": "Der Kuchen war vergiftet, jetzt spukst du in der Ritterrüstung. Ende.",
+    "Summary_Floor3_Doughnuts": "Die Donuts waren vergiftet, jetzt bist du der Geist Larry. Ende.",
+    "Summary_Floor3_Both": "Die beiden Gifte heben sich auf und du entkommst dem Haus. Ende.",
+}
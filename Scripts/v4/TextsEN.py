@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+# Generated by BuildTexts.py from EN/MysteriousHouseTexts.xlsx, do not edit
+"""
+English texts of Mysterious House, loaded by Texts on first use
+"""
+
+VERSION = "06a1047d6994"
+
+TEXTS = {
+    "Speech_Start_1": "You arrive at a mysterious house and open the front door. ",
+    "Speech_Start_2": "You see two more doors, one left and one right. Which door would you like to open first? ",
+    "Speech_Start_repeat": "Open the left or right door? ",
+    "Speech_Load_Floor2_1": (
+        "Game Save Loaded, say restart to restart from the beginning. You are in a dimly lit corridor at the base of "
+        "a ladder. "
+    ),
+    "Speech_Load_Floor2_2": "There is something red and sticky on the floor. You can hear the clattering of metal. ",
+    "Speech_Load_Floor2_3": (
+        "something is moving down here. You can either go forward down one corridor or move right down another. What "
+        "would you like to do? Go straight ahead or right? "
+    ),
+    "Speech_Load_Floor2_repeat": "Go straight ahead or right? ",
+    "Speech_Load_Floor3_1": (
+        "Game Save Loaded, say restart to restart from the beginning. You are on floor 3, in a single room. You hear "
+        "a noise. "
+    ),
+    "Speech_Load_Floor3_2": (
+        "The hole you had climbed down has been sealed from the other side. Ahead of you are two treats on small "
+        "wooden tables, one has a plate of sugared doughnuts, the other has a full Victoria sponge cake. Which do "
+        "you choose? Which do you choose? The cake or the doughnuts? "
+    ),
+    "Speech_Load_Floor3_repeat": "Which do you choose? The cake or the doughnuts? ",
+    "Speech_End": "Thank you for playing Mysterious House! ",
+    "Speech_misunderstood": "Sorry I don't understand what you meant by that. Try saying something else. ",
+    "Speech_error": "Sorry something has broken, please report this issue, have a nice day. Error code ",
+    "Speech_Floor1_X0_Help": "Say: Talk, to talk to Barry or say: Back, to leave the room. ",
+    "Speech_Floor1_X0_Revisit_1": "Barry is still very interested in the static picture. ",
+    "Speech_Floor1_X0_Revisit_2": "Would you like to talk to Barry or head back? ",
+    "Speech_Floor1_X0_Visit_1": (
+        "A relaxed ghost is watching a static television screen. The name plate on his desk says Barry. "
+    ),
+    "Speech_Floor1_X0_Visit_2": "Would you like to talk to Barry or head back? ",
+    "Speech_Floor1_X0_Visit_Repeat": "Talk to Barry or go back? ",
+    "Speech_Floor1_X1_Help": "Say: Left, to go through the left door. Say: Right, to go through the right door. ",
+    "Speech_Floor1_X1_Revisit_1": "You return back to the entrance hall. ",
+    "Speech_Floor1_X1_Revisit_2": "Would you like to go through the left or right door? ",
+    "Speech_Floor1_X1_Visit_1": "You have just arrived at the mysterious house, ",
+    "Speech_Floor1_X1_Visit_2": "would you like to go through the left or right door? ",
+    "Speech_Floor1_X1_Visit_Repeat": "Left or Right door? ",
+    "Speech_Floor1_X2_Help": "Say: Talk, to talk to Larry or say: Back, to leave the room. ",
+    "Speech_Floor1_X2_Revisit_1": "Larry remains guarding the ladder, he seems a bit bored. ",
+    "Speech_Floor1_X2_Revisit_2": "Would you like to talk to Larry or head back? ",
+    "Speech_Floor1_X2_Visit_1": (
+        "A ladder leading underground is guarded by a tired-looking ghost. His name tag says Larry. "
+    ),
+    "Speech_Floor1_X2_Visit_2": (
+        "There is some sort of white powder on the floor. Would you like to talk to Larry or head back? "
+    ),
+    "Speech_Floor1_X2_Visit_Repeat": "Talk to Larry or go back? ",
+    "Speech_Floor1_BarryInitial": (
+        "Barry yells: You're not allowed in here, Get out! Would you like to talk to Barry again or go back? "
+    ),
+    "Speech_Floor1_BarryAsk": (
+        "Barry yells: What?! You want me to let you go down a level? No chance. Would you like to talk to Barry "
+        "again or go back? "
+    ),
+    "Speech_Floor1_BarryAsk_Revisit": (
+        "Barry yells: I said no! Now get out! Would you like to talk to Barry again or go back? "
+    ),
+    "Speech_Floor1_BarryInitial_Repeat": "Barry doesn't want to talk, try to speak again or go back? ",
+    "Speech_Floor1_BarryAsk_Repeat": "Barry rejects your request, ask again or go back? ",
+    "Speech_Floor1_BarryAsk_Revisit_Repeat": "Barry still rejects your request, ask again or go back? ",
+    "Speech_Floor1_Larry": (
+        "Hello I'm Larry, sorry, I can't let you continue, if you want to get past ask Barry in the other room. "
+        "Would you like to talk to Larry again or go back?"
+    ),
+    "Speech_Floor1_Larry_Revisit": "Larry says: Talk to Barry if you want to get past. ",
+    "Speech_Floor1_Larry_PostBarry": "Larry says: Did Barry say yes? ",
+    "Speech_Floor1_Larry_Repeat": "Talk to Larry again or go back? ",
+    "Speech_Floor2_Start": (
+        "You have just climbed down the ladder, would you like to go straight ahead? or take the path right? "
+    ),
+    "Speech_Floor2_Start_Repeat": "Go forward or right? ",
+    "Speech_Floor2_FLRB": (
+        "You have reached a junction, would you like to go forward, left, right or go back the way you came? "
+    ),
+    "Speech_Floor2_FLRB_Repeat": "Go forward, left, right or back? ",
+    "Speech_Floor2_FLR": "You have reached a junction, would you like to go straight on, left or right? ",
+    "Speech_Floor2_FLR_Repeat": "Go forward, left or right? ",
+    "Speech_Floor2_FLB": (
+        "You have reached a junction, would you like to go forward, left, or go back the way you came? "
+    ),
+    "Speech_Floor2_FLB_Repeat": "Go forward, left or back? ",
+    "Speech_Floor2_FRB": (
+        "You have reached a junction, would you like to go forward, right, or go back the way you came? "
+    ),
+    "Speech_Floor2_FRB_Repeat": "Go forward, right, or back? ",
+    "Speech_Floor2_LRB": "You have reached a junction, would you like to go left, right or go back the way you came? ",
+    "Speech_Floor2_LRB_Repeat": "Go left, right or back the way you came? ",
+    "Speech_Floor2_FL": "You have reached a junction, would you like to go straight on or left? ",
+    "Speech_Floor2_FL_Repeat": "Go forward or left? ",
+    "Speech_Floor2_FR": "You have reached a junction, would you like to go straight on or right? ",
+    "Speech_Floor2_FR_Repeat": "Go forward or right? ",
+    "Speech_Floor2_LR": "You have reached a junction, would you like to go left, right or go back the way you came? ",
+    "Speech_Floor2_LR_Repeat": "Go left, right or back the way you came? ",
+    "Speech_Floor2_LB": (
+        "The path bends suddenly to the left, would you like to follow the path left or go back the way you came? "
+    ),
+    "Speech_Floor2_LB_Repeat": "would you like to follow the path left or go back the way you came? ",
+    "Speech_Floor2_RB": (
+        "The path bends suddenly to the right, would you like to follow the path right or go back the way you came? "
+    ),
+    "Speech_Floor2_RB_Repeat": "would you like to follow the path right or go back the way you came? ",
+    "Speech_Floor2_FB": "You have reached a set or crates, would you like to go past or go back the way you came?",
+    "Speech_Floor2_FB_Repeat": "would you like to keep going or go back?",
+    "Speech_Floor2_F": "You have reached a set or crates, would you like to keep going?",
+    "Speech_Floor2_F_Repeat": "Would you like to keep going forward?",
+    "Speech_Floor2_B": "You have reached a dead end, would you like to go back the way you came?",
+    "Speech_Floor2_B_Repeat": "A dead end, would you like to go back the way you came?",
+    "Speech_Floor2_L": "The path bends suddenly to the left, would you like to follow the path?",
+    "Speech_Floor2_L_Repeat": "Would you like to follow the path to the left?",
+    "Speech_Floor2_R": "The path bends suddenly to the right, would you like to follow the path?",
+    "Speech_Floor2_R_Repeat": "Would you like to follow the path to the right?",
+    "Speech_Floor2_Armour_1": "Suddenly A haunted suit of armour looms from the shadows. ",
+    "Speech_Floor2_Armour_2": (
+        "You black out. You awake at the base of the ladder. Would you like to go straight ahead or right? "
+    ),
+    "Speech_Floor2_Armour_Repeat": "Go straight ahead of right? ",
+    "Speech_Floor2_End_1": (
+        "You found another ladder, going down another level deeper. You climb down and end up in a single room. You "
+        "hear a noise. "
+    ),
+    "Speech_Floor2_End_2": (
+        "The hole you just climbed down has been sealed from the other side. Ahead of you are two treats on small "
+        "wooden tables, one has a plate of sugared doughnuts, the other has a full Victoria sponge cake. Which do "
+        "you choose? "
+    ),
+    "Speech_Floor2_End_Repeat": "Which do you choose? The doughnuts or the cake? ",
+    "Speech_Floor2_Action_F": "You continue straight ahead. ",
+    "Speech_Floor2_Action_B": "You turn around and go back. ",
+    "Speech_Floor2_Action_L": "You turn left. ",
+    "Speech_Floor2_Action_LF": "You follow the path left. ",
+    "Speech_Floor2_Action_R": "You turn right. ",
+    "Speech_Floor2_Action_RF": "You follow the path right. ",
+    "Speech_Warp2_1": "You warp to a dimly lit corridor at the base of a ladder. ",
+    "Speech_Warp2_2": "There is something red and sticky on the floor. You can hear the clattering of metal. ",
+    "Speech_Warp2_3": (
+        "Something is moving down here. You can either go forward down one corridor or move right down another. What "
+        "would you like to do? "
+    ),
+    "Speech_Warp2_Repeat": "Go straight ahead or right? ",
+    "Speech_Warp3_1": "You warp to floor 3 and end up in a single room. You hear a noise. ",
+    "Speech_Warp3_2": (
+        "The hole you just climbed down has been sealed from the other side. Ahead of you are two treats on small "
+        "wooden tables, one has a plate of sugared doughnuts, the other has a full Victoria sponge cake. Which do "
+        "you choose? "
+    ),
+    "Speech_Warp3_Repeat": "Which do you choose? The cake or the doughnuts? ",
+    "Speech_Warp_InvalidNumber": "That floor does not exist, you can only warp to floors one, two and three. ",
+    "Speech_Warp_InvalidString": "You cannot warp to that floor. ",
+    "Speech_Warp_Locked": "You have not unlocked warping yet. ",
+    "Speech_Floor1_LeftInvalid": "You can't go left here. ",
+    "Speech_Floor1_RightInvalid": "You can't go right here. ",
+    "Speech_Floor1_Repeat_Barry": "Talk to Barry or go back? ",
+    "Speech_Floor1_Repeat_Larry": "Talk to Larry or go back? ",
+    "Speech_Floor1_Repeat_Entrance": "Go left or right? ",
+    "Speech_Floor1_SpeakInvalid": "There is nobody to speak to here. ",
+    "Speech_Floor1_NoEscape": "You are in the entrance hall, there is no escaping. ",
+    "Speech_Floor1_BarryNotHere": "Talk to Barry or Go Back?",
+    "Speech_Floor1_LarryNotHere": "Talk to Larry or Go Back?",
+    "Speech_Floor1_BarrySaidNo": "Larry Says: Oh Too bad, sorry I can't let you go. ",
+    "Speech_Floor1_BarrySaidYes_1": (
+        "Larry seems surprised but lets you climb down the ladder anyway. The ladder stops in a dimly lit corridor. "
+    ),
+    "Speech_Floor1_BarrySaidYes_2": (
+        "There is something red and sticky on the floor. You can hear the clattering of metal. "
+    ),
+    "Speech_Floor1_BarrySaidYes_3": (
+        "Something is moving down here. You can either go forward down one corridor or move right down another. What "
+        "would you like to do?"
+    ),
+    "Speech_Floor2_Help": (
+        "On this floor you can move the character. Say: forward, to move the direction the character is facing. Say: "
+        "left, to turn left. Say: right, to turn right, Say: back, to turn around and go back to where you came "
+        "from. "
+    ),
+    "Speech_Floor2_InvalidDirection_F": "You cannot move forward here. ",
+    "Speech_Floor2_InvalidDirection_L": "You cannot move left here. ",
+    "Speech_Floor2_InvalidDirection_R": "You cannot move right here. ",
+    "Speech_Floor2_InvalidDirection_B": "There is no escape. ",
+    "Speech_Floor2_InvalidDirection_Continue": "You can't continue forward here. ",
+    "Speech_Floor3_Start": (
+        "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, the other has a "
+        "full Victoria sponge cake. Which do you choose? "
+    ),
+    "Speech_Floor3_Help": (
+        "Ahead of you are two treats on small wooden tables, one has a plate of sugared doughnuts, the other has a "
+        "full Victoria sponge cake. To choose the cake, Say: Cake. To choose the doughnuts, Say: Doughnuts. Do you "
+        "choose the cake or the doughnuts? "
+    ),
+    "Speech_Floor3_Repeat": "Which do you choose? The cake or the doughnuts? ",
+    "Speech_Floor3_Cake": (
+        "You take a slice of Victoria sponge cake. It's the most delicious cake you've ever eaten. Suddenly you "
+        "start coughing violently. You have been poisoned. You turn around to find a haunted suit of armour. He "
+        "says: I'm free thank you. The spirit possessing the armour, leaves the suit and fades away into "
+        "nothingness. You black out. You awake to find you have no body, you are a spirit possessing the same suit "
+        "of armour, doomed to walk these halls forever. The End. On future replays you can say, warp to floor X, to "
+        "replay any part you like. Thank you for playing! "
+    ),
+    "Speech_Floor3_Doughnuts": (
+        "You start eating the doughnuts. The insides ooze with a flavour you've never tasted before. They are the "
+        "most delicious doughnuts you've ever eaten, you get a sudden pain in the stomach. You have been poisoned. "
+        "You look back to find a familiar face. It's Larry. He says: Thank you, I can now move on. He fades away "
+        "into nothingness. You black out. You awake at the top of the first ladder, you look down at yourself, "
+        "you're transparent and floating, You are wearing a nametag, it says Larry. The End. On future replays you "
+        "can say, warp to floor X, to replay any part you like. Thank you for playing! "
+    ),
+    "Speech_Floor3_Both": (
+        "You eat a doughnut. You get a sudden pain in the stomach. You quickly take a bite of cake. The pain stopped "
+        "as suddenly as it started. You look back to find a familiar face. It's Barry. He laughs and says, fool, "
+        "they were poisoned and now you'll be my prisoner. Both you and Barry wait for an awkward amount of time. I "
+        "don't understand, exclaimed Barry, the poison in both foods must cancel each other out. You and Barry stare "
+        "at each other for a while. Barry can't trick you into taking poison, and you can't attack a ghost. You "
+        "leave the mysterious house. You solved the mystery and survived, leaving an irked Barry behind. The End. On "
+        "future replays you can say, warp to floor X, to replay any part you like. Thank you for playing! "
+    ),
+    "Speech_Floor3_Invalid": "I'm sorry I didn't understand that, do you want the cake or the doughnuts? ",
+    "Speech_Floor3_Invalid_Repeat": "Which do you choose? The cake or the doughnuts? ",
+    "Title_Start": "You arrive at a mysterious house.",
+    "Title_Load_Floor2": "Game Save Loaded - Floor 2.",
+    "Title_Load_Floor3": "Game Save Loaded - Floor 3.",
+    "Title_End": "Thanks for playing!",
+    "Title_Floor1_X0": "Barry the Ghost.",
+    "Title_Floor1_Entrance": "Left or Right Door?",
+    "Title_Floor1_Larry": "Larry the Ghost.",
+    "Title_Floor1_Barry_Reply": "Barry Says No.",
+    "Title_Floor1_Barry_InitialSpeech": "Barry seems angry.",
+    "Title_Floor2_Caught": "You got caught!",
+    "Title_Floor2_Prompt": "Where to move?",
+    "Title_Warp2": "Warp to floor 2.",
+    "Title_Warp3": "Warp to floor 3.",
+    "Title_Invalid": "Invalid Action.",
+    "Title_Floor2_RepeatHelp": "How do you want to move?",
+    "Title_Floor3_Choice": "What do you choose?",
+    "Title_Floor3_Cake": "You ate the cake.",
+    "Title_Floor3_Doughnut": "You ate the doughnuts.",
+    "Title_Floor3_Both": "You ate both the doughnuts and the cake.",
+    "Summary_Load_Floor2": "Game loaded. You are in a dimly lit corridor on floor 2. Go forward or right.",
+    "Summary_Load_Floor3": "Game loaded. You are on floor 3. Cake or doughnuts?",
+    "Summary_Warp2": "You warped to floor 2. Go forward or right.",
+    "Summary_Warp3": "You warped to floor 3. Cake or doughnuts?",
+    "Summary_Floor1_BarrySaidYes": "Larry lets you down the ladder to floor 2. Go forward or right.",
+    "Summary_Floor2_End": "You climbed down to floor 3. Cake or doughnuts?",
+    "Summary_Floor3_Cake": "The cake was poisoned, now you haunt the suit of armour. The End.",
+    "Summary_Floor3_Doughnuts": "The doughnuts were poisoned, now you are the ghost Larry. The End.",
+    "Summary_Floor3_Both": "The two poisons cancel out and you escape the house. The End.",
+}
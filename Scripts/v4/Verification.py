@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Alexa request signature verification, for serving the skill outside Lambda
+
+Every request names the URL of Amazon's signing certificate chain and carries
+a signature of its body. A chain is downloaded, validated and parsed once per
+URL and kept with its public key until a certificate in it expires, so
+checking a request costs a timestamp check and one signature verification.
+A chain that can't be loaded is remembered for FAILURE_TTL seconds, so bad
+URLs don't cost a download each.
+
+Chains are downloaded by a fetcher, a function of the URL returning the PEM
+bytes, which tests can replace with a local stand-in. The cryptography package
+(42 or later) is only imported once a request is verified.
+"""
+
+import base64
+import binascii
+import calendar
+import datetime
+import posixpath
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.request import urlopen
+
+# Where Amazon keeps its signing certificates, and the name they must be issued to
+CERT_URL_SCHEME = 'https'
+CERT_URL_HOST = 's3.amazonaws.com'
+CERT_URL_PATH_PREFIX = '/echo.api/'
+SIGNING_NAME = 'echo-api.amazon.com'
+
+# Requests older or newer than this many seconds are rejected as replays
+TIMESTAMP_TOLERANCE = 150
+
+FETCH_TIMEOUT = 2
+CHAIN_CACHE_SIZE = 16
+# Seconds a chain that failed to load is rejected without downloading it again
+FAILURE_TTL = 60
+
+
+class VerificationError(Exception):
+    """ Raised when a request's signature, certificate chain or timestamp can't be trusted """
+
+
+def check_certificate_url(url):
+    parts = urlsplit(url)
+    path = posixpath.normpath(parts.path)
+    try:
+        port = parts.port
+    except ValueError:
+        port = -1
+    if parts.scheme.lower() != CERT_URL_SCHEME or (parts.hostname or '').lower() != CERT_URL_HOST or \
+            port not in (None, 443) or not path.startswith(CERT_URL_PATH_PREFIX):
+        raise VerificationError("Invalid certificate chain URL " + url)
+
+
+def fetch_certificates(url):
+    response = urlopen(url, timeout=FETCH_TIMEOUT)
+    try:
+        return response.read()
+    finally:
+        response.close()
+
+
+def load_trusted_roots(cafile=None):
+    # The system's root certificates, as PEM
+    with open(cafile or ssl.get_default_verify_paths().cafile, 'rb') as f:
+        return f.read()
+
+
+def get_request_time(timestamp):
+    # Alexa timestamps are ISO 8601 in UTC, e.g. 2017-02-14T18:20:00Z
+    try:
+        return calendar.timegm(time.strptime(timestamp[:19], '%Y-%m-%dT%H:%M:%S'))
+    except (TypeError, ValueError):
+        raise VerificationError("Invalid request timestamp " + str(timestamp))
+
+
+def put_expiring(entries, key, entry, size):
+    # Adds an entry whose second element is its expiry, dropping the one expiring first when full
+    entries.pop(key, None)
+    if len(entries) >= size:
+        del entries[min(entries, key=lambda other: entries[other][1])]
+    entries[key] = entry
+
+
+class CertificateChainCache(object):
+    """ Public keys of validated signing certificate chains by URL, kept until the chain expires
+
+    The errors of chains that failed to load are kept by URL for failure_ttl
+    seconds and raised again without fetching.
+    """
+
+    def __init__(self, fetcher=fetch_certificates, trusted_roots=None, size=CHAIN_CACHE_SIZE, clock=time.time,
+                 failure_ttl=FAILURE_TTL):
+        self.fetcher = fetcher
+        self.trusted_roots = trusted_roots
+        self.size = size
+        self.clock = clock
+        self.failure_ttl = failure_ttl
+        self._store = None
+        self._chains = {}
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def get_store(self):
+        from cryptography import x509
+        from cryptography.x509 import verification
+        if self._store is None:
+            roots = load_trusted_roots() if self.trusted_roots is None else self.trusted_roots
+            self._store = verification.Store(x509.load_pem_x509_certificates(roots))
+        return self._store
+
+    def get_public_key(self, url):
+        check_certificate_url(url)
+        now = self.clock()
+        with self._lock:
+            chain = self._chains.get(url)
+            failure = self._failures.get(url)
+        if chain is not None and now < chain[1]:
+            return chain[0]
+        if failure is not None and now < failure[1]:
+            raise failure[0]
+        try:
+            chain = self.load(url, now)
+        except VerificationError as e:
+            with self._lock:
+                put_expiring(self._failures, url, (e, now + self.failure_ttl), self.size)
+            raise
+        with self._lock:
+            self._failures.pop(url, None)
+            put_expiring(self._chains, url, chain, self.size)
+        return chain[0]
+
+    def load(self, url, now):
+        from cryptography import x509
+        from cryptography.x509 import verification
+        try:
+            certificates = x509.load_pem_x509_certificates(self.fetcher(url))
+        except (IOError, ValueError) as e:
+            raise VerificationError("Can't load certificate chain " + url + ": " + str(e))
+        verifier = verification.PolicyBuilder().store(self.get_store()).time(
+            datetime.datetime.fromtimestamp(now, datetime.timezone.utc)).build_server_verifier(
+            verification.DNSName(SIGNING_NAME))
+        try:
+            verifier.verify(certificates[0], certificates[1:])
+        except verification.VerificationError as e:
+            raise VerificationError("Untrusted certificate chain " + url + ": " + str(e))
+        expires = min(certificate.not_valid_after_utc.timestamp() for certificate in certificates)
+        return certificates[0].public_key(), expires
+
+    def clear(self):
+        with self._lock:
+            self._chains.clear()
+            self._failures.clear()
+
+
+class RequestVerifier(object):
+    """ Checks the signature headers and timestamp of Alexa requests """
+
+    def __init__(self, chains=None, tolerance=TIMESTAMP_TOLERANCE, clock=time.time):
+        self.chains = CertificateChainCache(clock=clock) if chains is None else chains
+        self.tolerance = tolerance
+        self.clock = clock
+
+    def verify(self, headers, body, event):
+        """ Raises VerificationError unless body was signed by Alexa moments ago
+
+        headers is a case insensitive mapping of the HTTP headers, body the raw
+        request body and event the request parsed from it.
+        """
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        url = headers.get('SignatureCertChainUrl')
+        signature = headers.get('Signature-256')
+        algorithm = hashes.SHA256()
+        if not signature:
+            # Older requests are only signed with SHA-1
+            signature = headers.get('Signature')
+            algorithm = hashes.SHA1()
+        if not url or not signature:
+            raise VerificationError("Request is not signed")
+
+        # The cheap check first, a replayed request never costs a download or an RSA verification
+        try:
+            timestamp = event['request']['timestamp']
+        except (KeyError, TypeError):
+            raise VerificationError("Request has no timestamp")
+        if abs(self.clock() - get_request_time(timestamp)) > self.tolerance:
+            raise VerificationError("Request timestamp " + timestamp + " is too old")
+
+        public_key = self.chains.get_public_key(url)
+        try:
+            public_key.verify(base64.b64decode(signature), body, padding.PKCS1v15(), algorithm)
+        except (InvalidSignature, binascii.Error, ValueError):
+            raise VerificationError("Invalid request signature")
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import Maze
+import MysteriousHouse
+import Storage
+import Texts
+
+APPLICATION_ID = "amzn1.ask.skill.499ef157-c8f7-455f-b547-257916c78946"
+
+# Open north of the start for one cell only, (0, 2) is a wall
+WALLED_MAZE = {
+    "Rows": ["...", "#..", "...", "..."],
+    "Start": [0, 0],
+    "End": [2, 3],
+    "ArmourPath": [[2, 1], [2, 2]]
+}
+
+
+@pytest.fixture
+def skill(monkeypatch):
+    backend = Storage._backend
+    Storage.set_backend(Storage.MemoryBackend())
+    MysteriousHouse.response_cache.clear()
+    yield MysteriousHouse
+    # Cached floor 2 responses depend on the maze
+    MysteriousHouse.response_cache.clear()
+    Storage.set_backend(backend)
+
+
+def send_intent(skill, intent_name, attributes, request_id):
+    event = {
+        'session': {
+            'application': {'applicationId': APPLICATION_ID},
+            'new': False,
+            'sessionId': 'session',
+            'user': {'userId': 'player'},
+            'attributes': attributes
+        },
+        'request': {'type': 'IntentRequest', 'requestId': request_id, 'locale': 'en-US',
+                    'intent': {'name': intent_name}}
+    }
+    return skill.lambda_handler(event, None)
+
+
+def get_position(response):
+    attributes = response['sessionAttributes']
+    return attributes['X'], attributes['Y'], attributes['OState']
+
+
+def test_start_offers_forward_and_right(skill):
+    assert skill.get_floor2_directions(0, *skill.floor2.start) == \
+        skill.FLOOR2_FORWARD_EXIT | skill.FLOOR2_RIGHT_EXIT
+    assert skill.get_floor2_option_ids(0, *skill.floor2.start)[0] == "Speech_Floor2_Start"
+
+
+def test_walls_north_of_start(skill, monkeypatch):
+    monkeypatch.setattr(skill, 'floor2', Maze.parse_maze(WALLED_MAZE))
+    catalog = Texts.get_catalog('en-US')
+    attributes = skill.get_starting_floor2_attributes()
+
+    response = send_intent(skill, "ForwardIntent", attributes, 'forward-1')
+    assert get_position(response) == (0, 1, 1)
+    speech = response['response']['outputSpeech']['ssml']
+    assert catalog["Speech_Floor2_Start"] not in speech
+
+    for i in range(2, 4):
+        response = send_intent(skill, "ForwardIntent", response['sessionAttributes'], 'forward-' + str(i))
+        assert get_position(response) == (0, 1, 1)
+        assert response['response']['card']['title'] == catalog["Title_Invalid"]
+
+
+def test_start_orientation_off_the_start_cell(skill, monkeypatch):
+    # An OState of 0 away from the start faces north with the cell's own exits
+    monkeypatch.setattr(skill, 'floor2', Maze.parse_maze(WALLED_MAZE))
+    assert skill.get_floor2_directions(0, 0, 1) == skill.FLOOR2_RIGHT_EXIT | skill.FLOOR2_BACKWARD_EXIT
+    assert skill.get_floor2_option_ids(0, 0, 1) == skill.FLOOR2_OPTION_IDS[
+        skill.FLOOR2_RIGHT_EXIT | skill.FLOOR2_BACKWARD_EXIT]
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+import http.client
+import json
+import socket
+import threading
+import time
+
+import pytest
+
+import MysteriousHouse
+import Server
+import Storage
+
+APPLICATION_ID = "amzn1.ask.skill.499ef157-c8f7-455f-b547-257916c78946"
+WORKERS = 2
+IDLE_TIMEOUT = 0.5
+
+
+@pytest.fixture
+def server():
+    backend = Storage._backend
+    Storage.set_backend(Storage.MemoryBackend())
+    server = Server.PooledHTTPServer(('127.0.0.1', 0), workers=WORKERS, idle_timeout=IDLE_TIMEOUT)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+        Storage.set_backend(backend)
+
+
+def connect(server):
+    return http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+
+
+def build_event(request_type, request_id, locale='en-US'):
+    return {
+        'session': {
+            'application': {'applicationId': APPLICATION_ID},
+            'new': True,
+            'sessionId': 'session',
+            'user': {'userId': 'player'},
+            'attributes': {}
+        },
+        'request': {'type': request_type, 'requestId': request_id, 'locale': locale}
+    }
+
+
+def post(connection, event):
+    connection.request('POST', '/', json.dumps(event), {'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return response.status, json.loads(response.read().decode('utf-8'))
+
+
+def test_launch_request(server):
+    event = build_event('LaunchRequest', 'launch')
+    status, body = post(connect(server), event)
+    assert status == 200
+    assert body == json.loads(json.dumps(MysteriousHouse.lambda_handler(event, None)))
+
+
+def test_keep_alive(server):
+    connection = connect(server)
+    for i, locale in enumerate(('en-US', 'de-DE', 'en-GB')):
+        status, body = post(connection, build_event('LaunchRequest', 'launch-' + str(i), locale))
+        assert status == 200
+        assert body['response']['outputSpeech']
+    status, body = post(connection, build_event('SessionEndedRequest', 'end'))
+    assert status == 200
+    assert body == Server.EMPTY_RESPONSE
+
+
+def test_bad_requests(server):
+    connection = connect(server)
+    connection.request('POST', '/', b'not json')
+    response = connection.getresponse()
+    assert response.status == 400
+    response.read()
+    event = build_event('LaunchRequest', 'other-skill')
+    event['session']['application']['applicationId'] = 'amzn1.ask.skill.other'
+    status, body = post(connection, event)
+    assert status == 400
+
+
+def test_health_check(server):
+    connection = connect(server)
+    connection.request('GET', '/')
+    response = connection.getresponse()
+    assert response.status == 200
+    assert json.loads(response.read().decode('utf-8')) == {'status': "ok"}
+
+
+def test_idle_connections_leave_workers_free(server):
+    idle = []
+    for i in range(WORKERS * 4):
+        connection = connect(server)
+        connection.request('GET', '/')
+        connection.getresponse().read()
+        idle.append(connection)
+    start = time.time()
+    status, body = post(connect(server), build_event('LaunchRequest', 'fresh'))
+    assert status == 200
+    assert time.time() - start < IDLE_TIMEOUT
+    for connection in idle:
+        connection.close()
+
+
+def test_pipelined_requests(server):
+    with socket.create_connection(('127.0.0.1', server.server_address[1]), timeout=5) as client:
+        client.sendall(b'GET / HTTP/1.1\r\nHost: test\r\n\r\nGET / HTTP/1.1\r\nHost: test\r\n\r\n')
+        data = b''
+        deadline = time.time() + 5
+        while data.count(b'HTTP/1.1 200') < 2 and time.time() < deadline:
+            data += client.recv(65536)
+        assert data.count(b'HTTP/1.1 200') == 2
+
+
+def test_idle_connection_closed(server):
+    with socket.create_connection(('127.0.0.1', server.server_address[1]), timeout=5) as client:
+        client.sendall(b'GET / HTTP/1.1\r\nHost: test\r\n\r\n')
+        data = b''
+        while b'"ok"' not in data:
+            data += client.recv(65536)
+        # The server closes the connection once it has been idle too long
+        assert client.recv(65536) == b''
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+import pytest
+
+import MysteriousHouse
+import Storage
+
+APPLICATION_ID = "amzn1.ask.skill.499ef157-c8f7-455f-b547-257916c78946"
+
+
+class FailingClaims(Storage.MemoryBackend):
+    """ Progress reads and writes work, the request table does not """
+
+    def claim_request(self, request_id, expires):
+        raise Storage.StorageError("Request table unavailable")
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    previous = Storage._backend
+    backend = Storage.MemoryBackend()
+    Storage.set_backend(backend)
+    monkeypatch.setenv(Storage.REQUEST_TABLE_VARIABLE, 'MysteriousHouseRequests')
+    Storage.player_cache.clear()
+    Storage.replay_cache.clear()
+    yield backend
+    Storage.player_cache.clear()
+    Storage.replay_cache.clear()
+    Storage.set_backend(previous)
+
+
+def send_intent(intent_name, request_id, attributes=None):
+    event = {
+        'session': {
+            'application': {'applicationId': APPLICATION_ID},
+            'new': False,
+            'sessionId': 'session',
+            'user': {'userId': 'player'},
+            'attributes': attributes
+        },
+        'request': {'type': 'IntentRequest', 'requestId': request_id, 'locale': 'en-US',
+                    'intent': {'name': intent_name}}
+    }
+    return MysteriousHouse.lambda_handler(event, None)
+
+
+def test_request_without_saves_is_not_claimed(backend):
+    send_intent("AMAZON.HelpIntent", 'help', MysteriousHouse.get_starting_floor2_attributes())
+    assert backend.requests == {}
+
+
+def test_request_with_saves_is_claimed(backend, monkeypatch):
+    def on_intent(intent_request, session, player):
+        MysteriousHouse.SaveFloorNumber(player, 2)
+        return MysteriousHouse.get_start_response()
+
+    monkeypatch.setattr(MysteriousHouse, 'on_intent', on_intent)
+    send_intent("PlayIntent", 'play')
+    assert list(backend.requests) == ['play']
+    assert backend.get_item('player')['FloorNumber'] == 2
+
+
+def test_failing_claims_leave_progress_breaker_closed(monkeypatch):
+    previous = Storage._backend
+    backend = Storage.ResilientBackend(FailingClaims(), Storage.CircuitBreaker(threshold=1),
+                                       sleep=lambda delay: None)
+    Storage.set_backend(backend)
+    monkeypatch.setenv(Storage.REQUEST_TABLE_VARIABLE, 'MysteriousHouseRequests')
+    try:
+        for i in range(Storage.BREAKER_THRESHOLD + 1):
+            # Unknown outcome, the request is handled
+            assert Storage.claim_request('request-' + str(i))
+        assert Storage.get_claim_backend().breaker.is_open()
+        assert not backend.breaker.is_open()
+    finally:
+        Storage.set_backend(previous)
+
+
+def make_record(user_id, floor_number):
+    record = Storage.PlayerRecord(user_id)
+    record.save(FloorNumber=floor_number)
+    return record
+
+
+def test_commit_writes_only_its_record(backend):
+    buffer = Storage.WriteBehindBuffer()
+    other = make_record('other', 3)
+    buffer.add(other)
+    buffer.commit(make_record('player', 2))
+    assert backend.get_item('player')['FloorNumber'] == 2
+    assert backend.get_item('other') is None
+    assert other.is_dirty()
+
+
+def test_flush_writes_buffered_records(backend):
+    buffer = Storage.WriteBehindBuffer(auto_flush=False)
+    for i in range(3):
+        buffer.commit(make_record('player-' + str(i), 2))
+    assert backend.items == {}
+    buffer.flush()
+    assert sorted(backend.items) == ['player-0', 'player-1', 'player-2']
+
+
+class FlakyBackend(Storage.MemoryBackend):
+    """ Throttles every read while failing is set """
+
+    def __init__(self):
+        Storage.MemoryBackend.__init__(self)
+        self.failing = False
+        self.reads = 0
+
+    def get_item(self, user_id, attributes=None, consistent=False):
+        self.reads += 1
+        if self.failing:
+            raise Storage.StorageError("Throttled", retryable=True)
+        return Storage.MemoryBackend.get_item(self, user_id, attributes, consistent)
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    # A breaker opening after two failed calls, on a clock the test moves
+    now = [1000.0]
+    sleeps = []
+    backend = FlakyBackend()
+    breaker = Storage.CircuitBreaker(threshold=2, reset_timeout=30.0, clock=lambda: now[0])
+    resilient = Storage.ResilientBackend(backend, breaker, sleep=sleeps.append)
+    previous = Storage._backend
+    Storage.set_backend(resilient)
+    Storage.player_cache.clear()
+    yield backend, breaker, now, sleeps
+    Storage.player_cache.clear()
+    Storage.set_backend(previous)
+
+
+def test_breaker_opens_after_failed_calls(flaky):
+    backend, breaker, now, sleeps = flaky
+    backend.failing = True
+    for i in range(2):
+        with pytest.raises(Storage.StorageError):
+            Storage.get_backend().get_item('player')
+    assert backend.reads == 2 * Storage.MAX_ATTEMPTS
+    assert len(sleeps) == 2 * (Storage.MAX_ATTEMPTS - 1)
+    assert breaker.is_open()
+
+    # Fails fast without reaching the backend
+    with pytest.raises(Storage.CircuitOpenError):
+        Storage.get_backend().get_item('player')
+    assert backend.reads == 2 * Storage.MAX_ATTEMPTS
+
+
+def test_breaker_half_open_trial(flaky):
+    backend, breaker, now, sleeps = flaky
+    backend.failing = True
+    for i in range(2):
+        with pytest.raises(Storage.StorageError):
+            Storage.get_backend().get_item('player')
+
+    # A failed trial keeps it open for another timeout
+    now[0] += breaker.reset_timeout
+    reads = backend.reads
+    with pytest.raises(Storage.StorageError):
+        Storage.get_backend().get_item('player')
+    assert backend.reads > reads
+    assert breaker.is_open()
+    with pytest.raises(Storage.CircuitOpenError):
+        Storage.get_backend().get_item('player')
+
+    # A successful trial closes it
+    now[0] += breaker.reset_timeout
+    backend.failing = False
+    assert Storage.get_backend().get_item('player') is None
+    assert not breaker.is_open()
+    assert breaker.failures == 0
+
+
+def test_breaker_open_serves_stale_cache(flaky, monkeypatch):
+    backend, breaker, now, sleeps = flaky
+    # Entries expire as soon as they are cached
+    monkeypatch.setattr(Storage, 'player_cache', Storage.PlayerCache(ttl=-1))
+    backend.update_item('player', {'CanWarp': True, 'FloorNumber': 3}, Storage.DEFAULT_PROGRESS)
+    assert MysteriousHouse.LoadFloorNumber(Storage.PlayerRecord('player')) == 3
+
+    backend.failing = True
+    for i in range(2):
+        with pytest.raises(Storage.StorageError):
+            Storage.get_backend().get_item('player')
+    reads = backend.reads
+    player = Storage.PlayerRecord('player')
+    assert MysteriousHouse.LoadFloorNumber(player) == 3
+    assert MysteriousHouse.LoadCanWarp(player)
+    assert backend.reads == reads
+
+
+def test_breaker_open_serves_defaults(flaky):
+    backend, breaker, now, sleeps = flaky
+    backend.update_item('player', {'CanWarp': True, 'FloorNumber': 3}, Storage.DEFAULT_PROGRESS)
+    backend.failing = True
+    for i in range(2):
+        with pytest.raises(Storage.StorageError):
+            Storage.get_backend().get_item('player')
+    player = Storage.PlayerRecord('player')
+    assert MysteriousHouse.LoadFloorNumber(player) == Storage.DEFAULT_PROGRESS['FloorNumber']
+    assert MysteriousHouse.LoadCanWarp(player) == Storage.DEFAULT_PROGRESS['CanWarp']
+
+
+def test_signed_progress_round_trip():
+    progress = Storage.sign_progress('player', {'CanWarp': True, 'FloorNumber': 3, 'Version': 4})
+    assert Storage.verify_progress('player', progress) == {'CanWarp': True, 'FloorNumber': 3, 'Version': 4}
+
+
+@pytest.mark.parametrize('name, value', [
+    ('FloorNumber', 1),
+    ('CanWarp', False),
+    ('Version', 5),
+    ('Signature', '0' * 64)
+])
+def test_tampered_progress_rejected(name, value):
+    progress = Storage.sign_progress('player', {'CanWarp': True, 'FloorNumber': 3, 'Version': 4})
+    progress[name] = value
+    assert Storage.verify_progress('player', progress) is None
+
+
+def test_progress_of_other_player_rejected():
+    progress = Storage.sign_progress('other', {'CanWarp': True, 'FloorNumber': 3, 'Version': 4})
+    assert Storage.verify_progress('player', progress) is None
+    assert Storage.verify_progress('player', {'FloorNumber': 3}) is None
+
+
+def test_tampered_session_progress_reads_store(backend):
+    backend.update_item('player', {'FloorNumber': 2}, Storage.DEFAULT_PROGRESS)
+    progress = Storage.sign_progress('player', backend.get_item('player'))
+    progress['FloorNumber'] = 3
+    player = Storage.PlayerRecord('player')
+    player.load_session({Storage.SESSION_PROGRESS_ATTRIBUTE: progress})
+    assert MysteriousHouse.LoadFloorNumber(player) == 2
+
+    # The untouched copy is trusted without a read
+    progress['FloorNumber'] = 2
+    backend.items.clear()
+    player = Storage.PlayerRecord('player')
+    player.load_session({Storage.SESSION_PROGRESS_ATTRIBUTE: progress})
+    assert MysteriousHouse.LoadFloorNumber(player) == 2
+
+
+def begin_in_thread(cache, request_id):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.begin(request_id)))
+    thread.start()
+    # Let it reach the wait for the first invocation
+    time.sleep(0.05)
+    return thread, results
+
+
+def test_duplicate_waits_for_first_response():
+    cache = Storage.ReplayCache()
+    assert cache.begin('request') == (None, True)
+    thread, results = begin_in_thread(cache, 'request')
+    assert thread.is_alive()
+    cache.finish('request', {'response': 'first'})
+    thread.join(1)
+    assert results == [({'response': 'first'}, False)]
+    assert cache.begin('request') == ({'response': 'first'}, False)
+
+
+def test_duplicate_of_failed_request():
+    cache = Storage.ReplayCache()
+    cache.begin('request')
+    thread, results = begin_in_thread(cache, 'request')
+    cache.finish('request')
+    thread.join(1)
+    # Must not repeat the saves, a later retry is handled afresh
+    assert results == [(None, False)]
+    assert cache.begin('request') == (None, True)
+
+
+def test_duplicate_gives_up_waiting():
+    cache = Storage.ReplayCache(timeout=0.01)
+    cache.begin('request')
+    assert cache.begin('request') == (None, False)
+
+
+def test_retried_request_saves_once(backend, monkeypatch):
+    saves = []
+
+    def on_intent(intent_request, session, player):
+        saves.append(intent_request['requestId'])
+        MysteriousHouse.SaveFloorNumber(player, 2)
+        return MysteriousHouse.get_start_response()
+
+    monkeypatch.setattr(MysteriousHouse, 'on_intent', on_intent)
+    first = send_intent("PlayIntent", 'play')
+    assert send_intent("PlayIntent", 'play') == first
+    assert saves == ['play']
+    assert backend.get_item('player')['Version'] == 1
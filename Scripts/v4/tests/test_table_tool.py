@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import io
+
+import pytest
+
+import Storage
+import TableTool
+
+PLAYERS = [
+    {'UserID': 'player-' + str(i).zfill(2), 'CanWarp': i % 2 == 0, 'FloorNumber': i % 3 + 1, 'Score': 1.5,
+     'LastUpdate': '2017-01-01 00:00:00', 'Version': i + 1}
+    for i in range(60)
+]
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return Storage.MemoryBackend()
+    return Storage.SQLiteBackend(str(tmp_path / 'players.db'))
+
+
+def get_items(backend):
+    items = []
+    for segment in range(3):
+        items.extend(Storage.scan_segment(backend, segment, 3, limit=7))
+    return sorted(items, key=lambda item: item['UserID'])
+
+
+def test_export_import_round_trip(backend, tmp_path):
+    backend.put_items(PLAYERS)
+    stream = io.StringIO()
+    assert TableTool.export_items(backend, stream, segments=4, workers=2) == len(PLAYERS)
+    assert len(stream.getvalue().splitlines()) == len(PLAYERS)
+
+    target = Storage.SQLiteBackend(str(tmp_path / 'target.db'))
+    stream.seek(0)
+    assert TableTool.import_items(target, stream, workers=3) == len(PLAYERS)
+    assert get_items(target) == PLAYERS
+
+
+def test_import_skips_blank_lines(backend):
+    stream = io.StringIO('\n{"UserID": "a", "Version": 1}\n\n{"UserID": "b", "Version": 2}\n')
+    assert TableTool.import_items(backend, stream) == 2
+    assert [item['UserID'] for item in get_items(backend)] == ['a', 'b']
+
+
+def test_migrate_sets_values(backend):
+    backend.put_items(PLAYERS)
+    assert TableTool.migrate_items(backend, {'Season': 'winter'}, segments=4, workers=2) == (len(PLAYERS), 0)
+    for before, after in zip(PLAYERS, get_items(backend)):
+        assert after['Season'] == 'winter'
+        assert after['Version'] == before['Version'] + 1
+        # A migration isn't player activity
+        assert after['LastUpdate'] == before['LastUpdate']
+
+
+def test_migrate_if_missing(backend):
+    backend.put_items([dict(PLAYERS[0], Season='summer'), PLAYERS[1]])
+    assert TableTool.migrate_items(backend, {'Season': 'winter'}, if_missing=True) == (1, 0)
+    assert [item['Season'] for item in get_items(backend)] == ['summer', 'winter']
+    assert get_items(backend)[0]['Version'] == PLAYERS[0]['Version']
+
+
+def test_migrate_leaves_concurrent_saves(backend):
+    backend.put_items(PLAYERS[:3])
+    update_item = backend.update_item
+
+    def save_first(user_id, values, defaults, expected_version=None, touch=True):
+        # The player saves between the migration's scan and its update
+        if user_id == PLAYERS[1]['UserID'] and touch is False:
+            update_item(user_id, {'FloorNumber': 3}, {})
+        return update_item(user_id, values, defaults, expected_version, touch)
+
+    backend.update_item = save_first
+    assert TableTool.migrate_items(backend, {'Season': 'winter'}, workers=1) == (2, 1)
+    saved = get_items(backend)[1]
+    assert 'Season' not in saved
+    assert saved['FloorNumber'] == 3
+
+
+def test_parse_assignment():
+    assert TableTool.parse_assignment('Season="winter"') == ('Season', 'winter')
+    assert TableTool.parse_assignment('Lives=3') == ('Lives', 3)
+    for text in ('Season', '=1', 'Version=3', 'LastUpdate="2017-01-01"'):
+        with pytest.raises(Exception):
+            TableTool.parse_assignment(text)
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+import base64
+import datetime
+import json
+
+import pytest
+
+import Verification
+
+pytest.importorskip('cryptography')
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.x509.oid import ExtendedKeyUsageOID, NameOID
+
+URL = 'https://s3.amazonaws.com/echo.api/echo-api-cert.pem'
+NOW = 1500000000
+
+
+def build_certificate(subject, issuer, public_key, signing_key, ca):
+    start = datetime.datetime.fromtimestamp(NOW, datetime.timezone.utc) - datetime.timedelta(days=1)
+    builder = x509.CertificateBuilder().subject_name(
+        x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)])).issuer_name(
+        x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)])).public_key(public_key).serial_number(
+        x509.random_serial_number()).not_valid_before(start).not_valid_after(
+        start + datetime.timedelta(days=30)).add_extension(
+        x509.BasicConstraints(ca=ca, path_length=None), critical=True).add_extension(
+        x509.SubjectKeyIdentifier.from_public_key(public_key), critical=False).add_extension(
+        x509.AuthorityKeyIdentifier.from_issuer_public_key(signing_key.public_key()), critical=False)
+    if ca:
+        builder = builder.add_extension(x509.KeyUsage(
+            digital_signature=False, content_commitment=False, key_encipherment=False, data_encipherment=False,
+            key_agreement=False, key_cert_sign=True, crl_sign=True, encipher_only=False, decipher_only=False),
+            critical=True)
+    else:
+        builder = builder.add_extension(
+            x509.SubjectAlternativeName([x509.DNSName(Verification.SIGNING_NAME)]), critical=False).add_extension(
+            x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]), critical=False)
+    return builder.sign(signing_key, hashes.SHA256())
+
+
+@pytest.fixture(scope='module')
+def pki():
+    """ A generated root CA and a leaf issued by it to the Alexa signing name """
+    ca_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    leaf_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ca = build_certificate("Test Root CA", "Test Root CA", ca_key.public_key(), ca_key, True)
+    leaf = build_certificate(Verification.SIGNING_NAME, "Test Root CA", leaf_key.public_key(), ca_key, False)
+    return {
+        'key': leaf_key,
+        'chain': leaf.public_bytes(serialization.Encoding.PEM) + ca.public_bytes(serialization.Encoding.PEM),
+        'root': ca.public_bytes(serialization.Encoding.PEM)
+    }
+
+
+@pytest.fixture
+def fetches(pki):
+    urls = []
+
+    def fetch(url):
+        urls.append(url)
+        return pki['chain']
+    return urls, fetch
+
+
+def build_verifier(pki, fetch):
+    clock = lambda: NOW
+    chains = Verification.CertificateChainCache(fetcher=fetch, trusted_roots=pki['root'], clock=clock)
+    return Verification.RequestVerifier(chains=chains, clock=clock)
+
+
+def sign_request(pki, event, url=URL):
+    body = json.dumps(event).encode('utf-8')
+    signature = pki['key'].sign(body, padding.PKCS1v15(), hashes.SHA256())
+    headers = {'SignatureCertChainUrl': url, 'Signature-256': base64.b64encode(signature).decode('ascii')}
+    return headers, body
+
+
+def build_event():
+    timestamp = datetime.datetime.fromtimestamp(NOW, datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    return {'request': {'type': 'LaunchRequest', 'timestamp': timestamp}}
+
+
+def test_valid_signature(pki, fetches):
+    urls, fetch = fetches
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    build_verifier(pki, fetch).verify(headers, body, event)
+    assert urls == [URL]
+
+
+def test_tampered_body(pki, fetches):
+    urls, fetch = fetches
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    with pytest.raises(Verification.VerificationError):
+        build_verifier(pki, fetch).verify(headers, body.replace(b'LaunchRequest', b'IntentRequest'), event)
+
+
+def test_tampered_signature(pki, fetches):
+    urls, fetch = fetches
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    signature = bytearray(base64.b64decode(headers['Signature-256']))
+    signature[0] ^= 1
+    headers['Signature-256'] = base64.b64encode(bytes(signature)).decode('ascii')
+    with pytest.raises(Verification.VerificationError):
+        build_verifier(pki, fetch).verify(headers, body, event)
+
+
+def test_stale_timestamp(pki, fetches):
+    urls, fetch = fetches
+    event = build_event()
+    event['request']['timestamp'] = '2017-01-01T00:00:00Z'
+    headers, body = sign_request(pki, event)
+    with pytest.raises(Verification.VerificationError):
+        build_verifier(pki, fetch).verify(headers, body, event)
+    # Rejected before the chain is fetched
+    assert urls == []
+
+
+@pytest.mark.parametrize('url', [
+    'https://s3.amazonaws.com/echo.api/../evil/echo-api-cert.pem',
+    'http://s3.amazonaws.com/echo.api/echo-api-cert.pem',
+    'https://s3.amazonaws.com:8443/echo.api/echo-api-cert.pem',
+    'https://example.com/echo.api/echo-api-cert.pem'
+])
+def test_invalid_certificate_url(pki, fetches, url):
+    urls, fetch = fetches
+    event = build_event()
+    headers, body = sign_request(pki, event, url)
+    with pytest.raises(Verification.VerificationError):
+        build_verifier(pki, fetch).verify(headers, body, event)
+    assert urls == []
+
+
+def test_chain_cache_hit(pki, fetches):
+    urls, fetch = fetches
+    verifier = build_verifier(pki, fetch)
+    for i in range(3):
+        event = build_event()
+        event['request']['requestId'] = str(i)
+        headers, body = sign_request(pki, event)
+        verifier.verify(headers, body, event)
+    assert urls == [URL]
+
+
+def test_untrusted_chain(pki, fetches):
+    urls, fetch = fetches
+    other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    other_root = build_certificate("Other Root CA", "Other Root CA", other_key.public_key(), other_key, True)
+    chains = Verification.CertificateChainCache(
+        fetcher=fetch, trusted_roots=other_root.public_bytes(serialization.Encoding.PEM), clock=lambda: NOW)
+    verifier = Verification.RequestVerifier(chains=chains, clock=lambda: NOW)
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    with pytest.raises(Verification.VerificationError):
+        verifier.verify(headers, body, event)
+
+
+def test_failed_chain_cached(pki):
+    urls = []
+    now = [NOW]
+
+    def fetch(url):
+        urls.append(url)
+        raise IOError("Timed out")
+
+    chains = Verification.CertificateChainCache(fetcher=fetch, trusted_roots=pki['root'], clock=lambda: now[0])
+    verifier = Verification.RequestVerifier(chains=chains, clock=lambda: now[0])
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    for i in range(3):
+        with pytest.raises(Verification.VerificationError):
+            verifier.verify(headers, body, event)
+    assert urls == [URL]
+
+    # Tried again once the failure expires
+    now[0] += Verification.FAILURE_TTL
+    event = build_event()
+    headers, body = sign_request(pki, event)
+    with pytest.raises(Verification.VerificationError):
+        verifier.verify(headers, body, event)
+    assert urls == [URL, URL]